@@ -1,6 +1,7 @@
 from typing import List, Optional, Dict, Any
 from pydantic import BaseModel, Field
 from beanie import Document
+from pymongo import IndexModel, ASCENDING
 from datetime import datetime
 from enum import IntEnum
 
@@ -92,6 +93,12 @@ class WebinarVideo(Document):
     Status: int = ConceptStatus.Pending  # 0=Pending, 1=Approved, 2=Rejected
     UploadedAt: datetime = Field(default_factory=datetime.utcnow)
 
+    # One-time copy of the finished render to S3 (see api/services/video_finalizer.py)
+    FinalizeStatus: str = ""  # "", "finalizing", "finalized", "failed"
+    FinalizeLockExpiresAt: Optional[datetime] = None
+    FinalizeAttempts: int = 0
+    FinalizeError: Optional[str] = None
+
     class Settings:
         name = "Webinar_Video"
 
@@ -193,6 +200,9 @@ class WebinarAsset(Document):
     selected_concept: Optional[Concept] = None
     concept_version: int = 1
     concept_admin_notes: Optional[str] = None
+    # Summarized onboarding context, reused while the document is unchanged
+    knowledge_base: Optional[str] = None
+    knowledge_base_hash: Optional[str] = None  # sha256 of system prompt + onboarding_doc_content
     
     # Step 2: Structure
     structure_content: Optional[str] = None # Raw text from AI
@@ -221,6 +231,8 @@ class WebinarAsset(Document):
     
     class Settings:
         name = "webinar_assets"
+        # image_mirror looks up already mirrored content by its S3 URL
+        indexes = [IndexModel([("promotional_images.s3_url", ASCENDING)], sparse=True)]
 
 class ApprovalHistory(Document):
     """Tracks all approval actions and version history for audit trail"""
@@ -263,6 +275,57 @@ class WebinarProcessingJob(Document):
     error: Optional[str] = None
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+    # Durable queue fields (see api/services/job_queue.py)
+    payload: Dict[str, Any] = {}  # Handler arguments; uploaded files are staged in GridFS
+    attempts: int = 0
+    max_attempts: int = 3
+    run_after: Optional[datetime] = None  # Retry backoff: not claimable before this time
+    locked_by: Optional[str] = None  # Worker id holding the lease
+    lease_expires_at: Optional[datetime] = None  # Reclaimable by another worker after this
+    heartbeat_at: Optional[datetime] = None
     
     class Settings:
-        name = "webinar_processing_jobs"
\ No newline at end of file
+        name = "webinar_processing_jobs"
+
+
+class LLMCacheEntry(Document):
+    """Content-addressed cache of LLM responses (see api/services/llm_cache.py)"""
+    key: str = Field(index=True, unique=True)  # sha256(model, system prompt, user prompt, temperature, max_tokens)
+    model: str = ""
+    response: str = ""
+    hits: int = 0
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    last_accessed_at: datetime = Field(default_factory=datetime.utcnow)
+    expires_at: Optional[datetime] = None
+
+    class Settings:
+        name = "webinar_llm_cache"
+
+
+class ExtractionCacheEntry(Document):
+    """Extracted text of an uploaded file, keyed by content hash (see api/services/extraction_cache.py)"""
+    key: str = Field(index=True, unique=True)  # "<sha256 of file bytes>.<extension>"
+    filename: str = ""  # First filename this content was seen under
+    file_size: int = 0
+    text: Optional[str] = None  # Inline when small
+    text_file_id: Optional[str] = None  # GridFS id when the text is too large to inline
+    text_bytes: int = 0
+    hits: int = 0
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    last_accessed_at: datetime = Field(default_factory=datetime.utcnow)
+
+    class Settings:
+        name = "webinar_extraction_cache"
+
+
+class RateLimitWindow(Document):
+    """Per-minute OpenAI usage shared across processes (see api/services/openai_limiter.py)"""
+    key: str = Field(index=True, unique=True)  # "<pool>:<minute start>"
+    requests: int = 0
+    tokens: int = 0
+    expires_at: Optional[datetime] = None
+
+    class Settings:
+        name = "webinar_rate_limit_windows"
+        indexes = [IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0)]
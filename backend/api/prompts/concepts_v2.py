@@ -9,7 +9,7 @@ These concepts must be high-converting, deeply structured, and ready for automat
 
 **CRITICAL REQUIREMENTS:**
 - LANGUAGE: You MUST write in {language} only. Every single word must be in {language}.
-- You MUST return EXACTLY 3 concepts in a JSON array. Not 1, not 2. EXACTLY 3.
+- You MUST return EXACTLY 3 concepts in the "concepts" array. Not 1, not 2. EXACTLY 3.
 - You MUST write every section as **FULL, PROFESSIONAL PARAGRAPHS**.
 - NO bullet points. NO short fragments.
 - TONE: Professional, authoritative, and {market_tone}.
@@ -26,11 +26,11 @@ These concepts must be high-converting, deeply structured, and ready for automat
 {hook_analysis}
 
 ---
-# OUTPUT FORMAT - JSON ARRAY WITH EXACTLY 3 CONCEPTS
-You MUST return ONLY a valid JSON array containing exactly 3 concept objects. No markdown, no explanation, no text before or after the JSON.
+# OUTPUT FORMAT - JSON OBJECT WITH EXACTLY 3 CONCEPTS
+You MUST return ONLY a valid JSON object whose "concepts" array contains exactly 3 concept objects. No markdown, no explanation, no text before or after the JSON.
 
 ```json
-[
+{{"concepts": [
   {{
     "title": "Professional curiosity-driven title for Concept 1",
     "big_idea": "A 2-3 paragraph explanation of the core transformation and 'The One Thing'.",
@@ -100,9 +100,9 @@ You MUST return ONLY a valid JSON array containing exactly 3 concept objects. No
     "cta_sentence": "...",
     "promises": ["..."]
   }}
-]
+]}}
 ```
-Return ONLY the JSON array with exactly 3 concepts. No text before or after. Align with 'Perfect Webinar' + 'GOAT' frameworks.
+Return ONLY the JSON object with exactly 3 concepts. No text before or after. Align with 'Perfect Webinar' + 'GOAT' frameworks.
 """
 
 CONCEPT_EVALUATION_PROMPT = """
@@ -133,7 +133,7 @@ CONCEPT_IMPROVEMENT_PROMPT = """
 
 **Task:**
 Improve the three webinar concepts based on the evaluation findings.
-You MUST return EXACTLY 3 improved concepts as a valid JSON array.
+You MUST return EXACTLY 3 improved concepts in the "concepts" array of a valid JSON object.
 
 **ORIGINAL CONCEPTS:**
 {concepts}
@@ -144,15 +144,15 @@ You MUST return EXACTLY 3 improved concepts as a valid JSON array.
 **Requirements:**
 - Implement all improvements directly.
 - LANGUAGE: You MUST write in {language} only. Every single word must be in {language}.
-- Return EXACTLY 3 concepts in a JSON array - same format as below.
+- Return EXACTLY 3 concepts in the "concepts" array - same format as below.
 - Each concept MUST have exactly 3 secrets/belief shifts.
 - Ensure all paragraphs remain detailed and professional.
 - Strengthen the "Unique Mechanism" and "Offer Transition Logic".
 - TONE: {market_tone}.
 
-**OUTPUT FORMAT - RETURN ONLY THIS JSON ARRAY (no text before or after):**
+**OUTPUT FORMAT - RETURN ONLY THIS JSON OBJECT (no text before or after):**
 ```json
-[
+{{"concepts": [
   {{
     "title": "Improved title for Concept 1",
     "big_idea": "Improved 2-3 paragraph big idea",
@@ -199,7 +199,76 @@ You MUST return EXACTLY 3 improved concepts as a valid JSON array.
     "cta_sentence": "...",
     "promises": ["..."]
   }}
-]
+]}}
 ```
-Return ONLY the JSON array. No markdown code fences, no explanation text. Just the raw JSON array starting with [ and ending with ].
+Return ONLY the JSON object. No markdown code fences, no explanation text.
+"""
+
+
+# --- PER-CONCEPT PROMPTS (parallel evaluate/improve fan-out) ---
+
+CONCEPT_SINGLE_EVALUATION_PROMPT = """
+# Single Concept Self-Evaluation Prompt (Change 2.0)
+
+**Task:**
+Evaluate this ONE webinar concept critically against Change 2.0 standards.
+
+**CONCEPT:**
+{concept}
+
+**Evaluation Criteria:**
+1. **Market Fit:** Is it professional and Norwegian-market friendly? No hype?
+2. **Big Idea:** Is it clear, strong, and capable of carrying the webinar?
+3. **Secret Structure:** Do the stories effectively shift beliefs (Perfect Webinar style)? Are there exactly 3 secrets?
+4. **Mechanism:** Is the unique mechanism compelling and logical?
+5. **Narrative Angle:** Is the angle distinct and resonant?
+6. **Offer Transition:** Is the logic from value to pitch seamless and non-pushy?
+
+Provide:
+- A short summary assessment
+- A list of specific improvement instructions.
+"""
+
+CONCEPT_SINGLE_IMPROVEMENT_PROMPT = """
+# Single Concept Improvement Prompt (Change 2.0)
+
+**Task:**
+Improve this ONE webinar concept based on the evaluation findings.
+
+**ORIGINAL CONCEPT:**
+{concept}
+
+**EVALUATION:**
+{evaluation}
+
+**Requirements:**
+- Implement all improvements directly.
+- LANGUAGE: You MUST write in {language} only. Every single word must be in {language}.
+- The concept MUST have exactly 3 secrets/belief shifts.
+- Ensure all paragraphs remain detailed and professional.
+- Strengthen the "Unique Mechanism" and "Offer Transition Logic".
+- TONE: {market_tone}.
+
+**OUTPUT FORMAT - RETURN ONLY ONE JSON OBJECT (no text before or after):**
+```json
+{{
+  "title": "Improved title",
+  "big_idea": "Improved 2-3 paragraph big idea",
+  "hook": "Improved hook",
+  "structure_points": ["Hook", "Story", "Secrets", "Mechanism", "Offer"],
+  "secrets": [
+    {{"assumption": "...", "belief": "...", "story": "3+ paragraph story", "transformation": "..."}},
+    {{"assumption": "...", "belief": "...", "story": "3+ paragraph story", "transformation": "..."}},
+    {{"assumption": "...", "belief": "...", "story": "3+ paragraph story", "transformation": "..."}}
+  ],
+  "mechanism": "Improved 2-3 paragraph mechanism",
+  "narrative_angle": "Improved narrative angle (1-2 paragraphs)",
+  "offer_transition_logic": "Improved offer transition (1-2 paragraphs)",
+  "value_anchor": {{"outcomes": ["Outcome 1", "Outcome 2"]}},
+  "bonus_ideas": ["Bonus 1", "Bonus 2"],
+  "cta_sentence": "Improved CTA",
+  "promises": ["Promise 1", "Promise 2", "Promise 3"]
+}}
+```
+Return ONLY the JSON object. No markdown code fences, no explanation text.
 """
@@ -38,8 +38,8 @@ Product / Offer Details: {product_details}
 Deliver a structured overview of the sequence.
 ```json
 {{
-  "strategy": "Overall communication logic",
-  "sequence": [
+  "strategy_notes": "Overall communication logic",
+  "timeline": [
     {{
       "id": "pre_1",
       "type": "pre_webinar",
@@ -74,26 +74,30 @@ Generate the full professional English copy for the email sequence based on the
 
 **CRITICAL:** LANGUAGE: You MUST write the entire output in {language} only. Every single email must be written entirely in {language}.
 
-**Output Format (JSON Array):**
+**Output Format (JSON):**
 ```json
-[
-  {{
-    "id": "pre_1",
-    "type": "pre_webinar",
-    "goal": "Invitation",
-    "subject": "...",
-    "preview_text": "...",
-    "body": "Full multi-paragraph text",
-    "cta": "Link text",
-    "timing": "..."
-  }}
-]
+{{
+  "emails": [
+    {{
+      "day": "Timing, e.g. D-3, D-1, 1h before, D+1",
+      "segment": "pre_webinar | post_webinar_attended | post_webinar_no_show",
+      "purpose": "Invitation",
+      "subject": "...",
+      "preview_text": "...",
+      "body": "Full multi-paragraph text",
+      "cta": "Link text"
+    }}
+  ]
+}}
 ```
 """
 
 EMAIL_EVALUATION_PROMPT = """
 # Email Self-Evaluation (Change 2.0)
 
+**Emails:**
+{emails}
+
 **Criteria:**
 1. **Authenticity**: Does it sound like a real professional, or an AI sales bot?
 2. **Logic-Induction**: Does the copy actually teach/prove the mechanism?
@@ -120,5 +124,85 @@ Improve the email copy based on the evaluation. Focus on deepening the professio
 {evaluation}
 
 **Output:**
-JSON array of improved emails.
+The improved emails in the `emails` array (same fields as the original).
+"""
+
+
+# --- PER-EMAIL PROMPTS (parallel draft/evaluate/improve per email) ---
+
+EMAIL_SINGLE_GENERATION_PROMPT = """
+# Single Email Copy Generation (Change 2.0)
+
+**Task:**
+Write the full professional copy for ONE email of the webinar email sequence.
+
+**Webinar Concept:**
+{concept}
+
+**Sequence Strategy:**
+{strategy}
+
+**This Email (from the sequence overview):**
+{outline}
+
+**Content Requirements:**
+- **Subject Line:** Curiosity-driven, professional (not clickbaity).
+- **Preview Text:** A short teaser sentence (hidden/preheader) that appears in the inbox.
+- **Opening:** High-relevance, personal hook.
+- **Body:** Professional paragraphs (no bullet point lists only). Explain the logic.
+- **CTA:** Logical next step (e.g., "Set your calendar", "Watch the replay").
+- **Signature:** Professional sign-off.
+
+**Tone:**
+{market_tone}. Authoritative. Calm. Logical.
+
+**CRITICAL:** LANGUAGE: You MUST write the entire email in {language} only.
+
+**Output Format (JSON):**
+```json
+{{
+  "day": "Timing from the overview, e.g. D-3, 1h before, D+1",
+  "segment": "The email's type from the overview (pre_webinar, post_webinar_attended, post_webinar_no_show)",
+  "purpose": "The email's goal",
+  "subject": "...",
+  "preview_text": "...",
+  "body": "Full multi-paragraph text",
+  "cta": "Link text"
+}}
+```
+"""
+
+EMAIL_SINGLE_EVALUATION_PROMPT = """
+# Single Email Self-Evaluation (Change 2.0)
+
+**Email:**
+{email}
+
+**Criteria:**
+1. **Authenticity**: Does it sound like a real professional, or an AI sales bot?
+2. **Logic-Induction**: Does the copy actually teach/prove the mechanism?
+3. **Tone**: Is it calm and authoritative ({market_tone}) or hypey?
+4. **Transition**: Is the move from education to the call-to-action natural?
+
+Provide:
+- A score (1-10)
+- What works
+- Specific improvement instructions for the next draft.
+"""
+
+EMAIL_SINGLE_IMPROVEMENT_PROMPT = """
+# Single Email Refinement (Change 2.0)
+
+Improve this ONE email based on the evaluation. Focus on deepening the professional narrative and stripping away any lingering marketing clichés.
+
+**Ensure the tone is {market_tone} and LANGUAGE is {language} (MANDATORY). Every single word must be in {language}.**
+
+**Original:**
+{email}
+
+**Evaluation:**
+{evaluation}
+
+**Output:**
+The improved email as one JSON object (same fields as the original).
 """
@@ -38,7 +38,11 @@ You shall:
 8. **PART 8: Q&A / OBJECTION HANDLING (Slides 101–110)**: Answering questions and reinforcing the new beliefs.
 
 ## OUTPUT FORMAT
-Deliver a clear text-based outline organized by the Parts above.
+Return every slide, in order, in the `slides` array:
+- `slide_number`: 1, 2, 3, ...
+- `section`: the Part the slide belongs to (e.g. "PART 1: INTRO / HOOK").
+- `title`, `description`: as described above.
+- `visual_visual`: the visual recommendation, or null.
 """
 
 STRUCTURE_EVALUATION_PROMPT = """
@@ -79,4 +83,7 @@ Rewrite and polish the slide-by-slide structure based on the evaluation findings
 - Ensure the final count is 80–110 slides.
 - Guarantee the tone is consistently professional and non-hyped.
 - Ensure transitions between "Parts" are seamless.
+
+**Output:**
+The complete improved structure in the `slides` array (same fields as the original slides).
 """
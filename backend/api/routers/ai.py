@@ -73,16 +73,18 @@ async def generate_concept(mentor_id: str = Body(..., embed=True)):
         try:
             from core.s3 import s3_service
             concept_list = [concepts.get("concept_1"), concepts.get("concept_2"), concepts.get("concept_3")]
-            for idx, concept_data in enumerate(concept_list, start=1):
-                if not concept_data:
-                    continue
-                concept_json = json.dumps(concept_data, indent=2, ensure_ascii=False)
-                file_name = f"concept_{mentor_id}_{idx}.json"
-                s3_url = await s3_service.upload_file(
-                    file_content=concept_json.encode("utf-8"),
-                    file_name=file_name,
-                    content_type="application/json"
+            present = [(idx, c) for idx, c in enumerate(concept_list, start=1) if c]
+            # Upload all concept JSON files in one batch
+            s3_urls = await s3_service.upload_many([
+                (
+                    json.dumps(concept_data, indent=2, ensure_ascii=False).encode("utf-8"),
+                    f"concept_{mentor_id}_{idx}.json",
+                    "application/json"
                 )
+                for idx, concept_data in present
+            ])
+            for (idx, concept_data), s3_url in zip(present, s3_urls):
+                file_name = f"concept_{mentor_id}_{idx}.json"
                 wc = models.WebinarConcept(
                     MentorId=mentor_id,
                     ConceptNumber=idx,
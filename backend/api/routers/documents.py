@@ -1,4 +1,6 @@
 
+import os
+import uuid
 from fastapi import APIRouter, UploadFile, File, HTTPException, Depends
 from typing import List
 from api import models, schemas
@@ -16,12 +18,9 @@ async def upload_document(
     Upload a document to S3 and save its metadata to MongoDB.
     """
     try:
-        # Read file content
-        content = await file.read()
-        
-        # Upload to S3
-        url = await s3_service.upload_file(
-            file_content=content,
+        # Stream to S3 (multipart for large files) without reading the whole file into memory
+        url = await s3_service.upload_stream(
+            file,
             file_name=file.filename,
             content_type=file.content_type
         )
@@ -42,6 +41,49 @@ async def upload_document(
         print(f"Error in upload_document: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to upload document: {str(e)}")
 
+@router.post("/upload/presign", response_model=schemas.PresignedUploadResponse)
+async def presign_document_upload(request: schemas.PresignedUploadRequest):
+    """
+    Presigned POST so the browser uploads large documents straight to S3.
+    Call /upload/complete afterwards to record the document.
+    """
+    try:
+        upload_name = f"{request.mentor_id}/{uuid.uuid4().hex[:12]}_{os.path.basename(request.file_name)}"
+        presigned = s3_service.create_presigned_upload(upload_name, request.content_type)
+        return {**presigned, "upload_name": upload_name}
+    except Exception as e:
+        print(f"Error in presign_document_upload: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to create upload URL: {str(e)}")
+
+@router.post("/upload/complete", response_model=schemas.OnboardingDocumentResponse)
+async def complete_document_upload(request: schemas.PresignedUploadComplete):
+    """
+    Save metadata for a document the browser uploaded directly to S3.
+    """
+    if not request.upload_name.startswith(f"{request.mentor_id}/"):
+        raise HTTPException(status_code=400, detail="Upload does not belong to this mentor")
+    try:
+        head = await s3_service.head_object(request.upload_name)
+        if head is None:
+            raise HTTPException(status_code=404, detail="Uploaded file not found in S3")
+
+        doc = models.OnboardingDocument(
+            MentorId=request.mentor_id,
+            FileName=request.file_name,
+            FileType=head.get("ContentType") or request.content_type,
+            S3Url=s3_service.public_url(request.upload_name),
+            UploadedAt=datetime.utcnow()
+        )
+        await doc.insert()
+
+        return doc
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Error in complete_document_upload: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to record document: {str(e)}")
+
 @router.get("/mentor/{mentor_id}", response_model=List[schemas.OnboardingDocumentResponse])
 async def get_mentor_documents(mentor_id: str):
     """
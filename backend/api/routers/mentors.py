@@ -3,6 +3,7 @@ from typing import List
 from api import models, schemas
 from beanie import PydanticObjectId
 from datetime import datetime
+from api.services.mentor_profile_cache import mentor_profile_cache
 # from api.services.audit_service import log_activity
 async def log_activity(*args, **kwargs): pass
 
@@ -56,6 +57,7 @@ async def update_mentor_by_user(user_id: str, mentor_update: schemas.MentorCreat
             new_mentor.updated_at = datetime.utcnow()
             
             await new_mentor.insert()
+            mentor_profile_cache.invalidate(user_id)
             return new_mentor
         
         # Update existing
@@ -86,6 +88,7 @@ async def update_mentor_by_user(user_id: str, mentor_update: schemas.MentorCreat
             mentor.name = mentor.full_name
             
         await mentor.save()
+        mentor_profile_cache.invalidate(user_id)
         return mentor
     except Exception as e:
         import traceback
@@ -130,6 +133,7 @@ async def delete_mentor(mentor_id: str):
     if not mentor:
          raise HTTPException(status_code=404, detail="Mentor not found")
     await mentor.delete()
+    mentor_profile_cache.invalidate(mentor.user_id)
     return {"message": "Mentor deleted successfully"}
 
 from api.services.file_storage import FileStorageService
@@ -1,13 +1,17 @@
-from fastapi import APIRouter, HTTPException, Body, File, UploadFile, Form, BackgroundTasks
-from fastapi.responses import Response
+from fastapi import APIRouter, HTTPException, Body, File, UploadFile, Form, BackgroundTasks, Request
 from fastapi.responses import JSONResponse
+from fastapi.responses import StreamingResponse
 from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
-from typing import Optional, List
-from datetime import datetime
+from typing import Optional, List, Callable, Awaitable, Any, Dict, Set
+import asyncio
+import json
 from api.models import WebinarAsset, WebinarProcessingJob
 from api.services.background_processor import background_processor
 from api.services.webinar_ai import webinar_ai_service
+from api.services.job_events import job_events, job_snapshot, is_terminal
+from api.services.llm_cache import fresh_results
+from core.settings import settings
 
 router = APIRouter()
 
@@ -17,6 +21,7 @@ class TranscriptUpdateRequest(BaseModel):
 
 class GenerateRequest(BaseModel):
     asset_id: str
+    regenerate: bool = False  # Regenerate action: don't serve the previous answer from the LLM cache
     # Context usually fetched from DB, but allow overrides if needed
 # class ContextUploadRequest(BaseModel): ...
 
@@ -52,17 +57,23 @@ async def upload_context(
             progress=5,
             message="Materials received. Starting background processing..."
         )
-        await job.save()
-        
-        # Queue background task (runs AFTER response is sent)
-        background_tasks.add_task(
-            background_processor.process_pdf_upload,
-            str(job.id),
-            mentor_id,
-            onboarding_doc,
-            hook_analysis,
-            files_data
-        )
+        
+        if settings.JOB_QUEUE_ENABLED:
+            # Durable queue: files are staged in GridFS and a worker picks the job up
+            await background_processor.enqueue_pdf_upload(job, onboarding_doc, hook_analysis, files_data)
+        else:
+            # A background task runs exactly once: its "failed" is final
+            job.attempts = job.max_attempts = 1
+            await job.save()
+            # Queue background task (runs AFTER response is sent)
+            background_tasks.add_task(
+                background_processor.process_pdf_upload,
+                str(job.id),
+                mentor_id,
+                onboarding_doc,
+                hook_analysis,
+                files_data
+            )
 
         
         # Return immediately - don't wait for processing!
@@ -78,28 +89,66 @@ async def upload_context(
 async def get_job_status(job_id: str):
     """
     Get status of a background processing job.
-    Frontend should poll this endpoint every 5 seconds.
+    Poll fallback for clients that can't use /jobs/{job_id}/events.
     """
     try:
         job = await WebinarProcessingJob.get(job_id)
         if not job:
             raise HTTPException(status_code=404, detail="Job not found")
         
-        return {
-            "job_id": str(job.id),
-            "status": job.status,
-            "progress": job.progress,
-            "message": job.message,
-            "asset_id": job.result_asset_id,
-            "error": job.error,
-            "created_at": job.created_at.isoformat() if job.created_at else None,
-            "updated_at": job.updated_at.isoformat() if job.updated_at else None
-        }
+        return job_snapshot(job)
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/jobs/{job_id}/events")
+async def stream_job_status(job_id: str, request: Request):
+    """
+    Server-Sent Events stream of job progress (same payload as /jobs/{job_id}/status).
+    Events are pushed as soon as progress is written; if nothing arrives for
+    JOB_EVENTS_POLL_SECONDS the job is re-read from the DB as a fallback.
+    The stream ends once the job is completed, or failed with no retries left.
+    """
+    try:
+        job = await WebinarProcessingJob.get(job_id)
+    except Exception:
+        job = None
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    def _sse(snapshot: dict) -> str:
+        return f"event: progress\ndata: {json.dumps(snapshot, ensure_ascii=False)}\n\n"
+
+    async def event_source():
+        last = job_snapshot(job)
+        yield _sse(last)
+        if is_terminal(last):
+            return
+
+        async with job_events.subscribe(job_id) as queue:
+            while not await request.is_disconnected():
+                try:
+                    snapshot = await asyncio.wait_for(queue.get(), timeout=settings.JOB_EVENTS_POLL_SECONDS)
+                except asyncio.TimeoutError:
+                    fresh = await WebinarProcessingJob.get(job_id)
+                    if not fresh:
+                        return
+                    snapshot = job_snapshot(fresh)
+                if snapshot == last:
+                    yield ": keep-alive\n\n"
+                    continue
+                last = snapshot
+                yield _sse(snapshot)
+                if is_terminal(snapshot):
+                    return
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 def _is_openai_quota_error(e: Exception) -> bool:
     """Check if error is OpenAI 429/quota related."""
     s = str(e).lower()
@@ -109,7 +158,8 @@ def _is_openai_quota_error(e: Exception) -> bool:
 @router.post("/concepts/generate")
 async def generate_concepts(request: GenerateRequest):
     try:
-        result = await webinar_ai_service.generate_concepts_chain(request.asset_id)
+        with fresh_results(request.regenerate):
+            result = await webinar_ai_service.generate_concepts_chain(request.asset_id)
         return {"status": "success", "data": result}
     except Exception as e:
         import traceback
@@ -128,6 +178,68 @@ async def generate_concepts(request: GenerateRequest):
             mock_data = webinar_ai_service._get_mock_response(f"Error: {str(e)[:100]}")
             return {"status": "success", "data": mock_data}
 
+# Chain tasks started by _sse_response; the loop only holds weak references to tasks,
+# so keep them alive here until they finish (also after the client disconnects)
+_sse_runner_tasks: Set[asyncio.Task] = set()
+
+
+def _sse_response(run: Callable[[Callable[[Dict[str, Any]], Awaitable[None]]], Awaitable[Any]]) -> StreamingResponse:
+    """
+    Run a chain with an `emit` callback and relay its events as Server-Sent Events.
+    The chain runs in its own task so the final result is still persisted
+    if the client disconnects mid-stream.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def emit(event: Dict[str, Any]) -> None:
+        await queue.put(event)
+
+    async def runner():
+        try:
+            result = await run(emit)
+            await queue.put({"event": "done", "data": result})
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            await queue.put({"event": "error", "detail": str(e)})
+        finally:
+            await queue.put(None)
+
+    async def event_source():
+        task = asyncio.create_task(runner())
+        _sse_runner_tasks.add(task)
+        task.add_done_callback(_sse_runner_tasks.discard)
+        while True:
+            item = await queue.get()
+            if item is None:
+                break
+            name = item.pop("event", "message")
+            payload = json.dumps(jsonable_encoder(item), ensure_ascii=False)
+            yield f"event: {name}\ndata: {payload}\n\n"
+        await task
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.post("/concepts/generate/stream")
+async def generate_concepts_stream(request: GenerateRequest):
+    """SSE variant of /concepts/generate: streams tokens per chain step (draft/evaluate/improve)."""
+    async def run(emit):
+        try:
+            with fresh_results(request.regenerate):
+                return await webinar_ai_service.generate_concepts_chain(request.asset_id, emit=emit)
+        except Exception as e:
+            print(f"[WebinarRouter] Stream error detected, applying mock fallback: {str(e)[:200]}")
+            return await webinar_ai_service.apply_mock_fallback_for_asset(
+                request.asset_id, reason=f"Fallback: {str(e)[:100]}"
+            )
+
+    return _sse_response(run)
+
 @router.post("/concepts/update-from-meeting")
 async def update_concept(request: TranscriptUpdateRequest):
     try:
@@ -334,45 +446,130 @@ async def admin_approve_video(video_id: str, request: AdminApproveRequest):
 @router.post("/structure/generate")
 async def generate_structure(request: GenerateRequest, concept_text: str = Body(..., embed=True)):
     try:
-        structure = await webinar_ai_service.generate_structure(request.asset_id, concept_text)
+        with fresh_results(request.regenerate):
+            structure = await webinar_ai_service.generate_structure(request.asset_id, concept_text)
         return {"status": "success", "structure": structure}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/structure/generate/stream")
+async def generate_structure_stream(request: GenerateRequest, concept_text: str = Body(..., embed=True)):
+    """SSE variant of /structure/generate."""
+    async def run(emit):
+        with fresh_results(request.regenerate):
+            structure = await webinar_ai_service.generate_structure(request.asset_id, concept_text, emit=emit)
+        return {"structure": structure}
+
+    return _sse_response(run)
+
 class EmailGenerateRequest(BaseModel):
     asset_id: str
     structure_text: str
     product_details: str
+    regenerate: bool = False
 
 @router.post("/emails/generate")
 async def generate_emails(request: EmailGenerateRequest):
     try:
-        emails = await webinar_ai_service.generate_email_plan(
-            request.asset_id, 
-            request.structure_text, 
-            request.product_details
-        )
+        with fresh_results(request.regenerate):
+            emails = await webinar_ai_service.generate_email_plan(
+                request.asset_id,
+                request.structure_text,
+                request.product_details
+            )
         return {"status": "success", "email_plan": emails, "data": emails}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/emails/generate/stream")
+async def generate_emails_stream(request: EmailGenerateRequest):
+    """SSE variant of /emails/generate."""
+    async def run(emit):
+        with fresh_results(request.regenerate):
+            emails = await webinar_ai_service.generate_email_plan(
+                request.asset_id,
+                request.structure_text,
+                request.product_details,
+                emit=emit
+            )
+        return {"email_plan": emails}
+
+    return _sse_response(run)
+
 class SingleEmailRequest(BaseModel):
     email_outline: str
     concept_context: str
+    regenerate: bool = False
 
 @router.post("/emails/generate-single")
 async def generate_single_email(request: SingleEmailRequest):
     try:
-        result = await webinar_ai_service.generate_single_email_chain(
-            request.email_outline, 
-            request.concept_context
-        )
+        with fresh_results(request.regenerate):
+            result = await webinar_ai_service.generate_single_email_chain(
+                request.email_outline,
+                request.concept_context
+            )
         return {"status": "success", "data": result}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+# Named field sets for GET /assets/{asset_id}?view=... (most pages need a small slice of the asset)
+ASSET_VIEWS: Dict[str, List[str]] = {
+    "summary": [
+        "mentor_id", "created_at", "updated_at", "selected_concept", "video_status",
+        "concept_version", "structure_version", "email_version",
+        "concept_approval_status", "structure_approval_status", "email_approval_status", "media_approval_status",
+    ],
+    "concepts": [
+        "concepts_original", "concepts_evaluated", "concepts_improved", "selected_concept",
+        "concept_version", "concept_admin_notes", "concept_approval_status", "transcript_analysis",
+    ],
+    "structure": [
+        "selected_concept", "structure_content", "structure", "structure_version",
+        "structure_admin_notes", "structure_approval_status",
+    ],
+    "emails": [
+        "mentor_id", "created_at", "email_plan_content", "email_plan", "email_version",
+        "email_admin_notes", "email_approval_status",
+    ],
+    "media": [
+        "selected_concept", "promotional_images", "video_url", "video_talk_id", "video_status", "media_approval_status",
+    ],
+}
+
+
+def _asset_projection(view: Optional[str], fields: Optional[str]) -> Optional[Dict[str, int]]:
+    """Mongo projection for the requested view(s) and fields, or None for the whole asset."""
+    if not view and not fields:
+        return None
+    selected: List[str] = []
+    for name in (view or "").split(","):
+        name = name.strip()
+        if not name:
+            continue
+        if name not in ASSET_VIEWS:
+            raise HTTPException(status_code=400, detail=f"Unknown view '{name}'. Available: {', '.join(ASSET_VIEWS)}")
+        selected.extend(ASSET_VIEWS[name])
+    for field in (fields or "").split(","):
+        field = field.strip()
+        if not field:
+            continue
+        # Nested paths (email_plan.timeline) are fine as long as the top-level field exists
+        if field.split(".")[0] not in WebinarAsset.model_fields:
+            raise HTTPException(status_code=400, detail=f"Unknown field '{field}'")
+        selected.append(field)
+    projection = {field: 1 for field in selected}
+    # Mongo rejects a projection containing both a field and one of its sub-paths
+    return {f: 1 for f in projection if not any(f.startswith(f"{p}.") for p in projection if p != f)}
+
+
 @router.get("/assets/{asset_id}")
-async def get_asset(asset_id: str):
+async def get_asset(asset_id: str, view: Optional[str] = None, fields: Optional[str] = None):
+    """
+    The webinar asset. `view` (summary, concepts, structure, emails, media; comma separated)
+    and/or `fields` (comma separated, dotted paths allowed) return only those fields, read
+    with a Mongo projection instead of loading the whole document (onboarding text included).
+    """
     try:
         from api.models import WebinarAsset
         from beanie import PydanticObjectId
@@ -383,6 +580,15 @@ async def get_asset(asset_id: str):
         except Exception:
             raise HTTPException(status_code=400, detail="Invalid asset ID format")
         
+        projection = _asset_projection(view, fields)
+        if projection is not None:
+            doc = await WebinarAsset.get_motor_collection().find_one({"_id": obj_id}, projection)
+            if not doc:
+                raise HTTPException(status_code=404, detail="Webinar asset not found")
+            # Same id key as the full document response
+            doc["id"] = str(doc.pop("_id"))
+            return JSONResponse(content=jsonable_encoder(doc))
+        
         asset = await WebinarAsset.get(obj_id)
         if not asset:
             raise HTTPException(status_code=404, detail="Webinar asset not found")
@@ -418,23 +624,36 @@ class InstantAudioRequest(BaseModel):
 async def generate_instant_audio(request: InstantAudioRequest):
     """
     FAST path (seconds): returns MP3 audio for the given text.
-    Frontend can turn this into a quick preview audio locally.
+    The audio streams as it is synthesized, so playback can start on the first chunk;
+    repeats of the same text/voice/speed are served from the TTS cache.
     """
-    try:
-        from api.services.tts_service import tts_service
+    from fastapi.responses import FileResponse
+    from api.services.tts_service import tts_service
 
-        audio_bytes = tts_service.synthesize_mp3(
-            request.text,
-            voice=request.voice,
-            speed=float(request.speed or 1.0),
-        )
-        if not audio_bytes:
-            raise ValueError("TTS returned empty audio")
+    speed = float(request.speed or 1.0)
+    try:
+        cached_path = await tts_service.cached_path(request.text, voice=request.voice, speed=speed)
+        if cached_path:
+            return FileResponse(cached_path, media_type="audio/mpeg", headers={"X-TTS-Cache": "hit"})
 
-        return Response(content=audio_bytes, media_type="audio/mpeg")
+        chunks = tts_service.stream_mp3(request.text, voice=request.voice, speed=speed)
+        # Pull the first chunk here so OpenAI errors still become a 500 instead of a broken stream
+        first_chunk = await chunks.__anext__()
+    except StopAsyncIteration:
+        raise HTTPException(status_code=500, detail="TTS returned empty audio")
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+    async def audio_source():
+        try:
+            yield first_chunk
+            async for chunk in chunks:
+                yield chunk
+        finally:
+            await chunks.aclose()
+
+    return StreamingResponse(audio_source(), media_type="audio/mpeg", headers={"X-TTS-Cache": "miss"})
+
 @router.post("/video/upload-avatar")
 async def upload_avatar_image(file: UploadFile = File(...)):
     """
@@ -454,7 +673,7 @@ async def upload_avatar_image(file: UploadFile = File(...)):
             raise HTTPException(status_code=400, detail="Uploaded file is empty")
 
         # 1. Save locally (for Gemini video generation)
-        result = gemini_video_service.save_avatar_image(file_bytes, file.filename)
+        result = await asyncio.to_thread(gemini_video_service.save_avatar_image, file_bytes, file.filename)
         
         # 2. Upload to S3 (for fast access & persistence on live server)
         s3_url = ""
@@ -487,15 +706,17 @@ async def generate_video(request: VideoGenerateRequest):
         text = request.script_text
         provider = settings.DEFAULT_VIDEO_PROVIDER.lower()
         
-        # If asset_id provided AND no script_text, attempt to fetch from structure
-        if request.asset_id and not text:
+        # Script fallback, mentor language, talk id and mentor id all come from the asset: load it once
+        asset = None
+        if request.asset_id:
             try:
-                from api.models import WebinarAsset
                 asset = await WebinarAsset.get(request.asset_id)
-                if asset and asset.structure_content:
-                    text = asset.structure_content[:1200]
-            except Exception:
-                pass
+            except Exception as e:
+                print(f"Warning: Could not fetch asset {request.asset_id}: {e}")
+
+        # If asset_id provided AND no script_text, attempt to fetch from structure
+        if asset and not text and asset.structure_content:
+            text = asset.structure_content[:1200]
         
         if not text:
              raise HTTPException(status_code=400, detail="No script text provided or found in asset")
@@ -510,14 +731,10 @@ async def generate_video(request: VideoGenerateRequest):
         language = request.language_tone or "Norwegian"
         
         # If not explicitly provided, try to fetch from Mentor profile via Asset
-        if request.asset_id and not request.language_tone:
+        if asset and asset.mentor_id and not request.language_tone:
              try:
-                 from api.models import WebinarAsset, Mentor
-                 asset = await WebinarAsset.get(request.asset_id)
-                 if asset and asset.mentor_id:
-                     mentor = await Mentor.find_one(Mentor.user_id == asset.mentor_id)
-                     if mentor and hasattr(mentor, "language_tone") and mentor.language_tone:
-                         language = mentor.language_tone
+                 from api.services.mentor_profile_cache import mentor_profile_cache
+                 language = await mentor_profile_cache.language_tone(asset.mentor_id, default=language)
              except Exception as e:
                  print(f"Warning: Could not fetch mentor language: {e}")
 
@@ -582,7 +799,7 @@ async def generate_video(request: VideoGenerateRequest):
                          resolved_image_path = dora_path
                  except: pass
 
-            result = heygen_service.safe_generate_video(
+            result = await heygen_service.safe_generate_video(
                 script_text=text,
                 image_path=resolved_image_path,
                 talking_photo_id=None, # will use default DORA-14 if no image_path
@@ -600,7 +817,7 @@ async def generate_video(request: VideoGenerateRequest):
                 
         else:
             print(f"[WebinarRouter] Generating via Gemini Veo...")
-            result = gemini_video_service.safe_generate_video(
+            result = await gemini_video_service.safe_generate_video(
                 script_text=text,
                 image_path=request.image_path,
                 aspect_ratio=request.aspect_ratio or "16:9",
@@ -615,14 +832,9 @@ async def generate_video(request: VideoGenerateRequest):
             raise HTTPException(status_code=500, detail=result.get("error", "Video generation failed"))
         
         # SAVE operation id to asset (reuse video_talk_id field for UI compat)
-        if request.asset_id:
+        if asset:
             try:
-                from api.models import WebinarAsset
-                asset = await WebinarAsset.get(request.asset_id)
-                if asset:
-                    asset.video_talk_id = result.get("id")
-                    asset.video_status = "pending"
-                    await asset.save()
+                await asset.set({WebinarAsset.video_talk_id: result.get("id"), WebinarAsset.video_status: "pending"})
             except: pass
             
         # --- Save script to S3 and create Webinar_Video record ---
@@ -630,13 +842,7 @@ async def generate_video(request: VideoGenerateRequest):
             from core.s3 import s3_service
             from api.models import WebinarVideo, ConceptStatus
             
-            mentor_id = ""
-            if request.asset_id:
-                try:
-                    asset_for_mentor = await WebinarAsset.get(request.asset_id)
-                    if asset_for_mentor:
-                        mentor_id = asset_for_mentor.mentor_id
-                except: pass
+            mentor_id = asset.mentor_id if asset else ""
             
             talk_id = result.get("id", "")
             script_file_name = f"video_script_{talk_id}.txt"
@@ -676,35 +882,51 @@ async def get_video_status(talk_id: str):
     try:
         from api.services.gemini_video_service import gemini_video_service
         from api.services.heygen_service import heygen_service
+        from api.services.video_finalizer import video_finalizer
+        
+        # Already copied to S3: answer from the DB without calling the provider
+        try:
+            finalized = await video_finalizer.get_finalized(talk_id)
+        except Exception as e:
+            print(f"Error reading finalized video: {e}")
+            finalized = None
+        if finalized:
+            return {
+                "id": talk_id,
+                "status": "done",
+                "result_url": finalized.VideoS3Url,
+                "items": [{"video_url": finalized.VideoS3Url}],
+                "source_url": finalized.VideoSourceUrl,
+                "cached": True,
+            }
         
         # Detect provider
-        if "/" in talk_id or "operation" in talk_id.lower():
-            service = gemini_video_service
-            provider_name = "Gemini"
-        else:
-            service = heygen_service
-            provider_name = "HeyGen"
+        is_gemini = "/" in talk_id or "operation" in talk_id.lower()
+        provider_name = "Gemini" if is_gemini else "HeyGen"
             
         try:
-            result = service.get_video_status(talk_id)
+            if is_gemini:
+                result = await gemini_video_service.get_video_status(talk_id)
+            else:
+                result = await heygen_service.get_video_status(talk_id)
         except Exception as inner:
             return {"id": talk_id, "status": "error", "result_url": None, "detail": str(inner)[:200]}
             
         if not result:
              raise HTTPException(status_code=404, detail=f"Video operation not found ({provider_name})")
         
-        # PERSIST: If completed, save the URL to the asset AND S3 + Webinar_Video
+        # PERSIST: If completed, save the URL to the asset, then copy the render to S3 once
         if (
             result.get("status") in ("done", "completed")
             and result.get("result_url")
         ):
             video_source_url = result.get("result_url")
             
-            # Save to WebinarAsset (existing logic)
+            # Save to WebinarAsset (existing logic); replaced by the S3 URL once finalized
             try:
                 from api.models import WebinarAsset
                 asset = await WebinarAsset.find_one(WebinarAsset.video_talk_id == talk_id)
-                if asset:
+                if asset and asset.video_status != "completed":
                     asset.video_url = video_source_url
                     asset.video_status = "completed"
                     await asset.save()
@@ -712,47 +934,8 @@ async def get_video_status(talk_id: str):
             except Exception as e: 
                 print(f"Error persisting video status: {e}")
             
-            # --- Upload video to S3 and update Webinar_Video record ---
-            try:
-                from core.s3 import s3_service
-                from api.models import WebinarVideo, ConceptStatus
-                import requests as req
-                
-                # Download the video from HeyGen/Gemini URL
-                video_resp = req.get(video_source_url, timeout=120)
-                if video_resp.status_code == 200:
-                    video_file_name = f"webinar_video_{talk_id}.mp4"
-                    video_s3_url = await s3_service.upload_file(
-                        file_content=video_resp.content,
-                        file_name=video_file_name,
-                        content_type="video/mp4"
-                    )
-                    
-                    # Update existing Webinar_Video record
-                    wv = await WebinarVideo.find_one(WebinarVideo.TalkId == talk_id)
-                    if wv:
-                        wv.VideoS3Url = video_s3_url
-                        wv.VideoSourceUrl = video_source_url
-                        wv.Status = ConceptStatus.Pending  # stays 0=Pending until admin approves
-                        await wv.save()
-                        print(f"[WebinarRouter] Video saved to S3: {video_s3_url}, Webinar_Video updated: {wv.id}, Status=Pending(0)")
-                    else:
-                        # Fallback: create a new record if not found
-                        wv_new = WebinarVideo(
-                            MentorId="",
-                            TalkId=talk_id,
-                            Script="",
-                            ScriptS3Url="",
-                            VideoS3Url=video_s3_url,
-                            VideoSourceUrl=video_source_url,
-                            Status=ConceptStatus.Pending,  # 0 = Pending
-                        )
-                        await wv_new.insert()
-                        print(f"[WebinarRouter] Video saved to S3 (new record): {video_s3_url}, Status=Pending(0)")
-                else:
-                    print(f"[WebinarRouter] WARNING: Failed to download video from {video_source_url}: HTTP {video_resp.status_code}")
-            except Exception as s3_err:
-                print(f"[WebinarRouter] WARNING: S3 video upload failed: {s3_err}")
+            # --- Stream video to S3 and update Webinar_Video record (runs once per TalkId) ---
+            video_finalizer.schedule(talk_id, video_source_url)
 
         return result
     except Exception as e:
@@ -770,169 +953,29 @@ async def generate_promotional_image(request: PromotionalImageRequest):
     Generate promotional images using DALL-E based on webinar concept
     """
     try:
-        import openai
-        import os
-        from api.models import WebinarAsset, Concept
-        
+        from api.services.image_generation import image_generation_service
+
         # Get the asset/concept details - with better error handling
-        concept_text = request.concept_text or "professional business webinar"
-        
+        asset = None
         try:
             asset = await WebinarAsset.get(request.concept_id)
-            if asset and asset.selected_concept:
-                # FIX: selected_concept is a Concept object, not a dict
-                # Access attributes directly, not with .get()
-                concept_obj = asset.selected_concept
-                if isinstance(concept_obj, dict):
-                    # If it's stored as dict
-                    big_idea = concept_obj.get("big_idea", "")
-                    hook = concept_obj.get("hook", "")
-                else:
-                    # If it's a Concept object
-                    big_idea = getattr(concept_obj, "big_idea", "")
-                    hook = getattr(concept_obj, "hook", "")
-                
-                if big_idea or hook:
-                    concept_text = f"{big_idea}. {hook}".strip(". ")
         except Exception as e:
             # If asset not found, use provided concept_text or fallback
             print(f"Warning: Could not fetch asset {request.concept_id}: {str(e)}")
-            pass  # Continue with fallback concept_text
-        
-        # Create image-specific prompts
-        prompts = {
-            "registration_hero": f"Create a professional, eye-catching hero banner image for a webinar landing page about: {concept_text}. Modern gradient design, clean and professional, 1920x1080",
-            "social_ad": f"Create a bold, attention-grabbing social media ad image for a webinar about: {concept_text}. Square format, vibrant colors, text-free design, 1080x1080",
-            "email_header": f"Create a clean email header banner for a webinar about: {concept_text}. Professional gradient, minimalist, 1200x400",
-            "slide_title": f"Create a presentation title slide background for: {concept_text}. Professional gradient, corporate style, 1920x1080",
-            "slide_content": f"Create a clean content slide background. Subtle pattern, professional, light background, 1920x1080",
-            "thumbnail": f"Create a compelling video thumbnail for a webinar about: {concept_text}. Bold text-free design, eye-catching, 1280x720"
-        }
-        
-        prompt = prompts.get(request.media_type, prompts["registration_hero"])
-        
-        # Check if OpenAI API key is set
-        api_key = os.getenv("OPENAI_API_KEY")
-        use_mock_mode = os.getenv("MOCK_IMAGE_MODE", "false").lower() == "true"
-        
-        # MOCK MODE for testing without OpenAI credits
-        if use_mock_mode or not api_key:
-            print("Using MOCK MODE for image generation (OpenAI disabled)")
-            # Return placeholder images from picsum.photos
-            mock_images = {
-                "registration_hero": "https://picsum.photos/1920/1080?random=1",
-                "social_ad": "https://picsum.photos/1080/1080?random=2",
-                "email_header": "https://picsum.photos/1200/400?random=3",
-                "slide_title": "https://picsum.photos/1920/1080?random=4",
-                "slide_content": "https://picsum.photos/1920/1080?random=5",
-                "thumbnail": "https://picsum.photos/1280/720?random=6"
-            }
-            
-            return {
-                "status": "success",
-                "image_url": mock_images.get(request.media_type, mock_images["registration_hero"]),
-                "media_type": request.media_type,
-                "prompt_used": f"[MOCK MODE] {prompt}",
-                "mock": True
-            }
-        
-        # Generate image using DALL-E
-        try:
-            client = openai.OpenAI(api_key=api_key)
-            
-            # SPEED OPTIMIZATION: DALL-E 2 is significantly faster than DALL-E 3
-            # DALL-E 2 (~2-5s) vs DALL-E 3 (~15-20s)
-            is_fast = request.fast_mode
-            model = "dall-e-2" if is_fast else "dall-e-3"
-            size = "512x512" if is_fast else "1024x1024"
-            
-            print(f"Generating image ({model}, {size}) for {request.media_type} via OpenAI...")
-            
-            response = client.images.generate(
-                model=model,
-                prompt=prompt,
-                size=size,
-                quality="standard",
-                n=1,
-            )
-            
-            image_url = response.data[0].url
-            
-            # SUCCESS: Save the result to the database!
-            image_result = {
-                "status": "success",
-                "image_url": image_url,
-                "media_type": request.media_type,
-                "prompt_used": prompt,
-                "created_at": datetime.utcnow().isoformat()
-            }
-            
+        concept_text = image_generation_service.concept_text_for(asset, request.concept_text)
+
+        result = await image_generation_service.generate(request.media_type, concept_text, request.fast_mode)
+
+        # Save the result (mock results too) to the database
+        if asset:
             try:
-                asset = await WebinarAsset.get(request.concept_id)
-                if asset:
-                    # Initialize list if missing
-                    if asset.promotional_images is None:
-                        asset.promotional_images = []
-                    
-                    # Remove existing image of same type if any
-                    asset.promotional_images = [img for img in asset.promotional_images if img.get("media_type") != request.media_type]
-                    
-                    # Add new image
-                    asset.promotional_images.append({
-                        "media_type": request.media_type,
-                        "image_url": image_url,
-                        "status": "generated",
-                        "created_at": datetime.utcnow()
-                    })
-                    await asset.save()
-                    print(f"Successfully saved image {request.media_type} to asset {request.concept_id}")
+                await image_generation_service.save(asset.id, [result])
+                print(f"Successfully saved image {request.media_type} to asset {request.concept_id}")
             except Exception as db_err:
                 print(f"Error saving image to DB: {db_err}")
 
-            return image_result
-
-        except openai.OpenAIError as oe:
-            # If OpenAI fails (no credits, etc.), fall back to mock mode
-            print(f"OpenAI API error: {str(oe)}")
-            print("Falling back to MOCK MODE")
-            
-            mock_images = {
-                "registration_hero": "https://picsum.photos/1920/1080?random=1",
-                "social_ad": "https://picsum.photos/1080/1080?random=2",  
-                "email_header": "https://picsum.photos/1200/400?random=3",
-                "slide_title": "https://picsum.photos/1920/1080?random=4",
-                "slide_content": "https://picsum.photos/1920/1080?random=5",
-                "thumbnail": "https://picsum.photos/1280/720?random=6"
-            }
-            
-            image_url = mock_images.get(request.media_type, mock_images["registration_hero"])
-            
-            # Save MOCK result too
-            try:
-                asset = await WebinarAsset.get(request.concept_id)
-                if asset:
-                    if asset.promotional_images is None:
-                        asset.promotional_images = []
-                    asset.promotional_images = [img for img in asset.promotional_images if img.get("media_type") != request.media_type]
-                    asset.promotional_images.append({
-                        "media_type": request.media_type,
-                        "image_url": image_url,
-                        "status": "generated",
-                        "created_at": datetime.utcnow(),
-                        "mock": True
-                    })
-                    await asset.save()
-            except: pass
+        return result
 
-            return {
-                "status": "success",
-                "image_url": image_url,
-                "media_type": request.media_type,
-                "prompt_used": f"[MOCK - OpenAI Credits Exhausted] {prompt}",
-                "mock": True,
-                "fallback_reason": str(oe)
-            }
-        
     except HTTPException:
         raise  # Re-raise HTTP exceptions
     except Exception as e:
@@ -941,6 +984,55 @@ async def generate_promotional_image(request: PromotionalImageRequest):
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"Failed to generate image: {str(e)}")
 
+class PromotionalImageBatchRequest(BaseModel):
+    asset_id: str
+    media_types: List[str]  # any of registration_hero, social_ad, email_header, slide_title, slide_content, thumbnail
+    concept_text: Optional[str] = None
+    fast_mode: bool = True
+
+@router.post("/images/generate-batch")
+async def generate_promotional_images(request: PromotionalImageBatchRequest):
+    """
+    Generate several promotional images for an asset concurrently and save them
+    to promotional_images in one update. Takes as long as the slowest image.
+    """
+    from api.services.image_generation import image_generation_service, MEDIA_TYPES
+
+    unknown = [m for m in request.media_types if m not in MEDIA_TYPES]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown media types: {', '.join(unknown)}")
+    media_types = list(dict.fromkeys(request.media_types))  # drop duplicates, keep order
+    if not media_types:
+        raise HTTPException(status_code=400, detail="media_types is empty")
+
+    try:
+        from beanie import PydanticObjectId
+
+        try:
+            obj_id = PydanticObjectId(request.asset_id)
+        except Exception:
+            raise HTTPException(status_code=400, detail="Invalid asset ID format")
+        asset = await WebinarAsset.get(obj_id)
+        if not asset:
+            raise HTTPException(status_code=404, detail="Asset not found")
+
+        concept_text = image_generation_service.concept_text_for(asset, request.concept_text)
+        results = await image_generation_service.generate_batch(media_types, concept_text, request.fast_mode)
+        await image_generation_service.save(asset.id, results)
+        return {
+            "status": "success",
+            "images": results,
+            "generated": sum(1 for r in results if r.get("status") == "success"),
+            "failed": sum(1 for r in results if r.get("status") != "success"),
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Batch image generation error: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=f"Failed to generate images: {str(e)}")
+
 class MarketingRequest(BaseModel):
     concept_id: str
     media_type: str  # registration_page, social_ads, email_graphics, slide_visuals
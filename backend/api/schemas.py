@@ -252,3 +252,21 @@ class OnboardingDocumentResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+class PresignedUploadRequest(BaseModel):
+    mentor_id: str
+    file_name: str
+    content_type: str = "application/octet-stream"
+
+class PresignedUploadResponse(BaseModel):
+    url: str
+    fields: Dict[str, str]
+    key: str
+    s3_url: str
+    upload_name: str  # Pass back to /upload/complete once the browser upload finished
+
+class PresignedUploadComplete(BaseModel):
+    mentor_id: str
+    upload_name: str
+    file_name: str
+    content_type: str = "application/octet-stream"
@@ -4,6 +4,9 @@ import logging
 from typing import Dict, List, Any, Optional
 from openai import AsyncOpenAI
 from api.prompts.norwegian_prompts import *
+from api.services.llm_cache import llm_cache
+from api.services.token_budget import token_budget
+from api.services.openai_limiter import openai_limiter
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -21,30 +24,53 @@ class AIService:
             return self._client
             
         if self.api_key:
-            self._client = AsyncOpenAI(api_key=self.api_key)
+            # 429 retries are handled (and paced for every caller) by openai_limiter
+            self._client = AsyncOpenAI(api_key=self.api_key, max_retries=0)
         else:
             logger.warning("OPENAI_API_KEY is not set. AI features will use MOCKS.")
             
         return self._client
 
-    async def _call_llm(self, system_prompt: str, user_prompt: str, response_format: str = "json_object") -> Any:
+    async def _call_llm(self, system_prompt: str, user_prompt: str, response_format: str = "json_object", use_cache: bool = True) -> Any:
         if not self.client:
             raise Exception("OpenAI Client not initialized")
             
+        temperature = 0.7
+        # Whatever the window has left after the prompt, so JSON answers aren't cut off mid-object
+        max_tokens = token_budget.max_output_tokens(system_prompt, user_prompt, model=self.model, fill_window=True)
+        cache_key = None
+        content = None
+        if use_cache:
+            cache_key = llm_cache.make_key(
+                self.model, system_prompt, user_prompt, temperature, max_tokens, response_format=response_format
+            )
+            content = await llm_cache.get(cache_key)
+
         try:
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                response_format={"type": response_format},
-                temperature=0.7,
+            if content is not None:
+                return json.loads(content) if response_format == "json_object" else content
+
+            response = await openai_limiter.run(
+                "chat",
+                lambda: self.client.chat.completions.create(
+                    model=self.model,
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": user_prompt}
+                    ],
+                    response_format={"type": response_format},
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                ),
+                tokens=token_budget.count_messages(system_prompt, user_prompt, model=self.model) + max_tokens,
+                usage=lambda r: r.usage.total_tokens,
             )
             content = response.choices[0].message.content
-            if response_format == "json_object":
-                return json.loads(content)
-            return content
+            result = json.loads(content) if response_format == "json_object" else content
+            # Cache only complete responses that parsed cleanly
+            if cache_key and response.choices[0].finish_reason != "length":
+                await llm_cache.set(cache_key, content, model=self.model)
+            return result
         except Exception as e:
             logger.error(f"Error calling LLM: {e}")
             raise
@@ -67,10 +93,10 @@ Navn: {mentor_name}
 Bransje: {industry}
 
 **Onboarding-dokument:**
-{onboarding_doc[:3000]}...
+{token_budget.truncate(onboarding_doc, 750, model=self.model)}...
 
 **Hook-analyse:**
-{hook_analysis[:2000]}...
+{token_budget.truncate(hook_analysis, 500, model=self.model)}...
 
 Generer 3 komplette webinarkonsepter på norsk.
         """
@@ -214,7 +240,7 @@ Forbedre konseptene basert på evalueringen.
 {json.dumps(concepts, ensure_ascii=False)}
 
 **Transkripsjon fra mentor-møte:**
-{transcript[:4000]}...
+{token_budget.truncate(transcript, 1000, model=self.model)}...
 
 Rafiner konseptene basert på mentorens tilbakemelding.
         """
@@ -263,7 +289,7 @@ Lag en detaljert slide-by-slide disposisjon.
 {json.dumps(slides, ensure_ascii=False)}
 
 **Transkripsjon fra mentor-møte:**
-{transcript[:4000]}...
+{token_budget.truncate(transcript, 1000, model=self.model)}...
 
 Oppdater disposisjonen basert på tilbakemelding.
         """
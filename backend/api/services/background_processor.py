@@ -1,32 +1,40 @@
 """
 Background Processor Service for Async PDF/AI Processing
 
-This service handles long-running tasks in the background using FastAPI's BackgroundTasks.
-It updates the job status in MongoDB so the frontend can poll for progress.
+This service handles long-running tasks in the background. Jobs are either run by
+the durable queue workers (api/services/job_queue.py, JOB_QUEUE_ENABLED) or, as a
+fallback, by FastAPI's BackgroundTasks.
+Progress is written through job_progress (targeted, coalesced $set updates) which
+also pushes each update to job_events (SSE).
 """
 
 import asyncio
-from datetime import datetime
 from api.models import WebinarAsset, WebinarProcessingJob
 from api.services.webinar_ai import webinar_ai_service
-from typing import Optional
+from api.services.job_progress import job_progress
+from core.settings import settings
+from typing import List, Optional
 
 
 class BackgroundProcessor:
     """Handles background processing of PDF uploads and AI generation tasks"""
-    
+
     async def process_pdf_upload(
         self, 
         job_id: str, 
         mentor_id: str, 
         onboarding_doc: str, 
         hook_analysis: str,
-        files_data: Optional[list] = None
+        files_data: Optional[list] = None,
+        raise_on_error: bool = False
     ):
         """
         Background task for multi-file processing.
         This runs after the HTTP response is sent.
+        With raise_on_error the failure is re-raised so the job queue can retry it;
+        JobQueue.fail then sets the status (retry or terminal "failed").
         """
+        job = None
         try:
             # Get the job record
             job = await WebinarProcessingJob.get(job_id)
@@ -35,78 +43,68 @@ class BackgroundProcessor:
                 return
             
             # Update status to processing
-            job.status = "processing"
-            job.progress = 10
-            job.message = "Analyzing uploaded materials..."
-            job.updated_at = datetime.utcnow()
-            await job.save()
+            await job_progress.update(job, status="processing", progress=10, message="Analyzing uploaded materials...")
             
-            # Step 1: Extract text from multiple files
-            all_extracted_text = []
+            # Step 1: Extract text from multiple files (concurrently, output in upload order)
             if files_data:
-                for idx, file_info in enumerate(files_data):
-                    f_bytes = file_info.get("bytes")
-                    f_name = file_info.get("filename")
-                    
-                    if f_bytes and f_name:
-                        job.progress = 10 + int((idx / len(files_data)) * 30)
-                        job.message = f"Extracting text from {f_name}..."
-                        await job.save()
-                        
-                        extracted = await webinar_ai_service.extract_text_from_file(f_bytes, f_name)
-                        if extracted:
-                            all_extracted_text.append(f"--- [EXTRACTED FROM {f_name}] ---\n{extracted}")
-                
+                all_extracted_text = await self._extract_files(job, files_data)
                 if all_extracted_text:
                     onboarding_doc = f"{onboarding_doc}\n\n" + "\n\n".join(all_extracted_text)
             
-            job.progress = 40
-            job.message = "Materials synced. Saving to database..."
-            await job.save()
+            await job_progress.update(job, progress=40, message="Materials synced. Saving to database...")
 
             
-            # Step 2: Create WebinarAsset
-            asset = WebinarAsset(
-                mentor_id=mentor_id,
-                onboarding_doc_content=onboarding_doc,
-                hook_analysis_content=hook_analysis
-            )
-            await asset.save()
+            # Step 2: Create WebinarAsset (reuse it when a retried job already created one)
+            asset = await WebinarAsset.get(job.result_asset_id) if job.result_asset_id else None
+            if asset is None:
+                asset = WebinarAsset(
+                    mentor_id=mentor_id,
+                    onboarding_doc_content=onboarding_doc,
+                    hook_analysis_content=hook_analysis
+                )
+                await asset.save()
             
-            job.progress = 50
-            job.message = "Document saved. Starting AI concept generation..."
-            job.result_asset_id = str(asset.id)
-            await job.save()
+            await job_progress.update(
+                job,
+                progress=50,
+                message="Document saved. Starting AI concept generation...",
+                result_asset_id=str(asset.id)
+            )
             
             # Step 3: Generate concepts using AI (this is the slow part)
             try:
-                job.progress = 60
-                job.message = "AI is generating webinar concepts (this may take 1-2 minutes)..."
-                await job.save()
+                await job_progress.update(
+                    job, progress=60, message="AI is generating webinar concepts (this may take 1-2 minutes)..."
+                )
                 
-                result = await webinar_ai_service.generate_concepts_chain(str(asset.id))
+                # Under the queue, OpenAI errors propagate so the job is retried with backoff;
+                # only the last attempt settles for mock concepts
+                last_attempt = job.attempts >= job.max_attempts
+                result = await webinar_ai_service.generate_concepts_chain(
+                    str(asset.id), mock_fallback=not raise_on_error or last_attempt
+                )
                 
-                job.progress = 90
-                job.message = "Finalizing concepts..."
-                await job.save()
+                await job_progress.update(job, progress=90, message="Finalizing concepts...")
                 
             except Exception as ai_error:
                 # AI generation failed, but asset was created
                 print(f"[BackgroundProcessor] AI generation error: {ai_error}")
-                job.status = "failed"
-                job.progress = 100
-                job.error = str(ai_error)
-                job.message = f"Document saved, but AI generation failed: {str(ai_error)[:100]}"
-                job.updated_at = datetime.utcnow()
-                await job.save()
+                if raise_on_error:
+                    # OpenAI 429/5xx are usually transient: let the queue retry (the asset is reused)
+                    raise
+                await job_progress.update(
+                    job,
+                    status="failed",
+                    progress=100,
+                    error=str(ai_error),
+                    message=f"Document saved, but AI generation failed: {str(ai_error)[:100]}"
+                )
                 return
             
             # Step 4: Mark complete
-            job.status = "completed"
-            job.progress = 100
-            job.message = "Processing complete! Concepts are ready."
-            job.updated_at = datetime.utcnow()
-            await job.save()
+            await job_progress.update(
+                job, status="completed", progress=100, message="Processing complete! Concepts are ready."
+            )
             
             print(f"[BackgroundProcessor] Job {job_id} completed successfully. Asset ID: {asset.id}")
             
@@ -114,19 +112,69 @@ class BackgroundProcessor:
             print(f"[BackgroundProcessor] Job {job_id} failed: {e}")
             import traceback
             traceback.print_exc()
+
+            if raise_on_error:
+                # No terminal write here: JobQueue.fail decides between a retry and "failed".
+                # Write coalesced progress now so a trailing flush can't overwrite its message.
+                if job is not None:
+                    try:
+                        await job_progress.flush(job)
+                    except Exception as flush_error:
+                        print(f"[BackgroundProcessor] Failed to flush progress: {flush_error}")
+                raise
             
             # Update job with error
             try:
                 job = await WebinarProcessingJob.get(job_id)
                 if job:
-                    job.status = "failed"
-                    job.error = str(e)[:500]
-                    job.message = f"Processing failed: {str(e)[:100]}"
-                    job.updated_at = datetime.utcnow()
-                    await job.save()
+                    await job_progress.update(
+                        job, status="failed", error=str(e)[:500], message=f"Processing failed: {str(e)[:100]}"
+                    )
             except Exception as save_error:
                 print(f"[BackgroundProcessor] Failed to save error status: {save_error}")
     
+    async def _extract_files(self, job: WebinarProcessingJob, files_data: list) -> List[str]:
+        """
+        Extract all uploaded files concurrently (FILE_EXTRACT_CONCURRENCY at a time).
+        Results keep upload order; a failing file is logged and skipped without
+        affecting the others. Job progress (10-40%) follows extracted bytes.
+        """
+        files = [f for f in files_data if f.get("bytes") and f.get("filename")]
+        if not files:
+            return []
+        total_bytes = sum(len(f["bytes"]) for f in files)
+        done_bytes = [0.0] * len(files)
+        semaphore = asyncio.Semaphore(max(1, settings.FILE_EXTRACT_CONCURRENCY))
+
+        async def _report(message: str):
+            await job_progress.update(job, progress=10 + int(sum(done_bytes) / total_bytes * 30), message=message)
+
+        async def _extract(idx: int, f_bytes: bytes, f_name: str) -> Optional[str]:
+            async with semaphore:
+                await _report(f"Extracting text from {f_name}...")
+
+                async def _on_pages(done: int, total: int):
+                    done_bytes[idx] = len(f_bytes) * done / max(total, 1)
+                    await _report(f"Extracting text from {f_name} (page {done}/{total})...")
+
+                try:
+                    extracted = await webinar_ai_service.extract_text_from_file(f_bytes, f_name, progress=_on_pages)
+                except Exception as e:
+                    print(f"[BackgroundProcessor] Extraction failed for {f_name}, skipping: {e}")
+                    extracted = None
+                done_bytes[idx] = len(f_bytes)
+                await _report(f"Extracted {f_name}")
+                return extracted
+
+        results = await asyncio.gather(*(
+            _extract(idx, f["bytes"], f["filename"]) for idx, f in enumerate(files)
+        ))
+        return [
+            f"--- [EXTRACTED FROM {f['filename']}] ---\n{extracted}"
+            for f, extracted in zip(files, results)
+            if extracted
+        ]
+
     async def process_concept_generation(self, job_id: str, asset_id: str):
         """Background task for concept generation only (when PDF already uploaded)"""
         try:
@@ -134,26 +182,88 @@ class BackgroundProcessor:
             if not job:
                 return
             
-            job.status = "processing"
-            job.progress = 20
-            job.message = "Starting AI concept generation..."
-            await job.save()
+            await job_progress.update(job, status="processing", progress=20, message="Starting AI concept generation...")
             
             result = await webinar_ai_service.generate_concepts_chain(asset_id)
             
-            job.status = "completed"
-            job.progress = 100
-            job.message = "Concepts generated successfully!"
-            job.result_asset_id = asset_id
-            await job.save()
+            await job_progress.update(
+                job,
+                status="completed",
+                progress=100,
+                message="Concepts generated successfully!",
+                result_asset_id=asset_id
+            )
             
         except Exception as e:
             job = await WebinarProcessingJob.get(job_id)
             if job:
-                job.status = "failed"
-                job.error = str(e)[:500]
-                job.message = f"Concept generation failed: {str(e)[:100]}"
-                await job.save()
+                await job_progress.update(
+                    job, status="failed", error=str(e)[:500], message=f"Concept generation failed: {str(e)[:100]}"
+                )
+
+    # --- Durable queue integration ---
+
+    async def enqueue_pdf_upload(
+        self,
+        job: WebinarProcessingJob,
+        onboarding_doc: str,
+        hook_analysis: str,
+        files_data: Optional[list] = None
+    ) -> WebinarProcessingJob:
+        """Stage uploaded files in GridFS and queue the job for a worker."""
+        from api.services.file_storage import FileStorageService
+        from api.services.job_queue import job_queue
+
+        storage = FileStorageService()
+        staged_files = []
+        for file_info in files_data or []:
+            f_bytes = file_info.get("bytes")
+            f_name = file_info.get("filename")
+            if f_bytes and f_name:
+                file_id = await storage.upload_file(f_bytes, f_name, "application/octet-stream")
+                staged_files.append({"file_id": file_id, "filename": f_name})
+
+        job.payload = {
+            "onboarding_doc": onboarding_doc,
+            "hook_analysis": hook_analysis,
+            "files": staged_files
+        }
+        return await job_queue.enqueue(job)
+
+    async def run_multi_upload_job(self, job: WebinarProcessingJob):
+        """Queue handler for "multi_upload" jobs."""
+        from api.services.file_storage import FileStorageService
+
+        storage = FileStorageService()
+        payload = job.payload or {}
+        staged_files = payload.get("files", [])
+
+        files_data = []
+        for staged in staged_files:
+            f_bytes, _ = await storage.download_file(staged["file_id"])
+            files_data.append({"bytes": f_bytes, "filename": staged["filename"]})
+
+        await self.process_pdf_upload(
+            str(job.id),
+            job.mentor_id,
+            payload.get("onboarding_doc", ""),
+            payload.get("hook_analysis", ""),
+            files_data,
+            raise_on_error=True
+        )
+
+        # Staged copies are only needed until the job succeeds
+        for staged in staged_files:
+            try:
+                await storage.delete_file(staged["file_id"])
+            except Exception as e:
+                print(f"[BackgroundProcessor] Could not delete staged file {staged['file_id']}: {e}")
+
+    def job_handlers(self) -> dict:
+        """job_type -> handler map for JobWorker."""
+        return {
+            "multi_upload": self.run_multi_upload_job,
+        }
 
 
 # Singleton instance
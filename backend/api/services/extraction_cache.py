@@ -0,0 +1,201 @@
+"""
+Content-addressed cache of extracted document text.
+
+The same onboarding PDF is often uploaded many times. Extracted (already cleaned)
+text is stored in `webinar_extraction_cache` keyed by the SHA-256 of the file
+bytes plus the file extension, so a re-upload of a known file skips parsing.
+
+- Small texts are stored inline, larger ones in GridFS (EXTRACTION_CACHE_INLINE_MAX_BYTES)
+- Total cached text is bounded by EXTRACTION_CACHE_MAX_BYTES (least recently used evicted)
+- Concurrent extractions of the same content share one in-flight extraction
+
+Cache failures never break uploads: every DB error is logged and treated as a miss.
+"""
+
+import asyncio
+import hashlib
+import os
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from core.settings import settings
+
+
+class ExtractionCache:
+    # Check the total cached size every N writes instead of on every insert
+    EVICTION_CHECK_INTERVAL = 20
+
+    def __init__(self) -> None:
+        self.enabled = settings.EXTRACTION_CACHE_ENABLED
+        self.max_bytes = settings.EXTRACTION_CACHE_MAX_BYTES
+        self.inline_max_bytes = settings.EXTRACTION_CACHE_INLINE_MAX_BYTES
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._writes_since_eviction = 0
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.shared = 0  # waited on an in-flight extraction of the same content
+        self.writes = 0
+        self.errors = 0
+
+    @staticmethod
+    def hash_bytes(file_bytes: bytes) -> str:
+        return hashlib.sha256(file_bytes).hexdigest()
+
+    @staticmethod
+    def make_key(content_hash: str, filename: str) -> str:
+        # The extension picks the parser, so identical bytes under .txt and .pdf are distinct entries
+        return f"{content_hash}{os.path.splitext(filename)[1].lower()}"
+
+    async def key_for(self, file_bytes: bytes, filename: str) -> str:
+        # Hashing tens of MB takes a noticeable slice of a second: keep it off the loop
+        content_hash = await asyncio.to_thread(self.hash_bytes, file_bytes)
+        return self.make_key(content_hash, filename)
+
+    async def get_or_extract(
+        self,
+        file_bytes: bytes,
+        filename: str,
+        extract: Callable[[], Awaitable[str]],
+        cacheable: Callable[[str], bool] = bool,
+    ) -> str:
+        """Cached text for these bytes, or run `extract()` once and store the result if `cacheable(text)`."""
+        if not self.enabled:
+            return await extract()
+
+        key = await self.key_for(file_bytes, filename)
+        text = await self.get(key)
+        if text is not None:
+            print(f"[ExtractionCache] Hit for {filename} ({key[:12]})")
+            return text
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.shared += 1
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            text = await extract()
+            future.set_result(text)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Retrieve it so an unawaited failure isn't reported as "never retrieved"
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+        if cacheable(text):
+            await self.set(key, text, filename=filename, file_size=len(file_bytes))
+        return text
+
+    async def get(self, key: str) -> Optional[str]:
+        if not self.enabled:
+            return None
+        try:
+            from api.models import ExtractionCacheEntry
+
+            entry = await ExtractionCacheEntry.find_one(ExtractionCacheEntry.key == key)
+            if entry:
+                text = entry.text
+                if text is None and entry.text_file_id:
+                    from api.services.file_storage import FileStorageService
+
+                    data, _ = await FileStorageService().download_file(entry.text_file_id)
+                    text = data.decode("utf-8")
+                await entry.set({
+                    ExtractionCacheEntry.hits: entry.hits + 1,
+                    ExtractionCacheEntry.last_accessed_at: datetime.utcnow(),
+                })
+                self.hits += 1
+                return text
+        except Exception as e:
+            self.errors += 1
+            print(f"[ExtractionCache] WARNING: lookup failed, treating as miss: {e}")
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, text: str, filename: str = "", file_size: int = 0) -> None:
+        if not self.enabled:
+            return
+        try:
+            from api.models import ExtractionCacheEntry
+
+            encoded = text.encode("utf-8")
+            entry = ExtractionCacheEntry(key=key, filename=filename, file_size=file_size, text_bytes=len(encoded))
+            if len(encoded) > self.inline_max_bytes:
+                from api.services.file_storage import FileStorageService
+
+                entry.text_file_id = await FileStorageService().upload_file(
+                    encoded, f"extraction_cache/{key}.txt", "text/plain"
+                )
+            else:
+                entry.text = text
+
+            existing = await ExtractionCacheEntry.find_one(ExtractionCacheEntry.key == key)
+            if existing:
+                # Lost a race with another process: keep the existing entry
+                if entry.text_file_id:
+                    await self._delete_text_file(entry.text_file_id)
+                return
+            await entry.insert()
+            self.writes += 1
+
+            self._writes_since_eviction += 1
+            if self._writes_since_eviction >= self.EVICTION_CHECK_INTERVAL:
+                self._writes_since_eviction = 0
+                await self._evict()
+        except Exception as e:
+            self.errors += 1
+            print(f"[ExtractionCache] WARNING: write failed: {e}")
+
+    async def _evict(self) -> None:
+        """Drop least-recently-used entries until the cached text fits EXTRACTION_CACHE_MAX_BYTES."""
+        from api.models import ExtractionCacheEntry
+
+        collection = ExtractionCacheEntry.get_motor_collection()
+        totals = await collection.aggregate([{"$group": {"_id": None, "bytes": {"$sum": "$text_bytes"}}}]).to_list(1)
+        overflow = (totals[0]["bytes"] if totals else 0) - self.max_bytes
+        if overflow <= 0:
+            return
+
+        evicted = 0
+        async for entry in ExtractionCacheEntry.find_all().sort(+ExtractionCacheEntry.last_accessed_at):
+            if overflow <= 0:
+                break
+            if entry.text_file_id:
+                await self._delete_text_file(entry.text_file_id)
+            await entry.delete()
+            overflow -= entry.text_bytes
+            evicted += 1
+        print(f"[ExtractionCache] Evicted {evicted} least-recently-used entries")
+
+    @staticmethod
+    async def _delete_text_file(file_id: str) -> None:
+        from api.services.file_storage import FileStorageService
+
+        try:
+            await FileStorageService().delete_file(file_id)
+        except Exception as e:
+            print(f"[ExtractionCache] Could not delete cached text file {file_id}: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "shared_inflight": self.shared,
+            "writes": self.writes,
+            "errors": self.errors,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+        }
+
+
+extraction_cache = ExtractionCache()
@@ -86,6 +86,7 @@ class FileStorageService:
         Extract text from PDF file
         """
         try:
+            from PyPDF2 import PdfReader
             pdf_reader = PdfReader(io.BytesIO(file_content))
             text = ""
             for page in pdf_reader.pages:
@@ -100,6 +101,7 @@ class FileStorageService:
         Extract text from DOCX file
         """
         try:
+            import docx
             doc = docx.Document(io.BytesIO(file_content))
             text = "\n".join([paragraph.text for paragraph in doc.paragraphs])
             return text.strip()
@@ -122,20 +124,27 @@ class FileStorageService:
         Upload file and extract text content
         Returns: (file_id, extracted_text)
         """
+        from api.services.webinar_ai import webinar_ai_service
+
         # Upload file
         file_id = await self.upload_file(file_content, filename, content_type)
         
-        # Extract text based on file type
+        # Extract text based on file type (shared extractor: process pool + content-hash cache)
         extracted_text = ""
         if content_type == "application/pdf" or filename.lower().endswith('.pdf'):
-            extracted_text = self.extract_text_from_pdf(file_content)
+            extracted_text = await webinar_ai_service.extract_text_from_file(file_content, self._with_extension(filename, ".pdf"))
         elif content_type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document" or filename.lower().endswith('.docx'):
-            extracted_text = self.extract_text_from_docx(file_content)
+            extracted_text = await webinar_ai_service.extract_text_from_file(file_content, self._with_extension(filename, ".docx"))
         elif content_type == "text/plain" or filename.lower().endswith('.txt'):
             extracted_text = self.extract_text_from_txt(file_content)
         else:
             logger.warning(f"Unsupported file type: {content_type}")
         
-        return file_id, extracted_text
+        return file_id, extracted_text.strip()
+
+    @staticmethod
+    def _with_extension(filename: str, extension: str) -> str:
+        """The extractor picks a parser by extension; trust the content type when the name lacks it."""
+        return filename if filename.lower().endswith(extension) else f"{filename}{extension}"
 
 # file_storage_service = FileStorageService()
@@ -3,14 +3,15 @@ Google Gemini Veo 3.1 Video Generation Service
 Replaces HeyGen for avatar video creation.
 Uses the user-uploaded image as the first frame of the generated video.
 """
+import asyncio
 import os
-import time
 import base64
 import uuid
-import requests
+import httpx
 from typing import Any, Dict, Optional
 from fastapi import HTTPException
 from core.settings import settings
+from core.http_client import gemini_http_client
 
 
 class GeminiVideoService:
@@ -20,9 +21,12 @@ class GeminiVideoService:
     - Generating video from image + text prompt (image-to-video)
     - Polling operation status
     - Saving uploaded avatar images
+
+    Network calls are async on the shared pooled `gemini_http_client`.
     """
 
     BASE_URL = "https://generativelanguage.googleapis.com/v1beta"
+    DOWNLOAD_CHUNK_SIZE = 1024 * 1024
 
     def __init__(self):
         self.api_key = settings.GEMINI_API_KEY
@@ -38,6 +42,8 @@ class GeminiVideoService:
         self.videos_dir = os.path.join(self.static_dir, "videos")
         os.makedirs(self.avatars_dir, exist_ok=True)
         os.makedirs(self.videos_dir, exist_ok=True)
+        # video_path -> download in progress, shared by concurrent status polls
+        self._downloads: Dict[str, asyncio.Task] = {}
 
     def _headers(self):
         return {
@@ -73,7 +79,7 @@ class GeminiVideoService:
             print(f"[Gemini] CRITICAL ERROR saving avatar image: {e}")
             raise Exception(f"Failed to write avatar file to disk: {str(e)}")
 
-    def generate_video(
+    async def generate_video(
         self,
         script_text: str,
         image_path: Optional[str] = None,
@@ -110,27 +116,10 @@ class GeminiVideoService:
             "prompt": final_prompt,
         }
 
-        # If image provided, encode it as base64 for image-to-video
+        # If image provided, encode it as base64 for image-to-video (file I/O off the loop)
         if image_path and os.path.exists(image_path):
             try:
-                with open(image_path, "rb") as img_file:
-                    image_bytes = img_file.read()
-                
-                # Detect mime type
-                ext = os.path.splitext(image_path)[1].lower()
-                mime_map = {
-                    ".jpg": "image/jpeg",
-                    ".jpeg": "image/jpeg",
-                    ".png": "image/png",
-                    ".webp": "image/webp",
-                }
-                mime_type = mime_map.get(ext, "image/jpeg")
-                
-                image_b64 = base64.b64encode(image_bytes).decode("utf-8")
-                instance["image"] = {
-                    "bytesBase64Encoded": image_b64,
-                    "mimeType": mime_type,
-                }
+                instance["image"] = await asyncio.to_thread(self._encode_image, image_path)
                 print(f"[Gemini] Using image as first frame: {image_path}")
             except Exception as e:
                 print(f"[Gemini] Warning: Could not read image {image_path}: {e}")
@@ -144,61 +133,71 @@ class GeminiVideoService:
             },
         }
 
-        # RETRY LOGIC for Rate Limits (429)
-        max_retries = 3
-        
-        for attempt in range(max_retries):
-            try:
-                print(f"[Gemini] Starting video generation (Model: {self.model}): prompt='{final_prompt[:80]}...' (Attempt {attempt+1}/{max_retries})")
-                response = requests.post(url, headers=self._headers(), json=payload, timeout=60)
-                
-                if response.status_code == 429:
-                    print("Gemini API Rate Limit Hit (429)")
-                    if attempt < max_retries - 1:
-                        sleep_time = (2 ** attempt) + (0.1 * (int(time.time()) % 10)) # Backoff: 2s, 4s, etc + jitter
-                        print(f"[Gemini] Sleeping {sleep_time:.2f}s before retry...")
-                        time.sleep(sleep_time)
-                        continue
-                    else:
-                        raise HTTPException(
-                            status_code=429, 
-                            detail="Google Gemini API Rate Limit Exceeded. Please wait 1-2 minutes and try again. (Free tier limits)"
-                        )
-                
-                if response.status_code == 400:
-                    print(f"[Gemini] 400 Error Response: {response.text}")
-                
-                response.raise_for_status()
-                data = response.json()
+        # Rate limits (429) are retried with async backoff by the pooled client. Not 5xx or read
+        # timeouts: the operation may already have started, and a retry would start a second one.
+        try:
+            print(f"[Gemini] Starting video generation (Model: {self.model}): prompt='{final_prompt[:80]}...'")
+            response = await gemini_http_client.request_with_retry(
+                "POST",
+                url,
+                retries=settings.GEMINI_MAX_RETRIES,
+                backoff_base=settings.GEMINI_RETRY_BASE_SECONDS,
+                idempotent=False,
+                headers=self._headers(),
+                json=payload,
+            )
 
-                operation_name = data.get("name", "")
-                if not operation_name:
-                    print(f"[Gemini] Unexpected response: {data}")
-                    return {"error": "No operation name returned", "status": "error"}
+            if response.status_code == 429:
+                print("Gemini API Rate Limit Hit (429)")
+                raise HTTPException(
+                    status_code=429, 
+                    detail="Google Gemini API Rate Limit Exceeded. Please wait 1-2 minutes and try again. (Free tier limits)"
+                )
 
-                print(f"[Gemini] Video generation started: {operation_name}")
-                return {
-                    "id": operation_name,
-                    "operation_name": operation_name,
-                    "status": "processing",
-                    "provider": "gemini",
-                }
-            except requests.exceptions.RequestException as e:
-                # If it's a 429 that raised RequestException (unlikely with manual check above, but safely handle)
-                if hasattr(e, 'response') and e.response is not None and e.response.status_code == 429:
-                     if attempt < max_retries - 1:
-                        time.sleep(2 ** attempt)
-                        continue
-                        
-                error_msg = str(e)
-                try:
-                    error_msg = e.response.text[:500] if e.response else str(e)
-                except:
-                    pass
-                print(f"[Gemini] Error starting video generation: {error_msg}")
-                return {"error": error_msg, "status": "error"}
+            if response.status_code == 400:
+                print(f"[Gemini] 400 Error Response: {response.text}")
+
+            response.raise_for_status()
+            data = response.json()
+
+            operation_name = data.get("name", "")
+            if not operation_name:
+                print(f"[Gemini] Unexpected response: {data}")
+                return {"error": "No operation name returned", "status": "error"}
+
+            print(f"[Gemini] Video generation started: {operation_name}")
+            return {
+                "id": operation_name,
+                "operation_name": operation_name,
+                "status": "processing",
+                "provider": "gemini",
+            }
+        except httpx.HTTPError as e:
+            error_msg = str(e)
+            if isinstance(e, httpx.HTTPStatusError):
+                error_msg = e.response.text[:500] or error_msg
+            print(f"[Gemini] Error starting video generation: {error_msg}")
+            return {"error": error_msg, "status": "error"}
+
+    @staticmethod
+    def _encode_image(image_path: str) -> Dict[str, str]:
+        with open(image_path, "rb") as img_file:
+            image_bytes = img_file.read()
+
+        # Detect mime type
+        ext = os.path.splitext(image_path)[1].lower()
+        mime_map = {
+            ".jpg": "image/jpeg",
+            ".jpeg": "image/jpeg",
+            ".png": "image/png",
+            ".webp": "image/webp",
+        }
+        return {
+            "bytesBase64Encoded": base64.b64encode(image_bytes).decode("utf-8"),
+            "mimeType": mime_map.get(ext, "image/jpeg"),
+        }
 
-    def get_video_status(self, operation_name: str) -> Dict[str, Any]:
+    async def get_video_status(self, operation_name: str) -> Dict[str, Any]:
         """
         Poll the status of a video generation operation.
         
@@ -211,7 +210,14 @@ class GeminiVideoService:
         url = f"{self.BASE_URL}/{operation_name}"
 
         try:
-            response = requests.get(url, headers=self._headers(), timeout=30)
+            response = await gemini_http_client.request_with_retry(
+                "GET",
+                url,
+                retries=settings.GEMINI_MAX_RETRIES,
+                backoff_base=settings.GEMINI_RETRY_BASE_SECONDS,
+                headers=self._headers(),
+                timeout=30,
+            )
             response.raise_for_status()
             data = response.json()
 
@@ -232,7 +238,7 @@ class GeminiVideoService:
 
                 if video_uri:
                     # Download the video to local static directory
-                    local_url = self._download_video(video_uri, operation_name)
+                    local_url = await self._download_video(video_uri, operation_name)
                     print(f"[Gemini] Video ready: {local_url}")
                     return {
                         "id": operation_name,
@@ -258,7 +264,6 @@ class GeminiVideoService:
                     }
             else:
                 # Still processing
-                metadata = data.get("metadata", {})
                 return {
                     "id": operation_name,
                     "status": "processing",
@@ -266,7 +271,7 @@ class GeminiVideoService:
                     "provider": "gemini",
                 }
 
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             error_msg = str(e)[:200]
             print(f"[Gemini] Error polling status: {error_msg}")
             return {
@@ -276,11 +281,33 @@ class GeminiVideoService:
                 "detail": error_msg,
             }
 
-    def _download_video(self, video_uri: str, operation_name: str) -> str:
+    async def _download_video(self, video_uri: str, operation_name: str) -> str:
         """
-        Download a generated video from Gemini's URI to local static directory.
+        Stream a generated video from Gemini's URI to the local static directory.
+        Chunks are written to a temp file in a worker thread and renamed when complete,
+        so the event loop never blocks and a partial file is never served.
+        Repeated polls for the same operation reuse the downloaded file, and polls that
+        arrive while it is still downloading wait for that download instead of starting another.
         Returns the local URL path for serving.
         """
+        video_id = operation_name.split("/")[-1] if "/" in operation_name else operation_name[:16]
+        video_filename = f"gemini_{video_id}.mp4"
+        video_path = os.path.join(self.videos_dir, video_filename)
+        local_url = f"/static/videos/{video_filename}"
+
+        if os.path.exists(video_path):
+            return local_url
+
+        task = self._downloads.get(video_path)
+        if task is None:
+            task = asyncio.create_task(self._fetch_video(video_uri, video_path, local_url))
+            self._downloads[video_path] = task
+            task.add_done_callback(lambda _: self._downloads.pop(video_path, None))
+        # Shielded: a poll that disconnects must not cancel the download other polls wait on
+        return await asyncio.shield(task)
+
+    async def _fetch_video(self, video_uri: str, video_path: str, local_url: str) -> str:
+        tmp_path = f"{video_path}.{uuid.uuid4().hex[:8]}.part"
         try:
             # Add API key to download URL
             download_url = video_uri
@@ -289,33 +316,33 @@ class GeminiVideoService:
             else:
                 download_url += f"?key={self.api_key}"
 
-            response = requests.get(
-                download_url, 
+            async with gemini_http_client.stream(
+                "GET",
+                download_url,
                 headers={"x-goog-api-key": self.api_key},
-                stream=True, 
-                timeout=120,
-                allow_redirects=True,
-            )
-            response.raise_for_status()
-
-            # Save with a unique name
-            video_id = operation_name.split("/")[-1] if "/" in operation_name else operation_name[:16]
-            video_filename = f"gemini_{video_id}.mp4"
-            video_path = os.path.join(self.videos_dir, video_filename)
-
-            with open(video_path, "wb") as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
+                timeout=settings.GEMINI_DOWNLOAD_TIMEOUT,
+                follow_redirects=True,
+            ) as response:
+                response.raise_for_status()
+                f = await asyncio.to_thread(open, tmp_path, "wb")
+                try:
+                    async for chunk in response.aiter_bytes(self.DOWNLOAD_CHUNK_SIZE):
+                        await asyncio.to_thread(f.write, chunk)
+                finally:
+                    await asyncio.to_thread(f.close)
 
+            await asyncio.to_thread(os.replace, tmp_path, video_path)
             print(f"[Gemini] Video downloaded to: {video_path}")
-            return f"/static/videos/{video_filename}"
+            return local_url
 
         except Exception as e:
             print(f"[Gemini] Error downloading video: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
             # Fall back to returning the Gemini URI directly
             return video_uri
 
-    def safe_generate_video(self, **kwargs) -> Optional[Dict[str, Any]]:
+    async def safe_generate_video(self, **kwargs) -> Optional[Dict[str, Any]]:
         """
         Wrapper to avoid throwing 500s to UI when Gemini isn't configured.
         """
@@ -324,7 +351,7 @@ class GeminiVideoService:
             print("[Gemini] API key not set - returning None")
             return None
         try:
-            return self.generate_video(**kwargs)
+            return await self.generate_video(**kwargs)
         except HTTPException:
             # Re-raise FastAPIs HTTPException to let it hit the router
             raise
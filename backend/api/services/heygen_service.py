@@ -1,8 +1,10 @@
+import asyncio
 import os
 import mimetypes
-import requests
+import httpx
 from typing import Any, Dict, Optional
 from core.settings import settings
+from core.http_client import heygen_http_client
 import time
 from dotenv import load_dotenv
 
@@ -12,6 +14,11 @@ class HeyGenService:
     - Uploading/using a talking_photo_id (photo avatar)
     - Generating a video from text
     - Polling status to get the final video URL
+
+    All calls are async and go through the shared pooled `heygen_http_client`
+    (retry with backoff on 429/5xx), so a slow HeyGen request never blocks the event loop.
+    Create calls (video generate, photo upload) are POSTs and are only retried on 429
+    or when the connection failed before sending, so a retry can't start a second video.
     """
 
     def __init__(self) -> None:
@@ -44,7 +51,19 @@ class HeyGenService:
         # Docs show both `X-Api-Key` and `x-api-key`; HeyGen accepts either.
         return {"X-Api-Key": self.api_key, "accept": "application/json"}
 
-    def upload_talking_photo(self, image_path: str) -> Dict[str, Any]:
+    async def _request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """Pooled request with HeyGen retry policy (POSTs: 429 only); raises on non-2xx."""
+        resp = await heygen_http_client.request_with_retry(
+            method,
+            url,
+            retries=settings.HEYGEN_MAX_RETRIES,
+            backoff_base=settings.HEYGEN_RETRY_BASE_SECONDS,
+            **kwargs,
+        )
+        resp.raise_for_status()
+        return resp
+
+    async def upload_talking_photo(self, image_path: str) -> Dict[str, Any]:
         """
         Upload a photo to get a talking_photo_id.
         Docs: POST https://upload.heygen.com/v1/talking_photo
@@ -60,13 +79,11 @@ class HeyGenService:
             # Default to jpeg if unknown
             content_type = "image/jpeg"
 
-        with open(image_path, "rb") as f:
-            data = f.read()
+        data = await asyncio.to_thread(self._read_file, image_path)
 
         headers = {"x-api-key": self.api_key, "Content-Type": content_type, "accept": "application/json"}
         url = f"{self.upload_base_v1}/talking_photo"
-        resp = requests.post(url, headers=headers, data=data, timeout=120)
-        resp.raise_for_status()
+        resp = await self._request("POST", url, headers=headers, content=data, timeout=120)
         payload = resp.json()
         # HeyGen responses can be either {code:100,...} or {error:null,data:{...}}
         if payload.get("code") not in (None, 100) and payload.get("error") is not None:
@@ -75,7 +92,12 @@ class HeyGenService:
             raise ValueError(f"HeyGen upload error: {payload}")
         return payload
 
-    def generate_video(
+    @staticmethod
+    def _read_file(path: str) -> bytes:
+        with open(path, "rb") as f:
+            return f.read()
+
+    async def generate_video(
         self,
         script_text: str,
         image_path: Optional[str] = None,
@@ -103,7 +125,7 @@ class HeyGenService:
         if image_path and os.path.exists(image_path):
             try:
                 print(f"[HeyGenService] Uploading dynamic avatar image: {image_path}")
-                upload_resp = self.upload_talking_photo(image_path)
+                upload_resp = await self.upload_talking_photo(image_path)
                 dynamic_id = (upload_resp.get("data") or {}).get("talking_photo_id")
                 if dynamic_id:
                     print(f"[HeyGenService] Dynamic upload successful. ID: {dynamic_id}")
@@ -141,7 +163,7 @@ class HeyGenService:
                     if os.path.exists(p):
                         print(f"[HeyGenService] Found fallback avatar: {p}")
                         try:
-                            uploaded = self.upload_talking_photo(p)
+                            uploaded = await self.upload_talking_photo(p)
                             talking_photo_id = (uploaded.get("data") or {}).get("talking_photo_id")
                             # cache for future calls in-process
                             if talking_photo_id:
@@ -172,7 +194,7 @@ class HeyGenService:
             target_voice_id = self.NORWEGIAN_VOICE_IDS.get(gender.lower())
             
         if not target_voice_id:
-             target_voice_id = self._pick_default_norwegian_voice_id() # Last resort fallback
+             target_voice_id = await self._pick_default_norwegian_voice_id() # Last resort fallback
              
         if not target_voice_id:
             raise ValueError("voice_id is required (set HEYGEN_VOICE_ID or pass in request)")
@@ -197,8 +219,7 @@ class HeyGenService:
         # UPDATE: User requested "Hand Movement" and quality. Re-enabling Avatar IV.
         body["use_avatar_iv_model"] = True
 
-        resp = requests.post(url, headers=headers, json=body, timeout=180)
-        resp.raise_for_status()
+        resp = await self._request("POST", url, headers=headers, json=body, timeout=180)
         payload = resp.json()
         # HeyGen responses can be either {code:100,...} or {error:null,data:{...}}
         if payload.get("code") not in (None, 100) and payload.get("error") is not None:
@@ -213,7 +234,7 @@ class HeyGenService:
         # Return a compatible shape (frontend expects `id`)
         return {"id": video_id, "status": "processing", "provider": "heygen", "raw": payload}
 
-    def get_video_status(self, video_id: str) -> Dict[str, Any]:
+    async def get_video_status(self, video_id: str) -> Dict[str, Any]:
         """
         Poll status until completed.
         Docs: GET https://api.heygen.com/v1/video_status.get?video_id=...
@@ -234,8 +255,7 @@ class HeyGenService:
             }
 
         url = f"{self.api_base_v1}/video_status.get"
-        resp = requests.get(url, headers=self._headers(), params={"video_id": video_id}, timeout=60)
-        resp.raise_for_status()
+        resp = await self._request("GET", url, headers=self._headers(), params={"video_id": video_id})
         payload = resp.json()
         if payload.get("code") not in (None, 100) and payload.get("error") is not None:
             raise ValueError(f"HeyGen status error: {payload}")
@@ -275,7 +295,7 @@ class HeyGenService:
 
         return {"id": video_id, "status": "processing", "provider": "heygen", "raw": payload}
 
-    def _pick_default_norwegian_voice_id(self) -> Optional[str]:
+    async def _pick_default_norwegian_voice_id(self) -> Optional[str]:
         """
         Best-effort: pick a Norwegian voice if HEYGEN_VOICE_ID not configured.
         Uses /v2/voices and tries to find nb-NO / Norwegian.
@@ -283,7 +303,7 @@ class HeyGenService:
         if self._cached_voice_id:
             return self._cached_voice_id
         try:
-            voices = self.list_voices()
+            voices = await self.list_voices()
             data = voices.get("data") or voices.get("voices") or []
             # HeyGen commonly returns { data: { voices: [...] } }
             if isinstance(data, dict) and "voices" in data and isinstance(data["voices"], list):
@@ -305,12 +325,12 @@ class HeyGenService:
             return None
         return None
 
-    def safe_generate_video(self, *args, **kwargs) -> Dict[str, Any]:
+    async def safe_generate_video(self, *args, **kwargs) -> Dict[str, Any]:
         """
         Wrapper to avoid throwing 500s to UI when HeyGen isn't configured yet.
         """
         try:
-            return self.generate_video(*args, **kwargs)
+            return await self.generate_video(*args, **kwargs)
         except Exception as e:
             print(f"[HeyGenService] CRITICAL ERROR in safe_generate_video: {e}")
             import traceback
@@ -324,25 +344,22 @@ class HeyGenService:
                 "detail": f"HeyGen Generation Error: {str(e)}" # Detail for frontend info
             }
 
-    def list_voices(self) -> Dict[str, Any]:
+    async def list_voices(self) -> Dict[str, Any]:
         """GET https://api.heygen.com/v2/voices"""
         url = f"{self.api_base_v2}/voices"
-        resp = requests.get(url, headers=self._headers(), timeout=60)
-        resp.raise_for_status()
+        resp = await self._request("GET", url, headers=self._headers())
         return resp.json()
 
-    def list_avatar_groups(self) -> Dict[str, Any]:
+    async def list_avatar_groups(self) -> Dict[str, Any]:
         """GET https://api.heygen.com/v2/avatar_group.list"""
         url = f"{self.api_base_v2}/avatar_group.list"
-        resp = requests.get(url, headers=self._headers(), timeout=60)
-        resp.raise_for_status()
+        resp = await self._request("GET", url, headers=self._headers())
         return resp.json()
 
-    def list_avatars_in_group(self, group_id: str) -> Dict[str, Any]:
+    async def list_avatars_in_group(self, group_id: str) -> Dict[str, Any]:
         """GET https://api.heygen.com/v2/avatar_group/{group_id}/avatars"""
         url = f"{self.api_base_v2}/avatar_group/{group_id}/avatars"
-        resp = requests.get(url, headers=self._headers(), timeout=60)
-        resp.raise_for_status()
+        resp = await self._request("GET", url, headers=self._headers())
         return resp.json()
 
 
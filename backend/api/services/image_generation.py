@@ -0,0 +1,220 @@
+"""
+Promotional image generation (DALL-E) for webinar assets.
+
+The Media page used to call /images/generate once per media type, and each call
+built a synchronous OpenAI client and blocked the event loop for the whole
+generation (up to ~20s on DALL-E 3). Here one shared AsyncOpenAI client is used
+(paced by openai_limiter), a batch of media types is generated concurrently
+(IMAGE_BATCH_CONCURRENCY), and all results are written to
+`promotional_images` in a single atomic update that replaces entries of the
+same media types. Saved images are then mirrored to S3 (image_mirror).
+
+OpenAI errors (no credits, ...) and MOCK_IMAGE_MODE give picsum placeholder
+images, as before.
+"""
+
+import asyncio
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from core.settings import settings
+
+MEDIA_TYPES = ("registration_hero", "social_ad", "email_header", "slide_title", "slide_content", "thumbnail")
+
+PROMPTS = {
+    "registration_hero": "Create a professional, eye-catching hero banner image for a webinar landing page about: {concept}. Modern gradient design, clean and professional, 1920x1080",
+    "social_ad": "Create a bold, attention-grabbing social media ad image for a webinar about: {concept}. Square format, vibrant colors, text-free design, 1080x1080",
+    "email_header": "Create a clean email header banner for a webinar about: {concept}. Professional gradient, minimalist, 1200x400",
+    "slide_title": "Create a presentation title slide background for: {concept}. Professional gradient, corporate style, 1920x1080",
+    "slide_content": "Create a clean content slide background. Subtle pattern, professional, light background, 1920x1080",
+    "thumbnail": "Create a compelling video thumbnail for a webinar about: {concept}. Bold text-free design, eye-catching, 1280x720",
+}
+
+MOCK_IMAGE_URLS = {
+    "registration_hero": "https://picsum.photos/1920/1080?random=1",
+    "social_ad": "https://picsum.photos/1080/1080?random=2",
+    "email_header": "https://picsum.photos/1200/400?random=3",
+    "slide_title": "https://picsum.photos/1920/1080?random=4",
+    "slide_content": "https://picsum.photos/1920/1080?random=5",
+    "thumbnail": "https://picsum.photos/1280/720?random=6",
+}
+
+DEFAULT_CONCEPT_TEXT = "professional business webinar"
+
+
+class ImageGenerationService:
+    def __init__(self) -> None:
+        self.concurrency = max(1, settings.IMAGE_BATCH_CONCURRENCY)
+        self._client = None
+
+        # Counters
+        self.generated = 0
+        self.mocked = 0
+        self.failed = 0
+
+    @property
+    def client(self):
+        if self._client is None:
+            from openai import AsyncOpenAI
+
+            # 429 retries are paced for every caller by openai_limiter
+            self._client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY, max_retries=0)
+        return self._client
+
+    @staticmethod
+    def mock_mode() -> bool:
+        return settings.MOCK_IMAGE_MODE or not settings.OPENAI_API_KEY
+
+    @staticmethod
+    def build_prompt(media_type: str, concept_text: str) -> str:
+        return PROMPTS.get(media_type, PROMPTS["registration_hero"]).format(concept=concept_text)
+
+    @staticmethod
+    def concept_text_for(asset: Any, fallback: Optional[str] = None) -> str:
+        """"<big idea>. <hook>" of the selected concept, else the fallback text."""
+        concept_text = fallback or DEFAULT_CONCEPT_TEXT
+        concept_obj = getattr(asset, "selected_concept", None) if asset else None
+        if concept_obj:
+            if isinstance(concept_obj, dict):
+                big_idea = concept_obj.get("big_idea", "")
+                hook = concept_obj.get("hook", "")
+            else:
+                big_idea = getattr(concept_obj, "big_idea", "")
+                hook = getattr(concept_obj, "hook", "")
+            if big_idea or hook:
+                concept_text = f"{big_idea}. {hook}".strip(". ")
+        return concept_text
+
+    def _mock_result(self, media_type: str, prompt: str, reason: Optional[str] = None) -> Dict[str, Any]:
+        self.mocked += 1
+        result = {
+            "status": "success",
+            "image_url": MOCK_IMAGE_URLS.get(media_type, MOCK_IMAGE_URLS["registration_hero"]),
+            "media_type": media_type,
+            "prompt_used": f"[MOCK - OpenAI Credits Exhausted] {prompt}" if reason else f"[MOCK MODE] {prompt}",
+            "mock": True,
+        }
+        if reason:
+            result["fallback_reason"] = reason
+        return result
+
+    async def generate(self, media_type: str, concept_text: str, fast_mode: bool = True) -> Dict[str, Any]:
+        """One image. Falls back to a placeholder in mock mode or on OpenAI errors."""
+        prompt = self.build_prompt(media_type, concept_text)
+        if self.mock_mode():
+            print("Using MOCK MODE for image generation (OpenAI disabled)")
+            return self._mock_result(media_type, prompt)
+
+        import openai
+
+        from api.services.openai_limiter import openai_limiter
+
+        # SPEED OPTIMIZATION: DALL-E 2 (~2-5s) is significantly faster than DALL-E 3 (~15-20s)
+        model = "dall-e-2" if fast_mode else "dall-e-3"
+        size = "512x512" if fast_mode else "1024x1024"
+        print(f"[ImageGeneration] Generating image ({model}, {size}) for {media_type} via OpenAI...")
+        try:
+            response = await openai_limiter.run(
+                "images",
+                lambda: self.client.images.generate(
+                    model=model,
+                    prompt=prompt,
+                    size=size,
+                    quality="standard",
+                    n=1,
+                ),
+            )
+        except openai.OpenAIError as oe:
+            print(f"[ImageGeneration] OpenAI API error for {media_type}, falling back to MOCK MODE: {oe}")
+            return self._mock_result(media_type, prompt, reason=str(oe))
+
+        self.generated += 1
+        return {
+            "status": "success",
+            "image_url": response.data[0].url,
+            "media_type": media_type,
+            "prompt_used": prompt,
+            "created_at": datetime.utcnow().isoformat(),
+        }
+
+    async def generate_batch(self, media_types: List[str], concept_text: str, fast_mode: bool = True) -> List[Dict[str, Any]]:
+        """All media types concurrently (IMAGE_BATCH_CONCURRENCY), results in request order."""
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def _one(media_type: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.generate(media_type, concept_text, fast_mode)
+
+        outcomes = await asyncio.gather(*[_one(m) for m in media_types], return_exceptions=True)
+        results: List[Dict[str, Any]] = []
+        for media_type, outcome in zip(media_types, outcomes):
+            if isinstance(outcome, Exception):
+                self.failed += 1
+                print(f"[ImageGeneration] {media_type} failed: {outcome}")
+                results.append({"status": "failed", "media_type": media_type, "error": str(outcome)})
+            else:
+                results.append(outcome)
+        return results
+
+    async def save(self, asset_id: Any, results: List[Dict[str, Any]]) -> None:
+        """
+        Replace the promotional_images entries of these media types with the successful
+        results, in one atomic update (pipeline: filter out old entries + append new ones).
+        """
+        from beanie import PydanticObjectId
+
+        from api.models import WebinarAsset
+
+        now = datetime.utcnow()
+        entries = []
+        for result in results:
+            if result.get("status") != "success":
+                continue
+            entry = {
+                "media_type": result["media_type"],
+                "image_url": result["image_url"],
+                "status": "generated",
+                "created_at": now,
+            }
+            if result.get("mock"):
+                entry["mock"] = True
+            entries.append(entry)
+        if not entries:
+            return
+
+        media_types = [e["media_type"] for e in entries]
+        await WebinarAsset.get_motor_collection().update_one(
+            {"_id": PydanticObjectId(str(asset_id))},
+            [{
+                "$set": {
+                    "promotional_images": {
+                        "$concatArrays": [
+                            {
+                                "$filter": {
+                                    "input": {"$ifNull": ["$promotional_images", []]},
+                                    "cond": {"$not": [{"$in": ["$$this.media_type", media_types]}]},
+                                }
+                            },
+                            {"$literal": entries},
+                        ]
+                    },
+                    "updated_at": now,
+                }
+            }],
+        )
+
+        # Provider URLs expire: copy real images to S3 in the background
+        from api.services.image_mirror import image_mirror
+
+        image_mirror.schedule(asset_id, [(e["media_type"], e["image_url"]) for e in entries if not e.get("mock")])
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "generated": self.generated,
+            "mocked": self.mocked,
+            "failed": self.failed,
+        }
+
+
+# Singleton instance
+image_generation_service = ImageGenerationService()
@@ -0,0 +1,231 @@
+"""
+Image Mirror
+
+Copies generated promotional images to S3 in the background.
+
+DALL-E returns temporary provider URLs (they expire after about an hour), and
+those URLs were all that `WebinarAsset.promotional_images` kept, so an expired
+link meant generating the image again. After images are saved, each new entry
+is downloaded through the shared media client and stored in S3 under a key
+derived from its content hash (bytes already mirrored for any asset are not
+uploaded again). Resized WebP + JPEG variants (IMAGE_VARIANTS: hero, social,
+thumbnail) are rendered in a process pool (Pillow is CPU-bound) and uploaded
+with it. The entry then gets:
+
+    s3_url     - the original image in S3
+    variants   - {"hero": {"webp": url, "jpeg": url, "width": w, "height": h}, ...}
+    mirrored_at
+
+The entry is matched on media_type + image_url, so an image regenerated in the
+meantime is never overwritten with the previous one. Without Pillow only the
+original is mirrored.
+"""
+
+import asyncio
+import hashlib
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from core.http_client import media_http_client
+from core.s3 import s3_service
+from core.settings import settings
+
+# name: longest side in pixels (images are only ever scaled down)
+IMAGE_VARIANTS: Dict[str, int] = {
+    "hero": 1600,
+    "social": 1080,
+    "thumbnail": 480,
+}
+
+CHUNK_SIZE = 256 * 1024
+
+_CONTENT_TYPES = {"png": "image/png", "jpeg": "image/jpeg", "webp": "image/webp"}
+
+
+# --- Worker-process function (module level so it can be pickled) ---
+
+def _render_variants(data: bytes, variants: Dict[str, int], quality: int) -> List[Tuple[str, str, bytes, int, int]]:
+    """(variant, format, bytes, width, height) for every variant as WebP and JPEG."""
+    from PIL import Image
+
+    with Image.open(io.BytesIO(data)) as source:
+        source.load()
+        image = source.convert("RGB")
+
+    rendered = []
+    for name, longest_side in variants.items():
+        resized = image.copy()
+        resized.thumbnail((longest_side, longest_side), Image.LANCZOS)
+        for fmt in ("webp", "jpeg"):
+            buffer = io.BytesIO()
+            if fmt == "webp":
+                resized.save(buffer, "WEBP", quality=quality, method=4)
+            else:
+                resized.save(buffer, "JPEG", quality=quality, optimize=True, progressive=True)
+            rendered.append((name, fmt, buffer.getvalue(), resized.width, resized.height))
+    return rendered
+
+
+class ImageMirror:
+    def __init__(self) -> None:
+        self.enabled = settings.IMAGE_MIRROR_ENABLED
+        self.workers = settings.IMAGE_MIRROR_WORKERS or os.cpu_count() or 1
+        self.concurrency = max(1, settings.IMAGE_MIRROR_CONCURRENCY)
+        self.max_bytes = settings.IMAGE_MIRROR_MAX_BYTES
+        self.quality = settings.IMAGE_VARIANT_QUALITY
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+        # Counters
+        self.mirrored = 0
+        self.deduplicated = 0  # content already in S3
+        self.failed = 0
+        self.variants_skipped = 0  # Pillow missing or the image could not be decoded
+
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self._pool
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def schedule(self, asset_id: Any, images: List[Tuple[str, str]]) -> None:
+        """Mirror (media_type, image_url) pairs of an asset in the background."""
+        if not self.enabled or not images or not settings.AWS_S3_BUCKET_NAME:
+            return
+        task = asyncio.create_task(self.mirror(asset_id, images))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def mirror(self, asset_id: Any, images: List[Tuple[str, str]]) -> None:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def _one(media_type: str, image_url: str) -> None:
+            async with self._semaphore:
+                try:
+                    await self.mirror_image(asset_id, media_type, image_url)
+                except Exception as e:
+                    self.failed += 1
+                    print(f"[ImageMirror] WARNING: could not mirror {media_type} of asset {asset_id}: {e}")
+
+        await asyncio.gather(*(_one(media_type, url) for media_type, url in images))
+
+    async def mirror_image(self, asset_id: Any, media_type: str, image_url: str) -> Optional[str]:
+        """Copy one image (plus variants) to S3 and record the URLs on its entry. Returns the S3 URL."""
+        from beanie import PydanticObjectId
+
+        from api.models import WebinarAsset
+
+        data = await self._download(image_url)
+        content_hash = await asyncio.to_thread(lambda: hashlib.sha256(data).hexdigest())
+        prefix = f"promotional-images/{content_hash[:32]}"
+        original_ext = self._sniff_format(data)
+        original_name = f"{prefix}/original.{original_ext}"
+
+        s3_url = s3_service.public_url(original_name)
+        variants = await self._known_variants(s3_url)
+        if variants is not None:
+            # Same bytes mirrored before (content-addressed): reuse the stored objects
+            self.deduplicated += 1
+        else:
+            variants = {}
+            uploads = [(data, original_name, _CONTENT_TYPES.get(original_ext, "application/octet-stream"))]
+            rendered = await self._render(data)
+            for name, fmt, body, width, height in rendered:
+                uploads.append((body, f"{prefix}/{name}.{fmt}", _CONTENT_TYPES[fmt]))
+            urls = await s3_service.upload_many(uploads)
+            s3_url = urls[0]
+            for (name, fmt, _, width, height), url in zip(rendered, urls[1:]):
+                variant = variants.setdefault(name, {"width": width, "height": height})
+                variant[fmt] = url
+
+        await WebinarAsset.get_motor_collection().update_one(
+            {
+                "_id": PydanticObjectId(str(asset_id)),
+                "promotional_images": {"$elemMatch": {"media_type": media_type, "image_url": image_url}},
+            },
+            {"$set": {
+                "promotional_images.$.s3_url": s3_url,
+                "promotional_images.$.variants": variants,
+                "promotional_images.$.mirrored_at": datetime.utcnow(),
+            }},
+        )
+        self.mirrored += 1
+        print(f"[ImageMirror] {media_type} of asset {asset_id} -> {s3_url} ({len(variants)} variants)")
+        return s3_url
+
+    async def _download(self, image_url: str) -> bytes:
+        buffer = bytearray()
+        async with media_http_client.stream("GET", image_url, follow_redirects=True) as response:
+            response.raise_for_status()
+            async for chunk in response.aiter_bytes(CHUNK_SIZE):
+                buffer.extend(chunk)
+                if len(buffer) > self.max_bytes:
+                    raise ValueError(f"Image larger than IMAGE_MIRROR_MAX_BYTES ({self.max_bytes})")
+        return bytes(buffer)
+
+    async def _render(self, data: bytes) -> List[Tuple[str, str, bytes, int, int]]:
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self.pool, _render_variants, data, IMAGE_VARIANTS, self.quality)
+        except BrokenProcessPool:
+            # A worker died: shut the pool down and rebuild it next time, mirror the original only
+            self.shutdown()
+            print("[ImageMirror] Process pool broken, skipping variants")
+        except ImportError:
+            print("[ImageMirror] Pillow not installed, skipping variants")
+        except Exception as e:
+            print(f"[ImageMirror] Could not render variants: {e}")
+        self.variants_skipped += 1
+        return []
+
+    @staticmethod
+    async def _known_variants(s3_url: str) -> Optional[Dict[str, Dict[str, Any]]]:
+        """
+        Variants recorded for an already mirrored copy of the same content, or None.
+        A copy mirrored without variants (Pillow missing, render failed) doesn't count,
+        so rendering is tried again.
+        """
+        from api.models import WebinarAsset
+
+        doc = await WebinarAsset.get_motor_collection().find_one(
+            {"promotional_images": {"$elemMatch": {"s3_url": s3_url, "variants": {"$nin": [{}, None]}}}},
+            {"promotional_images.$": 1},
+        )
+        if not doc or not doc.get("promotional_images"):
+            return None
+        return doc["promotional_images"][0].get("variants") or None
+
+    @staticmethod
+    def _sniff_format(data: bytes) -> str:
+        if data[:8] == b"\x89PNG\r\n\x1a\n":
+            return "png"
+        if data[:3] == b"\xff\xd8\xff":
+            return "jpeg"
+        if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+            return "webp"
+        return "png"
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "in_flight": len(self._tasks),
+            "mirrored": self.mirrored,
+            "deduplicated": self.deduplicated,
+            "failed": self.failed,
+            "variants_skipped": self.variants_skipped,
+        }
+
+
+# Singleton instance
+image_mirror = ImageMirror()
@@ -0,0 +1,122 @@
+"""
+Job Progress Events (in-process pub/sub)
+
+Progress updates are published here the moment they are written, and the
+`GET /jobs/{job_id}/events` SSE endpoint relays them to the browser instead of
+the frontend polling `/jobs/{job_id}/status`.
+
+Jobs processed by out-of-process workers (worker.py) reach this bus through a
+MongoDB change stream watcher (JOB_EVENTS_CHANGE_STREAM); where change streams
+are unavailable the SSE endpoint falls back to periodic DB reads.
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Set
+
+
+def is_terminal(snapshot: Dict[str, Any]) -> bool:
+    """
+    True once the job will not change again. Queued jobs are retried by
+    JobQueue.fail, so "failed" is final only when no attempts are left
+    (in-process background jobs run with max_attempts=1).
+    """
+    if snapshot["status"] == "completed":
+        return True
+    if snapshot["status"] == "failed":
+        return (snapshot.get("attempts") or 0) >= (snapshot.get("max_attempts") or 0)
+    return False
+
+
+def job_snapshot(job: Any) -> Dict[str, Any]:
+    """Status payload for a WebinarProcessingJob document or raw Mongo dict."""
+    def _get(field: str, raw_field: str = None):
+        if isinstance(job, dict):
+            return job.get(raw_field or field)
+        return getattr(job, field, None)
+
+    created_at = _get("created_at")
+    updated_at = _get("updated_at")
+    return {
+        "job_id": str(_get("id", "_id")),
+        "status": _get("status"),
+        "progress": _get("progress"),
+        "message": _get("message"),
+        "asset_id": _get("result_asset_id"),
+        "error": _get("error"),
+        "attempts": _get("attempts"),
+        "max_attempts": _get("max_attempts"),
+        "created_at": created_at.isoformat() if created_at else None,
+        "updated_at": updated_at.isoformat() if updated_at else None
+    }
+
+
+class JobEventBus:
+    """Fan-out of job snapshots to SSE subscribers, keyed by job id."""
+
+    def __init__(self) -> None:
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self.published = 0
+
+    @asynccontextmanager
+    async def subscribe(self, job_id: str) -> AsyncIterator[asyncio.Queue]:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=100)
+        self._subscribers.setdefault(job_id, set()).add(queue)
+        try:
+            yield queue
+        finally:
+            subscribers = self._subscribers.get(job_id)
+            if subscribers is not None:
+                subscribers.discard(queue)
+                if not subscribers:
+                    self._subscribers.pop(job_id, None)
+
+    def has_subscribers(self, job_id: str) -> bool:
+        return bool(self._subscribers.get(job_id))
+
+    def publish(self, job_id: str, snapshot: Dict[str, Any]) -> None:
+        for queue in list(self._subscribers.get(job_id, ())):
+            if queue.full():
+                # Slow consumer: keep only the latest state
+                try:
+                    queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    pass
+            queue.put_nowait(snapshot)
+        self.published += 1
+
+    def publish_job(self, job: Any) -> None:
+        snapshot = job_snapshot(job)
+        self.publish(snapshot["job_id"], snapshot)
+
+    async def watch_change_stream(self) -> None:
+        """
+        Relay WebinarProcessingJob changes made by other processes (e.g. worker.py).
+        Requires a replica set (Atlas); on a standalone server it logs and returns.
+        """
+        from api.models import WebinarProcessingJob
+
+        pipeline = [{"$match": {"operationType": {"$in": ["insert", "update", "replace"]}}}]
+        try:
+            collection = WebinarProcessingJob.get_motor_collection()
+            async with collection.watch(pipeline, full_document="updateLookup") as stream:
+                print("[JobEvents] Watching webinar_processing_jobs change stream")
+                async for change in stream:
+                    doc = change.get("fullDocument")
+                    if doc and self.has_subscribers(str(doc["_id"])):
+                        self.publish_job(doc)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"[JobEvents] Change stream unavailable, SSE will use DB polling fallback: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "published": self.published,
+            "watched_jobs": len(self._subscribers),
+            "subscribers": sum(len(s) for s in self._subscribers.values()),
+        }
+
+
+# Singleton instance
+job_events = JobEventBus()
@@ -0,0 +1,130 @@
+"""
+Job Progress Writer
+
+Progress ticks on WebinarProcessingJob used to mutate the Beanie document and call
+`job.save()`, rewriting the whole document (including the queue payload) on every
+step. This writer issues a targeted `$set` on just the changed fields and coalesces
+rapid ticks to at most one write per job per JOB_PROGRESS_MIN_INTERVAL_SECONDS:
+
+- Status / error / result changes are always written immediately
+- Plain progress/message ticks inside the interval are merged and written by a
+  trailing flush, so the last state always reaches the DB
+- Every tick is still published to job_events right away (SSE stays real-time)
+- Writes for one job are serialized, so an older $set never lands after a newer one
+- Per-job state is dropped on a terminal status and by close() (JobWorker / JobQueue.fail)
+"""
+
+import asyncio
+import time
+from datetime import datetime
+from typing import Any, Dict
+
+from api.models import WebinarProcessingJob
+from api.services.job_events import job_events
+from core.settings import settings
+
+# Fields whose change must never be delayed
+IMMEDIATE_FIELDS = ("status", "error", "result_asset_id")
+
+
+class JobProgressWriter:
+    def __init__(self, min_interval: float = None) -> None:
+        self.min_interval = settings.JOB_PROGRESS_MIN_INTERVAL_SECONDS if min_interval is None else min_interval
+        self._last_write: Dict[str, float] = {}
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._flush_tasks: Dict[str, asyncio.Task] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+        # Counters
+        self.updates = 0  # update() calls
+        self.writes = 0  # update_one round trips
+        self.coalesced = 0  # updates merged into a later write
+        self.fields_written = 0
+
+    async def update(self, job: WebinarProcessingJob, force: bool = False, **fields: Any) -> None:
+        """Apply fields to the in-memory job, publish it, and persist them with $set."""
+        job_id = str(job.id)
+        fields["updated_at"] = datetime.utcnow()
+        for name, value in fields.items():
+            setattr(job, name, value)
+        self.updates += 1
+        job_events.publish_job(job)
+
+        pending = self._pending.setdefault(job_id, {})
+        pending.update(fields)
+
+        elapsed = time.monotonic() - self._last_write.get(job_id, 0.0)
+        if force or elapsed >= self.min_interval or any(f in fields for f in IMMEDIATE_FIELDS):
+            await self.flush(job)
+            return
+
+        self.coalesced += 1
+        if job_id not in self._flush_tasks:
+            self._flush_tasks[job_id] = asyncio.create_task(
+                self._flush_later(job, self.min_interval - elapsed)
+            )
+
+    async def flush(self, job: WebinarProcessingJob) -> None:
+        """Write any pending fields for this job now."""
+        job_id = str(job.id)
+        # Only a still-sleeping timer is in the dict (it removes itself before writing)
+        task = self._flush_tasks.pop(job_id, None)
+        if task and task is not asyncio.current_task():
+            task.cancel()
+
+        lock = self._locks.setdefault(job_id, asyncio.Lock())
+        async with lock:
+            # Taken under the lock: a write still in flight finishes first, then this one goes out
+            fields = self._pending.pop(job_id, None)
+            if not fields:
+                return
+            self._last_write[job_id] = time.monotonic()
+            await WebinarProcessingJob.get_motor_collection().update_one({"_id": job.id}, {"$set": fields})
+            self.writes += 1
+            self.fields_written += len(fields)
+
+        if fields.get("status") in ("completed", "failed"):
+            self._forget(job_id)
+
+    async def close(self, job: WebinarProcessingJob) -> None:
+        """Write what is pending and drop the job's state (its handler is done, or gave up)."""
+        try:
+            await self.flush(job)
+        finally:
+            self._forget(str(job.id))
+
+    def _forget(self, job_id: str) -> None:
+        task = self._flush_tasks.pop(job_id, None)
+        if task:
+            task.cancel()
+        self._pending.pop(job_id, None)
+        self._last_write.pop(job_id, None)
+        lock = self._locks.get(job_id)
+        if lock is not None and not lock.locked():
+            self._locks.pop(job_id, None)
+
+    async def _flush_later(self, job: WebinarProcessingJob, delay: float) -> None:
+        job_id = str(job.id)
+        try:
+            await asyncio.sleep(max(0.0, delay))
+        except asyncio.CancelledError:
+            return
+        if self._flush_tasks.get(job_id) is asyncio.current_task():
+            self._flush_tasks.pop(job_id, None)
+        try:
+            await self.flush(job)
+        except Exception as e:
+            print(f"[JobProgress] Deferred write failed for job {job.id}: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "updates": self.updates,
+            "writes": self.writes,
+            "coalesced": self.coalesced,
+            "fields_written": self.fields_written,
+            "writes_per_update": round(self.writes / self.updates, 3) if self.updates else None,
+        }
+
+
+# Singleton instance
+job_progress = JobProgressWriter()
@@ -0,0 +1,260 @@
+"""
+Durable Job Queue backed by the WebinarProcessingJob collection
+
+Jobs survive API restarts/deploys because the queue state lives in MongoDB:
+- Atomic claim via find_one_and_update (only one worker gets a job)
+- Lease + heartbeat: a crashed worker's job becomes claimable again once its lease expires
+  (if it has attempts left; otherwise the worker's sweep marks it failed)
+- Retry with exponential backoff (attempts / max_attempts / run_after)
+- Per-job-type concurrency limits inside each worker process
+
+Workers run standalone (`python worker.py`) or embedded in the API process
+(RUN_EMBEDDED_JOB_WORKER) for single-process development.
+"""
+
+import asyncio
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from api.models import WebinarProcessingJob
+from api.services.job_events import job_events
+from api.services.job_progress import job_progress
+from core.settings import settings
+
+JobHandler = Callable[[WebinarProcessingJob], Awaitable[None]]
+
+
+class JobQueue:
+    """Queue operations on WebinarProcessingJob documents."""
+
+    def __init__(self, lease_seconds: int = None, retry_base_seconds: int = None) -> None:
+        self.lease_seconds = lease_seconds or settings.JOB_LEASE_SECONDS
+        self.retry_base_seconds = retry_base_seconds or settings.JOB_RETRY_BASE_SECONDS
+
+    @staticmethod
+    def _collection():
+        return WebinarProcessingJob.get_motor_collection()
+
+    async def enqueue(self, job: WebinarProcessingJob) -> WebinarProcessingJob:
+        """Persist a job in the claimable 'pending' state."""
+        job.status = "pending"
+        job.run_after = None
+        job.locked_by = None
+        job.lease_expires_at = None
+        job.updated_at = datetime.utcnow()
+        await job.save()
+        return job
+
+    async def claim(self, job_types: List[str], worker_id: str) -> Optional[WebinarProcessingJob]:
+        """
+        Atomically claim the oldest runnable job of the given types.
+        Runnable = pending and past its backoff, or processing with an expired lease and
+        attempts left.
+        """
+        now = datetime.utcnow()
+        doc = await self._collection().find_one_and_update(
+            {
+                "job_type": {"$in": job_types},
+                "$or": [
+                    {"status": "pending", "$or": [{"run_after": None}, {"run_after": {"$lte": now}}]},
+                    {
+                        "status": "processing",
+                        "lease_expires_at": {"$lt": now},
+                        "$expr": {"$lt": ["$attempts", "$max_attempts"]},
+                    },
+                ],
+            },
+            {
+                "$set": {
+                    "status": "processing",
+                    "locked_by": worker_id,
+                    "lease_expires_at": now + timedelta(seconds=self.lease_seconds),
+                    "heartbeat_at": now,
+                    "updated_at": now,
+                },
+                "$inc": {"attempts": 1},
+            },
+            sort=[("created_at", 1)],
+        )
+        if not doc:
+            return None
+        return await WebinarProcessingJob.get(doc["_id"])
+
+    async def heartbeat(self, job_id, worker_id: str) -> bool:
+        """Extend the lease. Returns False if this worker no longer owns the job."""
+        now = datetime.utcnow()
+        result = await self._collection().update_one(
+            {"_id": job_id, "locked_by": worker_id, "status": "processing"},
+            {"$set": {"lease_expires_at": now + timedelta(seconds=self.lease_seconds), "heartbeat_at": now}},
+        )
+        return result.modified_count == 1
+
+    async def complete(self, job_id, worker_id: str) -> None:
+        """Release the lease. Handlers set status/progress/message themselves."""
+        await self._collection().update_one(
+            {"_id": job_id, "locked_by": worker_id},
+            {"$set": {"locked_by": None, "lease_expires_at": None, "updated_at": datetime.utcnow()}},
+        )
+
+    async def expire_abandoned(self, job_types: List[str]) -> int:
+        """
+        Mark failed the jobs whose worker died (lease expired) on their last attempt:
+        claim() no longer picks them up, so they would stay "processing" forever.
+        """
+        now = datetime.utcnow()
+        expired = 0
+        cursor = self._collection().find(
+            {
+                "job_type": {"$in": job_types},
+                "status": "processing",
+                "lease_expires_at": {"$lt": now},
+                "$expr": {"$gte": ["$attempts", "$max_attempts"]},
+            },
+            {"_id": 1, "attempts": 1},
+        )
+        async for doc in cursor:
+            update = {
+                "status": "failed",
+                "progress": 100,
+                "message": "Processing failed: the worker stopped responding",
+                "error": f"Worker lease expired on attempt {doc['attempts']}",
+                "locked_by": None,
+                "lease_expires_at": None,
+                "updated_at": now,
+            }
+            # Conditional: skip jobs whose lease was renewed in the meantime
+            result = await self._collection().update_one(
+                {"_id": doc["_id"], "status": "processing", "lease_expires_at": {"$lt": now}},
+                {"$set": update},
+            )
+            if result.modified_count:
+                expired += 1
+                print(f"[JobQueue] Job {doc['_id']} failed permanently: lease expired after {doc['attempts']} attempts")
+                job = await WebinarProcessingJob.get(doc["_id"])
+                if job:
+                    job_events.publish_job(job)
+        return expired
+
+    async def fail(self, job_id, worker_id: str, error: str) -> None:
+        """Schedule a retry with exponential backoff, or mark failed once attempts are exhausted."""
+        job = await WebinarProcessingJob.get(job_id)
+        if not job or job.locked_by != worker_id:
+            return
+        now = datetime.utcnow()
+        if job.attempts < job.max_attempts:
+            delay = self.retry_base_seconds * (2 ** max(0, job.attempts - 1))
+            update = {
+                "status": "pending",
+                "run_after": now + timedelta(seconds=delay),
+                "message": f"Temporary error, retrying in {delay}s (attempt {job.attempts}/{job.max_attempts})...",
+            }
+            print(f"[JobQueue] Job {job_id} failed (attempt {job.attempts}/{job.max_attempts}), retry in {delay}s: {error[:200]}")
+        else:
+            update = {
+                "status": "failed",
+                "progress": 100,
+                "message": f"Processing failed: {error[:100]}",
+            }
+            print(f"[JobQueue] Job {job_id} failed permanently after {job.attempts} attempts: {error[:200]}")
+        update.update({"error": error[:500], "locked_by": None, "lease_expires_at": None, "updated_at": now})
+        await self._collection().update_one({"_id": job_id}, {"$set": update})
+        job_events.publish_job(job.copy(update=update))
+
+
+class JobWorker:
+    """Polls the queue and runs handlers with per-job-type concurrency limits."""
+
+    def __init__(
+        self,
+        handlers: Dict[str, JobHandler],
+        concurrency: Optional[Dict[str, int]] = None,
+        queue: Optional[JobQueue] = None,
+        worker_id: Optional[str] = None,
+        poll_interval: Optional[float] = None,
+    ) -> None:
+        self.handlers = handlers
+        self.queue = queue or job_queue
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.poll_interval = poll_interval or settings.JOB_POLL_INTERVAL_SECONDS
+        concurrency = concurrency or settings.JOB_CONCURRENCY
+        self._semaphores = {jt: asyncio.Semaphore(max(1, concurrency.get(jt, 1))) for jt in handlers}
+        self._stopping = asyncio.Event()
+        self._running: set = set()
+
+    async def run(self) -> None:
+        print(f"[JobWorker] {self.worker_id} started for job types: {list(self.handlers)}")
+        loops = [asyncio.create_task(self._poll_loop(jt)) for jt in self.handlers]
+        loops.append(asyncio.create_task(self._sweep_loop()))
+        await self._stopping.wait()
+        for task in loops:
+            task.cancel()
+        # Let in-flight jobs finish; unfinished ones are reclaimed after their lease expires
+        if self._running:
+            await asyncio.gather(*self._running, return_exceptions=True)
+        print(f"[JobWorker] {self.worker_id} stopped")
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    async def _poll_loop(self, job_type: str) -> None:
+        semaphore = self._semaphores[job_type]
+        while not self._stopping.is_set():
+            await semaphore.acquire()
+            try:
+                job = await self.queue.claim([job_type], self.worker_id)
+            except Exception as e:
+                print(f"[JobWorker] Claim failed for {job_type}: {e}")
+                job = None
+            if job is None:
+                semaphore.release()
+                await asyncio.sleep(self.poll_interval)
+                continue
+            task = asyncio.create_task(self._execute(job, semaphore))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _sweep_loop(self) -> None:
+        """Fail abandoned jobs with no attempts left, once per lease period."""
+        while not self._stopping.is_set():
+            try:
+                await self.queue.expire_abandoned(list(self.handlers))
+            except Exception as e:
+                print(f"[JobWorker] Sweep failed: {e}")
+            await asyncio.sleep(self.queue.lease_seconds)
+
+    async def _execute(self, job: WebinarProcessingJob, semaphore: asyncio.Semaphore) -> None:
+        heartbeat = asyncio.create_task(self._heartbeat_loop(job.id))
+        try:
+            print(f"[JobWorker] Running {job.job_type} job {job.id} (attempt {job.attempts}/{job.max_attempts})")
+            try:
+                await self.handlers[job.job_type](job)
+            finally:
+                # Pending progress is written (and the writer's state dropped) before the queue
+                # records the outcome, so a trailing flush can't overwrite it
+                await job_progress.close(job)
+            await self.queue.complete(job.id, self.worker_id)
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            await self.queue.fail(job.id, self.worker_id, str(e))
+        finally:
+            heartbeat.cancel()
+            semaphore.release()
+
+    async def _heartbeat_loop(self, job_id) -> None:
+        interval = max(1.0, self.queue.lease_seconds / 3)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                if not await self.queue.heartbeat(job_id, self.worker_id):
+                    print(f"[JobWorker] Lost lease on job {job_id}")
+                    return
+            except Exception as e:
+                print(f"[JobWorker] Heartbeat failed for job {job_id}: {e}")
+
+
+# Singleton instance
+job_queue = JobQueue()
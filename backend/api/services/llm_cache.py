@@ -0,0 +1,201 @@
+"""
+Content-addressed LLM response cache.
+
+Sits in front of WebinarAIService.generate_content and AIService._call_llm so
+identical prompts (UI retries of the same request) are served without another
+OpenAI round trip. The chains sample at temperature 0.7, so a Regenerate action
+must not get the previous draft back: inside `fresh_results()` lookups miss, and
+the new answer replaces the cached one.
+
+Two tiers:
+- In-process hot tier (LRU, bounded by LLM_CACHE_HOT_ENTRIES)
+- Mongo collection `webinar_llm_cache` (TTL + LRU eviction by last access)
+
+Cache failures never break generation: every DB error is logged and treated as a miss.
+"""
+
+import contextvars
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Tuple
+
+from core.settings import settings
+
+_fresh: contextvars.ContextVar = contextvars.ContextVar("llm_cache_fresh", default=False)
+
+
+@contextmanager
+def fresh_results(enabled: bool = True):
+    """LLM calls made inside the block (and tasks it spawns) skip cache lookups; results are still stored."""
+    token = _fresh.set(enabled)
+    try:
+        yield
+    finally:
+        _fresh.reset(token)
+
+
+class LLMCache:
+    # Check the Mongo tier size every N writes instead of on every insert
+    EVICTION_CHECK_INTERVAL = 50
+
+    def __init__(self) -> None:
+        self.enabled = settings.LLM_CACHE_ENABLED
+        self.ttl_seconds = settings.LLM_CACHE_TTL_SECONDS
+        self.hot_max_entries = settings.LLM_CACHE_HOT_ENTRIES
+        self.max_entries = settings.LLM_CACHE_MAX_ENTRIES
+        self._hot: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._writes_since_eviction = 0
+
+        # Counters
+        self.hot_hits = 0
+        self.db_hits = 0
+        self.misses = 0
+        self.bypassed = 0  # lookups skipped by fresh_results()
+        self.writes = 0
+        self.errors = 0
+
+    @staticmethod
+    def make_key(
+        model: str,
+        system_prompt: str,
+        user_prompt: str,
+        temperature: float,
+        max_tokens: Optional[int],
+        **extra: Any,
+    ) -> str:
+        """sha256 over everything that affects the completion."""
+        material = json.dumps(
+            [model, system_prompt, user_prompt, temperature, max_tokens, sorted(extra.items())],
+            ensure_ascii=False,
+            default=str,
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    # --- Hot tier ---
+
+    def _hot_get(self, key: str) -> Optional[str]:
+        item = self._hot.get(key)
+        if item is None:
+            return None
+        value, expires = item
+        if expires < time.time():
+            self._hot.pop(key, None)
+            return None
+        self._hot.move_to_end(key)
+        return value
+
+    def _hot_set(self, key: str, value: str, expires: float) -> None:
+        self._hot[key] = (value, expires)
+        self._hot.move_to_end(key)
+        while len(self._hot) > self.hot_max_entries:
+            self._hot.popitem(last=False)
+
+    # --- Public API ---
+
+    async def get(self, key: str) -> Optional[str]:
+        if not self.enabled:
+            return None
+        if _fresh.get():
+            self.bypassed += 1
+            return None
+
+        value = self._hot_get(key)
+        if value is not None:
+            self.hot_hits += 1
+            return value
+
+        try:
+            from api.models import LLMCacheEntry
+
+            entry = await LLMCacheEntry.find_one(LLMCacheEntry.key == key)
+            now = datetime.utcnow()
+            if entry and (entry.expires_at is None or entry.expires_at > now):
+                await entry.set({
+                    LLMCacheEntry.hits: entry.hits + 1,
+                    LLMCacheEntry.last_accessed_at: now,
+                })
+                expires = entry.expires_at or (now + timedelta(seconds=self.ttl_seconds))
+                self._hot_set(key, entry.response, time.time() + (expires - now).total_seconds())
+                self.db_hits += 1
+                return entry.response
+            if entry:
+                await entry.delete()
+        except Exception as e:
+            self.errors += 1
+            print(f"[LLMCache] WARNING: lookup failed, treating as miss: {e}")
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, value: str, model: str = "") -> None:
+        if not self.enabled or not value:
+            return
+
+        self._hot_set(key, value, time.time() + self.ttl_seconds)
+        self.writes += 1
+
+        try:
+            from api.models import LLMCacheEntry
+
+            now = datetime.utcnow()
+            expires_at = now + timedelta(seconds=self.ttl_seconds)
+            existing = await LLMCacheEntry.find_one(LLMCacheEntry.key == key)
+            if existing:
+                await existing.set({
+                    LLMCacheEntry.response: value,
+                    LLMCacheEntry.last_accessed_at: now,
+                    LLMCacheEntry.expires_at: expires_at,
+                })
+            else:
+                await LLMCacheEntry(
+                    key=key,
+                    model=model,
+                    response=value,
+                    created_at=now,
+                    last_accessed_at=now,
+                    expires_at=expires_at,
+                ).insert()
+
+            self._writes_since_eviction += 1
+            if self._writes_since_eviction >= self.EVICTION_CHECK_INTERVAL:
+                self._writes_since_eviction = 0
+                await self._evict()
+        except Exception as e:
+            self.errors += 1
+            print(f"[LLMCache] WARNING: write failed (hot tier still updated): {e}")
+
+    async def _evict(self) -> None:
+        """Drop expired entries, then least-recently-used ones above LLM_CACHE_MAX_ENTRIES."""
+        from beanie.operators import In, LT
+        from api.models import LLMCacheEntry
+
+        await LLMCacheEntry.find(LT(LLMCacheEntry.expires_at, datetime.utcnow())).delete()
+
+        total = await LLMCacheEntry.count()
+        overflow = total - self.max_entries
+        if overflow <= 0:
+            return
+        stale = await LLMCacheEntry.find_all().sort(+LLMCacheEntry.last_accessed_at).limit(overflow).to_list()
+        await LLMCacheEntry.find(In(LLMCacheEntry.id, [e.id for e in stale])).delete()
+        print(f"[LLMCache] Evicted {len(stale)} least-recently-used entries")
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hot_hits + self.db_hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "hot_entries": len(self._hot),
+            "hot_hits": self.hot_hits,
+            "db_hits": self.db_hits,
+            "misses": self.misses,
+            "bypassed": self.bypassed,
+            "writes": self.writes,
+            "errors": self.errors,
+            "hit_rate": round((self.hot_hits + self.db_hits) / lookups, 3) if lookups else None,
+        }
+
+
+llm_cache = LLMCache()
@@ -0,0 +1,90 @@
+"""
+Per-process cache of the mentor profile fields used in prompts.
+
+Every chain step and refine call looked the mentor up again
+(`Mentor.find_one(Mentor.user_id == ...)`) just to read language_tone. The
+prompt-relevant fields (PROFILE_FIELDS) are kept here in a small LRU with a TTL
+(MENTOR_CACHE_TTL_SECONDS, MENTOR_CACHE_MAX_ENTRIES) and fetched with a Mongo
+projection on a miss. Mentors without a profile are cached too, so the default
+language doesn't cost a query either.
+
+The mentor routes call invalidate() when a profile changes. Other processes
+(e.g. `python worker.py`) see the change once their entry expires.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from core.settings import settings
+
+PROFILE_FIELDS = ("language_tone", "niche", "industry", "target_audience")
+
+
+class MentorProfileCache:
+    def __init__(self) -> None:
+        self.enabled = settings.MENTOR_CACHE_ENABLED
+        self.ttl_seconds = settings.MENTOR_CACHE_TTL_SECONDS
+        self.max_entries = settings.MENTOR_CACHE_MAX_ENTRIES
+        # user_id -> (profile or None, expires at)
+        self._entries: "OrderedDict[str, Tuple[Optional[Dict[str, Any]], float]]" = OrderedDict()
+        # Bumped by invalidate(), so a lookup that raced an update doesn't store the old profile
+        self._versions: Dict[str, int] = {}
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    async def get(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """Prompt fields of the mentor with this user_id, or None if there is no profile."""
+        if not user_id:
+            return None
+        if self.enabled:
+            item = self._entries.get(user_id)
+            if item is not None and item[1] >= time.time():
+                self._entries.move_to_end(user_id)
+                self.hits += 1
+                return item[0]
+        self.misses += 1
+
+        from api.models import Mentor
+
+        version = self._versions.get(user_id, 0)
+        doc = await Mentor.get_motor_collection().find_one(
+            {"user_id": user_id}, {field: 1 for field in PROFILE_FIELDS}
+        )
+        profile = {field: doc.get(field) for field in PROFILE_FIELDS} if doc else None
+
+        if self.enabled and self._versions.get(user_id, 0) == version:
+            self._entries[user_id] = (profile, time.time() + self.ttl_seconds)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return profile
+
+    async def language_tone(self, user_id: str, default: str = "Norwegian") -> str:
+        profile = await self.get(user_id)
+        return (profile or {}).get("language_tone") or default
+
+    def invalidate(self, user_id: Optional[str]) -> None:
+        if not user_id:
+            return
+        self._entries.pop(user_id, None)
+        self._versions[user_id] = self._versions.get(user_id, 0) + 1
+        self.invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+        }
+
+
+# Singleton instance
+mentor_profile_cache = MentorProfileCache()
@@ -0,0 +1,359 @@
+"""
+Process-wide OpenAI rate limiter (token buckets + priority queue).
+
+Concept/structure/email chains, AIService, TTS and image generation all hit the
+same OpenAI organisation limits, but each used to fire independently; a few
+mentors generating at once produced 429s, which the chains turned into mock
+concepts. Every OpenAI call now goes through `openai_limiter`:
+
+- Per-pool token buckets for requests/min and tokens/min (pools: chat, images, audio)
+- Waiters are served by priority class, then arrival: interactive calls (refine,
+  transcript updates, previews) overtake batch generation (chains marked with_priority(Priority.BATCH))
+- A 429 pauses the whole pool for the Retry-After / backoff delay and the call is
+  retried with jitter (OPENAI_MAX_RETRIES); `insufficient_quota` is not retried
+- Reserved tokens are settled against the actual usage once a reply arrives; a 429
+  refunds them, any other failure keeps them (the request may have been processed)
+- OPENAI_RATE_LIMIT_SHARED: additionally count requests/tokens per minute in Mongo
+  so several API/worker processes share one budget
+"""
+
+import asyncio
+import contextvars
+import functools
+import heapq
+import itertools
+import random
+from datetime import datetime, timedelta
+from enum import IntEnum
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar
+
+from core.settings import settings
+
+T = TypeVar("T")
+
+
+class Priority(IntEnum):
+    INTERACTIVE = 0  # A user is waiting on this one call
+    BATCH = 1  # Multi-step generation chains and background jobs
+
+
+_priority: contextvars.ContextVar = contextvars.ContextVar("openai_priority", default=Priority.INTERACTIVE)
+
+
+def with_priority(priority: Priority):
+    """Decorator: OpenAI calls made inside the coroutine (and tasks it spawns) queue with `priority`."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            token = _priority.set(priority)
+            try:
+                return await fn(*args, **kwargs)
+            finally:
+                _priority.reset(token)
+        return wrapper
+    return decorator
+
+
+class TokenBucket:
+    """Refills continuously up to `per_minute`."""
+
+    def __init__(self, per_minute: int, now: float) -> None:
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self.updated = now
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        self._refill(now)
+        # A single request bigger than the bucket goes through once the bucket is full
+        amount = min(amount, self.capacity)
+        return 0.0 if self.level >= amount else (amount - self.level) / self.rate
+
+    def take(self, amount: float) -> None:
+        self.level -= min(amount, self.capacity)
+
+    def give_back(self, amount: float) -> None:
+        self.level = min(self.capacity, self.level + amount)
+
+
+class _Pool:
+    def __init__(self, name: str, rpm: int, tpm: int, now: float) -> None:
+        self.name = name
+        self.rpm = rpm
+        self.tpm = tpm
+        self.requests = TokenBucket(rpm, now) if rpm > 0 else None
+        self.tokens = TokenBucket(tpm, now) if tpm > 0 else None
+        self.paused_until = 0.0
+        self.waiters: List[Tuple[int, int, int, asyncio.Future]] = []
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+        # Counters
+        self.granted = 0
+        self.waited = 0  # grants that had to queue
+        self.wait_seconds = 0.0
+        self.rate_limited = 0  # 429 responses
+        self.tokens_reserved = 0
+        self.tokens_used = 0
+
+
+class Reservation:
+    """Capacity taken for one call; settle() returns unused reserved tokens, release() everything."""
+
+    def __init__(self, limiter: "OpenAIRateLimiter", pool: Optional[_Pool], tokens: int) -> None:
+        self._limiter = limiter
+        self._pool = pool
+        self.tokens = tokens
+
+    def settle(self, used_tokens: Optional[int]) -> None:
+        if self._pool is None or used_tokens is None:
+            return
+        self._pool.tokens_used += used_tokens
+        unused = self.tokens - used_tokens
+        if unused > 0 and self._pool.tokens is not None:
+            self._pool.tokens.give_back(unused)
+            self._limiter._pump(self._pool)
+        self._pool = None
+
+    def release(self) -> None:
+        """Return the request slot and all tokens (the call was never sent)."""
+        if self._pool is None:
+            return
+        if self._pool.requests is not None:
+            self._pool.requests.give_back(1)
+        if self._pool.tokens is not None:
+            self._pool.tokens.give_back(self.tokens)
+        self._limiter._pump(self._pool)
+        self._pool = None
+
+
+class OpenAIRateLimiter:
+    def __init__(self) -> None:
+        self.enabled = settings.OPENAI_RATE_LIMIT_ENABLED
+        self.shared = settings.OPENAI_RATE_LIMIT_SHARED
+        self.max_retries = settings.OPENAI_MAX_RETRIES
+        self.retry_base = settings.OPENAI_RETRY_BASE_SECONDS
+        self._limits = {
+            "chat": (settings.OPENAI_RPM, settings.OPENAI_TPM),
+            "images": (settings.OPENAI_IMAGES_PER_MINUTE, 0),
+            "audio": (settings.OPENAI_TTS_RPM, 0),
+        }
+        self._pools: Dict[str, _Pool] = {}
+        self._seq = itertools.count()
+        self.retries = 0
+        self.shared_waits = 0
+
+    def _pool(self, name: str) -> _Pool:
+        pool = self._pools.get(name)
+        if pool is None:
+            rpm, tpm = self._limits.get(name, (settings.OPENAI_RPM, 0))
+            pool = self._pools[name] = _Pool(name, rpm, tpm, asyncio.get_running_loop().time())
+        return pool
+
+    async def acquire(self, pool_name: str, tokens: int = 0, priority: Optional[Priority] = None) -> Reservation:
+        """Wait for request (and token) capacity in the pool, in priority order."""
+        if not self.enabled:
+            return Reservation(self, None, tokens)
+        pool = self._pool(pool_name)
+        priority = _priority.get() if priority is None else priority
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        heapq.heappush(pool.waiters, (int(priority), next(self._seq), tokens, future))
+        started = loop.time()
+        self._pump(pool)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted just before the cancel: hand the capacity back
+                Reservation(self, pool, tokens).release()
+            raise
+
+        waited = loop.time() - started
+        if waited > 0.05:
+            pool.waited += 1
+            pool.wait_seconds += waited
+        if self.shared:
+            await self._acquire_shared(pool, tokens)
+        return Reservation(self, pool, tokens)
+
+    def _pump(self, pool: _Pool) -> None:
+        """Grant queued waiters while capacity lasts; otherwise wake up when it will be there."""
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        while pool.waiters:
+            _, _, tokens, future = pool.waiters[0]
+            if future.done():
+                heapq.heappop(pool.waiters)  # Cancelled while queued
+                continue
+            wait = max(
+                pool.paused_until - now,
+                pool.requests.wait_time(1, now) if pool.requests else 0.0,
+                pool.tokens.wait_time(tokens, now) if pool.tokens else 0.0,
+            )
+            if wait > 0:
+                if pool.timer is None or pool.timer.when() > now + wait:
+                    if pool.timer is not None:
+                        pool.timer.cancel()
+                    pool.timer = loop.call_later(wait, self._wake, pool)
+                return
+            heapq.heappop(pool.waiters)
+            if pool.requests:
+                pool.requests.take(1)
+            if pool.tokens:
+                pool.tokens.take(tokens)
+            pool.granted += 1
+            pool.tokens_reserved += tokens
+            future.set_result(None)
+
+    def _wake(self, pool: _Pool) -> None:
+        pool.timer = None
+        self._pump(pool)
+
+    def backoff(self, pool_name: str, delay: float) -> None:
+        """Pause the pool for everyone (after a 429)."""
+        pool = self._pool(pool_name)
+        pool.rate_limited += 1
+        pool.paused_until = max(pool.paused_until, asyncio.get_running_loop().time() + delay)
+
+    def retry_delay(self, status_code: Optional[int], headers: Any, body: str, attempt: int) -> Optional[float]:
+        """Seconds to wait before retrying a 429, or None when the call should not be retried."""
+        if status_code != 429 or attempt >= self.max_retries:
+            return None
+        if "insufficient_quota" in (body or ""):
+            # Out of credit: waiting won't help
+            return None
+        delay = self.retry_base * (2 ** attempt)
+        if headers is not None:
+            retry_after_ms = headers.get("retry-after-ms")
+            retry_after = headers.get("retry-after")
+            try:
+                if retry_after_ms:
+                    delay = max(delay, float(retry_after_ms) / 1000)
+                elif retry_after:
+                    delay = max(delay, float(retry_after))
+            except ValueError:
+                pass
+        return delay + random.uniform(0, self.retry_base)
+
+    async def run(
+        self,
+        pool_name: str,
+        send: Callable[[], Awaitable[T]],
+        tokens: int = 0,
+        usage: Optional[Callable[[T], Optional[int]]] = None,
+    ) -> T:
+        """
+        acquire() + send(), retrying 429s. Works with httpx responses (status_code on the
+        result) and openai SDK calls (RateLimitError raised). Non-429 results are returned as-is.
+        """
+        result, reservation = await self.run_reserved(pool_name, send, tokens)
+        used = None
+        if usage is not None:
+            try:
+                used = usage(result)
+            except Exception:
+                pass
+        reservation.settle(used)
+        return result
+
+    async def run_reserved(
+        self,
+        pool_name: str,
+        send: Callable[[], Awaitable[T]],
+        tokens: int = 0,
+    ) -> Tuple[T, Reservation]:
+        """
+        run() for streamed replies: the reservation is returned unsettled, for the caller to
+        settle once the usage is known. A 429 result still comes back settled.
+        """
+        attempt = 0
+        while True:
+            reservation = await self.acquire(pool_name, tokens)
+            try:
+                result = await send()
+            except Exception as e:
+                status_code = getattr(e, "status_code", None)
+                if status_code != 429:
+                    # Timeout / transport / API error: it may have been processed, keep the reservation
+                    raise
+                reservation.settle(0)
+                response = getattr(e, "response", None)
+                delay = self.retry_delay(status_code, getattr(response, "headers", None), str(e), attempt)
+                if delay is None:
+                    raise
+            else:
+                if getattr(result, "status_code", None) != 429:
+                    return result, reservation
+                reservation.settle(0)
+                delay = self.retry_delay(429, result.headers, result.text, attempt)
+                if delay is None:
+                    return result, reservation
+
+            self.backoff(pool_name, delay)
+            self.retries += 1
+            attempt += 1
+            print(f"[OpenAILimiter] {pool_name}: 429, retry {attempt}/{self.max_retries} in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+    async def _acquire_shared(self, pool: _Pool, tokens: int) -> None:
+        """Fixed one-minute windows counted in Mongo, shared by every process. Fails open."""
+        from pymongo import ReturnDocument
+
+        from api.models import RateLimitWindow
+
+        collection = RateLimitWindow.get_motor_collection()
+        while True:
+            now = datetime.utcnow()
+            window = now.replace(second=0, microsecond=0)
+            key = f"{pool.name}:{window.isoformat()}"
+            try:
+                doc = await collection.find_one_and_update(
+                    {"key": key},
+                    {
+                        "$inc": {"requests": 1, "tokens": tokens},
+                        "$setOnInsert": {"expires_at": window + timedelta(minutes=2)},
+                    },
+                    upsert=True,
+                    return_document=ReturnDocument.AFTER,
+                )
+            except Exception as e:
+                print(f"[OpenAILimiter] Shared window unavailable, using local limits only: {e}")
+                return
+            over_requests = pool.rpm > 0 and doc["requests"] > pool.rpm
+            over_tokens = pool.tpm > 0 and doc["tokens"] > pool.tpm and doc["tokens"] > tokens
+            if not (over_requests or over_tokens):
+                return
+            await collection.update_one({"key": key}, {"$inc": {"requests": -1, "tokens": -tokens}})
+            self.shared_waits += 1
+            next_window = window + timedelta(minutes=1)
+            await asyncio.sleep((next_window - now).total_seconds() + random.uniform(0, 1))
+
+    def stats(self) -> Dict[str, Any]:
+        pools = {}
+        for name, pool in self._pools.items():
+            pools[name] = {
+                "rpm": pool.rpm,
+                "tpm": pool.tpm,
+                "queued": len(pool.waiters),
+                "granted": pool.granted,
+                "waited": pool.waited,
+                "avg_wait_seconds": round(pool.wait_seconds / pool.waited, 3) if pool.waited else None,
+                "rate_limited": pool.rate_limited,
+                "tokens_reserved": pool.tokens_reserved,
+                "tokens_used": pool.tokens_used,
+            }
+        return {
+            "enabled": self.enabled,
+            "shared": self.shared,
+            "retries": self.retries,
+            "shared_waits": self.shared_waits,
+            "pools": pools,
+        }
+
+
+# Singleton instance
+openai_limiter = OpenAIRateLimiter()
@@ -0,0 +1,152 @@
+"""
+Process-pool PDF text extraction
+
+PyPDF2 page parsing and the cleanup regexes are pure-Python CPU work; on a
+thread they hold the GIL and stall everything else using threads. Here the page
+range is split into chunks (PDF_PAGES_PER_TASK) that run across a process pool
+(PDF_EXTRACT_WORKERS), and results are collected back in page order with a
+per-page progress callback. The file is written to a temp file once and every
+task opens it by path, so the PDF bytes are not pickled to each task.
+
+Limits: PDF_MAX_PAGES caps how many pages are read, PDF_EXTRACT_TIMEOUT_SECONDS
+bounds the whole extraction (pages finished before the timeout are kept).
+"""
+
+import asyncio
+import os
+import re
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Awaitable, Callable, List, Optional
+
+from PyPDF2 import PdfReader
+
+from core.settings import settings
+
+ProgressFn = Callable[[int, int], Awaitable[None]]
+
+# Marks text that is missing pages because the extraction timed out (not worth caching)
+TIMEOUT_NOTE = "[SYSTEM NOTE: Extraction timed out"
+
+_PAGE_NUMBER_RE = re.compile(r'(?i)page\s+\d+(\s+of\s+\d+)?')
+_DOT_LEADER_RE = re.compile(r'\.{3,}')
+_BLANK_LINES_RE = re.compile(r'\n{3,}')
+
+
+def clean_extracted_text(text: str) -> str:
+    """Strip common PDF garbage, page numbers, and excessive whitespace."""
+    # Remove common "Page X of Y" or "Page X" patterns
+    text = _PAGE_NUMBER_RE.sub('', text)
+    # Remove strings of 3+ dots (common in TOCs)
+    text = _DOT_LEADER_RE.sub(' ', text)
+    # Collapse multiple newlines
+    text = _BLANK_LINES_RE.sub('\n\n', text)
+    return text.strip()
+
+
+# --- Worker-process functions (module level so they can be pickled) ---
+
+def _count_pages(path: str) -> int:
+    return len(PdfReader(path).pages)
+
+
+def _extract_page_range(path: str, start: int, end: int) -> List[str]:
+    reader = PdfReader(path)
+    pages = []
+    for i in range(start, end):
+        try:
+            pages.append(clean_extracted_text(reader.pages[i].extract_text() or ""))
+        except Exception as page_err:
+            print(f"[PdfExtractor] Warning: Failed to extract page {i}: {page_err}")
+            pages.append("")
+    return pages
+
+
+class PdfExtractor:
+    def __init__(self) -> None:
+        self.workers = settings.PDF_EXTRACT_WORKERS or os.cpu_count() or 1
+        self.pages_per_task = max(1, settings.PDF_PAGES_PER_TASK)
+        self.max_pages = settings.PDF_MAX_PAGES
+        self.timeout = settings.PDF_EXTRACT_TIMEOUT_SECONDS
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self._pool
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    async def extract(self, file_bytes: bytes, filename: str, progress: Optional[ProgressFn] = None) -> str:
+        """Extract cleaned text from a PDF, pages joined in order."""
+        path = await asyncio.to_thread(self._write_temp, file_bytes)
+        try:
+            try:
+                return await self._extract(path, filename, progress)
+            except BrokenProcessPool:
+                # A worker died (OOM, killed): rebuild the pool next time, extract this file in a thread
+                print(f"[PdfExtractor] Process pool broken, falling back to thread extraction for {filename}")
+                self.shutdown()
+                total = await asyncio.to_thread(_count_pages, path)
+                pages = await asyncio.to_thread(_extract_page_range, path, 0, min(total, self.max_pages))
+                return "\n\n".join(pages)
+        finally:
+            await asyncio.to_thread(os.remove, path)
+
+    @staticmethod
+    def _write_temp(file_bytes: bytes) -> str:
+        fd, path = tempfile.mkstemp(suffix=".pdf")
+        with os.fdopen(fd, "wb") as f:
+            f.write(file_bytes)
+        return path
+
+    async def _extract(self, path: str, filename: str, progress: Optional[ProgressFn]) -> str:
+        loop = asyncio.get_running_loop()
+        total_pages = await loop.run_in_executor(self.pool, _count_pages, path)
+        pages_to_read = min(total_pages, self.max_pages)
+        print(f"[PdfExtractor] {filename}: {total_pages} pages, extracting {pages_to_read} across {self.workers} processes")
+
+        ranges = [
+            (start, min(start + self.pages_per_task, pages_to_read))
+            for start in range(0, pages_to_read, self.pages_per_task)
+        ]
+        futures = [
+            loop.run_in_executor(self.pool, _extract_page_range, path, start, end)
+            for start, end in ranges
+        ]
+
+        parts: List[str] = []
+        pages_done = 0
+        deadline = loop.time() + self.timeout
+        try:
+            # Collect in page order; later ranges keep running in parallel meanwhile
+            for (start, end), future in zip(ranges, futures):
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    raise asyncio.TimeoutError()
+                parts.extend(await asyncio.wait_for(asyncio.shield(future), timeout=remaining))
+                pages_done = end
+                if progress:
+                    await progress(pages_done, pages_to_read)
+        except asyncio.TimeoutError:
+            print(f"[PdfExtractor] WARNING: {filename} timed out after {self.timeout}s at page {pages_done}/{pages_to_read}")
+            parts.append(f"{TIMEOUT_NOTE}; only the first {pages_done} of {total_pages} pages were read.]")
+        finally:
+            # Only drops ranges still queued: a range already running in a worker finishes
+            # (at most PDF_PAGES_PER_TASK pages) and its result is discarded
+            for future in futures:
+                future.cancel()
+
+        if pages_to_read < total_pages:
+            parts.append(f"[SYSTEM NOTE: Only the first {pages_to_read} of {total_pages} pages were read.]")
+
+        return "\n\n".join(parts)
+
+
+# Singleton instance
+pdf_extractor = PdfExtractor()
@@ -0,0 +1,198 @@
+"""
+OpenAI structured outputs for the generation chains.
+
+Concept, structure and email steps used to ask for "ONLY a JSON array" in the
+prompt and then dig it out of free text with regex strategies (DOTALL
+`\\[\\s*\\{.*\\}\\s*\\]` over thousands of tokens), re-running the whole generation
+when fewer than 3 concepts came back. Here each step sends a strict
+`json_schema` response_format built from the Pydantic models (Concept, Slide,
+EmailDraft, EmailPlan), so the reply is guaranteed to match, and parsing is a
+single json.loads plus per-item model validation.
+
+If a reply is cut off anyway, the complete items before the cut are kept: the
+array is decoded item by item with JSONDecoder.raw_decode (linear, no regex).
+"""
+
+import json
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Type, TypeVar
+
+from pydantic import BaseModel, ValidationError
+
+from api.models import Concept, EmailDraft, EmailPlan, Slide
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+# Strict mode has no open-ended dicts: typed stand-ins for the Dict fields of the models
+SECRET_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "assumption": {"type": "string"},
+        "belief": {"type": "string"},
+        "story": {"type": "string"},
+        "transformation": {"type": "string"},
+    },
+    "required": ["assumption", "belief", "story", "transformation"],
+    "additionalProperties": False,
+}
+VALUE_ANCHOR_SCHEMA = {
+    "type": "object",
+    "properties": {"outcomes": {"type": "array", "items": {"type": "string"}}},
+    "required": ["outcomes"],
+    "additionalProperties": False,
+}
+TIMELINE_ITEM_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "id": {"type": "string"},
+        "type": {"type": "string"},
+        "timing": {"type": "string"},
+        "goal": {"type": "string"},
+        "logic": {"type": "string"},
+    },
+    "required": ["id", "type", "timing", "goal", "logic"],
+    "additionalProperties": False,
+}
+
+
+def _strict(prop: Dict[str, Any], name: str) -> Dict[str, Any]:
+    prop = {k: v for k, v in prop.items() if k not in ("title", "default")}
+    if "anyOf" in prop:
+        prop["anyOf"] = [_strict(p, name) for p in prop["anyOf"]]
+    if prop.get("type") == "array" and "items" in prop:
+        prop["items"] = _strict(prop["items"], name)
+    if prop.get("type") == "object" and "properties" not in prop:
+        raise TypeError(f"Field '{name}' is an open dict; pass a schema for it in overrides")
+    return prop
+
+
+def object_schema(
+    model: Type[BaseModel],
+    exclude: Iterable[str] = (),
+    overrides: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> Dict[str, Any]:
+    """Strict JSON schema of a model: every field required, optional fields nullable, no extra keys."""
+    raw = model.model_json_schema()
+    overrides = overrides or {}
+    required = set(raw.get("required", []))
+    properties: Dict[str, Any] = {}
+    for name, prop in raw["properties"].items():
+        if name in exclude:
+            continue
+        prop = overrides[name] if name in overrides else _strict(prop, name)
+        if name not in required and "anyOf" not in prop:
+            prop = {"anyOf": [prop, {"type": "null"}]}
+        properties[name] = prop
+    return {
+        "type": "object",
+        "properties": properties,
+        "required": list(properties),
+        "additionalProperties": False,
+    }
+
+
+def list_schema(key: str, item_schema: Dict[str, Any]) -> Dict[str, Any]:
+    """Strict mode needs an object at the root: {key: [item, ...]}."""
+    return {
+        "type": "object",
+        "properties": {key: {"type": "array", "items": item_schema}},
+        "required": [key],
+        "additionalProperties": False,
+    }
+
+
+def response_format(name: str, schema: Dict[str, Any]) -> Dict[str, Any]:
+    return {"type": "json_schema", "json_schema": {"name": name, "strict": True, "schema": schema}}
+
+
+CONCEPT_SCHEMA = object_schema(
+    Concept,
+    exclude=("evaluation_score", "evaluation_notes"),
+    overrides={
+        "secrets": {"type": "array", "items": SECRET_SCHEMA},
+        "value_anchor": VALUE_ANCHOR_SCHEMA,
+    },
+)
+SLIDE_SCHEMA = object_schema(Slide)
+EMAIL_DRAFT_SCHEMA = object_schema(EmailDraft, exclude=("tone_analysis",))
+
+CONCEPT_FORMAT = response_format("webinar_concept", CONCEPT_SCHEMA)
+CONCEPT_LIST_FORMAT = response_format("webinar_concepts", list_schema("concepts", CONCEPT_SCHEMA))
+SLIDE_LIST_FORMAT = response_format("webinar_structure", list_schema("slides", SLIDE_SCHEMA))
+EMAIL_FORMAT = response_format("webinar_email", EMAIL_DRAFT_SCHEMA)
+EMAIL_LIST_FORMAT = response_format("webinar_emails", list_schema("emails", EMAIL_DRAFT_SCHEMA))
+# Strategy step: the plan without the emails, which are written afterwards
+EMAIL_STRATEGY_FORMAT = response_format(
+    "webinar_email_strategy",
+    object_schema(
+        EmailPlan,
+        exclude=("emails",),
+        overrides={"timeline": {"type": "array", "items": TIMELINE_ITEM_SCHEMA}},
+    ),
+)
+
+
+def _load(text: str) -> Any:
+    try:
+        return json.loads(text)
+    except (json.JSONDecodeError, TypeError):
+        return None
+
+
+def _iter_complete_items(text: str, key: str) -> Iterator[Any]:
+    """Complete elements of the `key` array in a truncated reply, decoded one at a time."""
+    start = text.find(f'"{key}"')
+    if start == -1:
+        return
+    pos = text.find("[", start)
+    if pos == -1:
+        return
+    pos += 1
+    decoder = json.JSONDecoder()
+    while True:
+        while pos < len(text) and text[pos] in " \t\r\n,":
+            pos += 1
+        if pos >= len(text) or text[pos] == "]":
+            return
+        try:
+            item, pos = decoder.raw_decode(text, pos)
+        except json.JSONDecodeError:
+            # The reply ends inside this element
+            return
+        yield item
+
+
+def parse_list(text: str, key: str, model: Type[ModelT]) -> List[ModelT]:
+    """Validated items of the `key` array; items that don't validate are skipped."""
+    data = _load(text)
+    if isinstance(data, dict):
+        items = data.get(key) or []
+    elif isinstance(data, list):
+        items = data
+    else:
+        items = list(_iter_complete_items(text or "", key))
+        print(f"[StructuredOutput] Reply was not complete JSON, kept {len(items)} complete '{key}' items")
+
+    parsed: List[ModelT] = []
+    for index, item in enumerate(items):
+        try:
+            parsed.append(model.model_validate(item))
+        except ValidationError as e:
+            print(f"[StructuredOutput] Skipping invalid {model.__name__} #{index + 1}: {e.error_count()} errors")
+    return parsed
+
+
+def parse_object(text: str, model: Type[ModelT]) -> Optional[ModelT]:
+    data = _load(text)
+    if not isinstance(data, dict):
+        return None
+    try:
+        return model.model_validate(data)
+    except ValidationError as e:
+        print(f"[StructuredOutput] Invalid {model.__name__}: {e.error_count()} errors")
+        return None
+
+
+def load_object(text: str) -> Dict[str, Any]:
+    """The reply as a dict ({} when it isn't a complete JSON object)."""
+    data = _load(text)
+    return data if isinstance(data, dict) else {}
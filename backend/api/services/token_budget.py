@@ -0,0 +1,251 @@
+"""
+Token budgeting for OpenAI prompts (tiktoken).
+
+Prompt context used to be trimmed by character counts ([:15000], len > 12000, ...),
+which says little about what actually fits the model: Norwegian text, JSON and
+code all tokenize differently. This module counts tokens with cached tiktoken
+encoders and:
+
+- clamps max_tokens (LLM_DEFAULT_OUTPUT_TOKENS unless a call asks for more) to
+  what is left of the model window after the prompt, so overflowing prompts
+  fail fast instead of costing a rejected request; calls whose answers must
+  not be cut short (finish_reason == "length") can ask for the whole remainder
+- fits the variable part of a prompt template (onboarding doc, transcript, ...)
+  into the window minus the output tokens reserved for the answer
+- splits long text into token-sized chunks for map-reduce summarization
+
+Without tiktoken (or its encoding files) counts fall back to ~4 chars per token.
+"""
+
+import math
+import pkgutil
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.settings import settings
+
+DEFAULT_MODEL = "gpt-4o-mini"
+
+# model: (context window, max output tokens)
+MODEL_LIMITS: Dict[str, Tuple[int, int]] = {
+    "gpt-4o-mini": (128000, 16384),
+    "gpt-4o": (128000, 16384),
+    "gpt-4-turbo": (128000, 4096),
+    "gpt-4": (8192, 8192),
+    "gpt-3.5-turbo": (16385, 4096),
+}
+
+# Chat format overhead: role/separators per message, plus priming of the reply
+TOKENS_PER_MESSAGE = 3
+REPLY_PRIMING_TOKENS = 3
+
+# Estimate used when no tiktoken encoder is available
+CHARS_PER_TOKEN = 4
+
+
+@lru_cache(maxsize=None)
+def get_encoder(model: str):
+    """tiktoken encoding for model (loaded once per model), or None to use the estimate."""
+    try:
+        import tiktoken
+    except ImportError:
+        print("[TokenBudget] tiktoken not installed, estimating ~4 chars per token")
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        # Older tiktoken releases don't know newer model names
+        name = "o200k_base" if model.startswith("gpt-4o") else "cl100k_base"
+        try:
+            return tiktoken.get_encoding(name)
+        except Exception as e:
+            print(f"[TokenBudget] Could not load encoding {name}, estimating: {e}")
+            return None
+    except Exception as e:
+        # Encoding files are downloaded on first use; offline hosts end up here
+        print(f"[TokenBudget] Could not load encoding for {model}, estimating: {e}")
+        return None
+
+
+class TokenBudget:
+    def __init__(self) -> None:
+        self.reserved_output = settings.LLM_RESERVED_OUTPUT_TOKENS
+        self.default_output = settings.LLM_DEFAULT_OUTPUT_TOKENS
+        self.min_output = settings.LLM_MIN_OUTPUT_TOKENS
+        self.safety_margin = settings.LLM_PROMPT_SAFETY_MARGIN_TOKENS
+        self.cache_max_chars = settings.TOKEN_COUNT_CACHE_MAX_CHARS
+        # Prompt templates and system prompts are counted over and over: memoize short texts
+        self._count_cached = lru_cache(maxsize=settings.TOKEN_COUNT_CACHE_SIZE)(self._count)
+        self._template_tokens: Optional[Dict[str, int]] = None
+
+        # Counters
+        self.counts = 0
+        self.truncations = 0
+        self.clamped = 0  # max_tokens lowered to fit the window
+        self.rejected = 0  # prompts too long for the window
+
+    @staticmethod
+    def limits(model: str = DEFAULT_MODEL) -> Tuple[int, int]:
+        return MODEL_LIMITS.get(model, (settings.LLM_CONTEXT_WINDOW_TOKENS, settings.LLM_MAX_OUTPUT_TOKENS))
+
+    @staticmethod
+    def _count(text: str, model: str) -> int:
+        encoder = get_encoder(model)
+        if encoder is None:
+            return math.ceil(len(text) / CHARS_PER_TOKEN)
+        # disallowed_special=(): user documents may contain "<|endoftext|>" literally
+        return len(encoder.encode(text, disallowed_special=()))
+
+    def count(self, text: str, model: str = DEFAULT_MODEL) -> int:
+        if not text:
+            return 0
+        self.counts += 1
+        if len(text) <= self.cache_max_chars:
+            return self._count_cached(text, model)
+        return self._count(text, model)
+
+    def count_messages(self, system_prompt: str, prompt: str, model: str = DEFAULT_MODEL) -> int:
+        """Prompt tokens of a system + user chat request."""
+        return (
+            self.count(system_prompt, model)
+            + self.count(prompt, model)
+            + 2 * TOKENS_PER_MESSAGE
+            + REPLY_PRIMING_TOKENS
+        )
+
+    def max_output_tokens(
+        self,
+        system_prompt: str,
+        prompt: str,
+        desired: Optional[int] = None,
+        model: str = DEFAULT_MODEL,
+        fill_window: bool = False,
+    ) -> int:
+        """
+        max_tokens for this request: `desired` (default: LLM_DEFAULT_OUTPUT_TOKENS, or the
+        model's output limit with fill_window), lowered to what the window has left after
+        the prompt. Raises ValueError when fewer than LLM_MIN_OUTPUT_TOKENS would be left.
+        """
+        window, output_limit = self.limits(model)
+        prompt_tokens = self.count_messages(system_prompt, prompt, model)
+        available = window - prompt_tokens - self.safety_margin
+        if available < self.min_output:
+            self.rejected += 1
+            raise ValueError(
+                f"Prompt too long for {model}: {prompt_tokens} tokens of a {window}-token window"
+            )
+        if desired is None:
+            desired = output_limit if fill_window else self.default_output
+        wanted = min(desired, output_limit)
+        if wanted > available:
+            self.clamped += 1
+            print(f"[TokenBudget] max_tokens {wanted} -> {available} ({prompt_tokens} prompt tokens)")
+            return available
+        return wanted
+
+    def truncate(self, text: str, max_tokens: int, model: str = DEFAULT_MODEL) -> str:
+        """The first max_tokens tokens of text."""
+        if not text:
+            return text
+        max_tokens = max(0, max_tokens)
+        encoder = get_encoder(model)
+        if encoder is None:
+            max_chars = max_tokens * CHARS_PER_TOKEN
+            if len(text) <= max_chars:
+                return text
+            self.truncations += 1
+            return text[:max_chars]
+        tokens = encoder.encode(text, disallowed_special=())
+        if len(tokens) <= max_tokens:
+            return text
+        self.truncations += 1
+        return encoder.decode(tokens[:max_tokens])
+
+    def fit_template(
+        self,
+        template: str,
+        field: str,
+        text: str,
+        system_prompt: str = "",
+        reserve_output: Optional[int] = None,
+        model: str = DEFAULT_MODEL,
+        **fields: Any,
+    ) -> str:
+        """
+        Render template with `field` set to as much of `text` as fits the window once
+        the rest of the prompt, the system prompt and the reserved output are counted.
+        """
+        window, _ = self.limits(model)
+        reserve = self.reserved_output if reserve_output is None else reserve_output
+        fixed = self.count_messages(system_prompt, template.format(**{field: ""}, **fields), model)
+        budget = window - fixed - reserve - self.safety_margin
+        fitted = self.truncate(text or "", budget, model)
+        if len(fitted) < len(text or ""):
+            print(f"[TokenBudget] Trimmed '{field}' to {budget} tokens to fit {model}")
+        return template.format(**{field: fitted}, **fields)
+
+    def split(self, text: str, max_tokens: int, model: str = DEFAULT_MODEL) -> List[str]:
+        """Split on paragraph boundaries into chunks of at most max_tokens tokens."""
+        max_tokens = max(250, max_tokens)
+        separator_tokens = self.count("\n\n", model)
+        chunks: List[str] = []
+        current: List[str] = []
+        size = 0
+        for paragraph in text.split("\n\n"):
+            for piece in self._hard_split(paragraph, max_tokens, model):
+                piece_tokens = self.count(piece, model)
+                if size + piece_tokens > max_tokens and current:
+                    chunks.append("\n\n".join(current))
+                    current, size = [], 0
+                current.append(piece)
+                size += piece_tokens + separator_tokens
+        if current:
+            chunks.append("\n\n".join(current))
+        return chunks
+
+    def _hard_split(self, paragraph: str, max_tokens: int, model: str) -> List[str]:
+        """A paragraph that alone exceeds a chunk, cut into max_tokens pieces."""
+        encoder = get_encoder(model)
+        if encoder is None:
+            max_chars = max_tokens * CHARS_PER_TOKEN
+            return [paragraph[i:i + max_chars] for i in range(0, len(paragraph), max_chars)] or [""]
+        if len(paragraph) <= max_tokens:
+            # Never more tokens than characters: no need to encode
+            return [paragraph]
+        tokens = encoder.encode(paragraph, disallowed_special=())
+        if len(tokens) <= max_tokens:
+            return [paragraph]
+        return [encoder.decode(tokens[i:i + max_tokens]) for i in range(0, len(tokens), max_tokens)]
+
+    def template_tokens(self) -> Dict[str, int]:
+        """Token count of every prompt template in api/prompts (placeholders unfilled), computed once."""
+        if self._template_tokens is None:
+            import importlib
+
+            import api.prompts
+
+            counts: Dict[str, int] = {}
+            for module_info in pkgutil.iter_modules(api.prompts.__path__):
+                module = importlib.import_module(f"api.prompts.{module_info.name}")
+                for name, value in vars(module).items():
+                    if name.isupper() and isinstance(value, str):
+                        counts[f"{module_info.name}.{name}"] = self.count(value)
+            self._template_tokens = counts
+        return self._template_tokens
+
+    def stats(self) -> Dict[str, Any]:
+        cache = self._count_cached.cache_info()
+        lookups = cache.hits + cache.misses
+        return {
+            "encoder": "tiktoken" if get_encoder(DEFAULT_MODEL) is not None else "estimate",
+            "counts": self.counts,
+            "count_cache_hit_rate": round(cache.hits / lookups, 3) if lookups else None,
+            "truncations": self.truncations,
+            "max_tokens_clamped": self.clamped,
+            "prompts_rejected": self.rejected,
+            "prompt_templates": self.template_tokens(),
+        }
+
+
+# Singleton instance
+token_budget = TokenBudget()
@@ -0,0 +1,164 @@
+"""
+Disk cache of instant-preview TTS audio.
+
+Mentors replay the same script preview many times, and every replay used to
+synthesize the MP3 again. Finished audio is stored as `<key>.mp3` in
+TTS_CACHE_DIR, keyed by sha256(model, voice, speed, text):
+
+- Audio is written to a `.part` file while it streams to the client and only
+  renamed into place once complete (an aborted stream leaves nothing behind)
+- Total size is bounded by TTS_CACHE_MAX_BYTES; least recently played files
+  are evicted first (a hit refreshes the file's mtime)
+
+Cache failures never break playback: errors are logged and treated as a miss.
+The index is used from asyncio.to_thread workers, so it is guarded by a lock.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from core.settings import settings
+
+
+class TTSCache:
+    def __init__(self) -> None:
+        self.enabled = settings.TTS_CACHE_ENABLED
+        self.directory = settings.TTS_CACHE_DIR or os.path.join(tempfile.gettempdir(), "webinar_tts_cache")
+        self.max_bytes = settings.TTS_CACHE_MAX_BYTES
+        # key -> size, least recently used first (loaded from disk on first use)
+        self._index: Optional["OrderedDict[str, int]"] = None
+        self._bytes = 0
+        # Guards _index/_bytes (reentrant: commit() loads the index and evicts under it)
+        self._lock = threading.RLock()
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self.errors = 0
+
+    @staticmethod
+    def make_key(model: str, voice: str, speed: float, text: str) -> str:
+        raw = json.dumps([model, voice, round(float(speed), 3), text], ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.mp3")
+
+    def _load_index(self) -> "OrderedDict[str, int]":
+        with self._lock:
+            return self._load_index_locked()
+
+    def _load_index_locked(self) -> "OrderedDict[str, int]":
+        if self._index is None:
+            os.makedirs(self.directory, exist_ok=True)
+            entries = []
+            for name in os.listdir(self.directory):
+                path = os.path.join(self.directory, name)
+                if name.endswith(".part"):
+                    # Left over from a crash mid-write
+                    os.remove(path)
+                elif name.endswith(".mp3"):
+                    stat = os.stat(path)
+                    entries.append((stat.st_mtime, name[:-len(".mp3")], stat.st_size))
+            entries.sort()
+            self._index = OrderedDict((key, size) for _, key, size in entries)
+            self._bytes = sum(self._index.values())
+        return self._index
+
+    def _lookup(self, key: str) -> Optional[str]:
+        with self._lock:
+            index = self._load_index_locked()
+            if key not in index:
+                return None
+            path = self._path(key)
+            if not os.path.exists(path):
+                self._bytes -= index.pop(key)
+                return None
+            os.utime(path)
+            index.move_to_end(key)
+            return path
+
+    async def get_path(self, key: str) -> Optional[str]:
+        """Path of the cached MP3 for key, or None."""
+        if not self.enabled:
+            return None
+        try:
+            path = await asyncio.to_thread(self._lookup, key)
+        except Exception as e:
+            self.errors += 1
+            print(f"[TTSCache] WARNING: lookup failed, treating as miss: {e}")
+            path = None
+        if path:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return path
+
+    def open_part(self, key: str):
+        """Binary file to stream new audio into; finish with commit() or discard()."""
+        self._load_index()
+        # Unique per stream: concurrent previews of the same text each write their own file
+        return tempfile.NamedTemporaryFile("wb", dir=self.directory, prefix=f"{key}.", suffix=".part", delete=False)
+
+    def commit(self, key: str, part) -> None:
+        """Move a complete part file into place. Failures are logged and the part dropped."""
+        try:
+            part.close()
+            size = os.path.getsize(part.name)
+            with self._lock:
+                os.replace(part.name, self._path(key))
+                index = self._load_index_locked()
+                self._bytes += size - index.pop(key, 0)
+                index[key] = size
+                self.writes += 1
+                self._evict()
+        except Exception as e:
+            self.errors += 1
+            print(f"[TTSCache] WARNING: could not store audio: {e}")
+            try:
+                self.discard(part)
+            except OSError:
+                pass
+
+    @staticmethod
+    def discard(part) -> None:
+        part.close()
+        if os.path.exists(part.name):
+            os.remove(part.name)
+
+    def _evict(self) -> None:
+        with self._lock:
+            index = self._load_index_locked()
+            while self._bytes > self.max_bytes and len(index) > 1:
+                key, size = index.popitem(last=False)
+                self._bytes -= size
+                try:
+                    os.remove(self._path(key))
+                except FileNotFoundError:
+                    pass
+                self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+            "writes": self.writes,
+            "evictions": self.evictions,
+            "errors": self.errors,
+            "files": len(self._index) if self._index is not None else None,
+            "bytes": self._bytes,
+        }
+
+
+tts_cache = TTSCache()
@@ -1,22 +1,38 @@
 from __future__ import annotations
 
-from typing import Optional
+import asyncio
+from typing import AsyncIterator, Optional
 
+from api.services.tts_cache import tts_cache
 from core.settings import settings
 
+CHUNK_SIZE = 16 * 1024
+
 
 class TTSService:
     """
     Instant preview audio generation using OpenAI TTS.
     This is meant to be FAST (seconds) and does not involve HeyGen.
+    Audio is streamed as it is synthesized and cached on disk (tts_cache).
     """
 
     def __init__(self) -> None:
         self.default_model = "tts-1"
         # More feminine-sounding default for the preview
         self.default_voice = "shimmer"
+        self._client = None
+
+    @property
+    def client(self):
+        # OpenAI python client (already in requirements); one shared client, retries via openai_limiter
+        if self._client is None:
+            from openai import AsyncOpenAI
+
+            self._client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY, max_retries=0)
+        return self._client
 
-    def synthesize_mp3(self, text: str, *, voice: Optional[str] = None, speed: float = 1.0) -> bytes:
+    @staticmethod
+    def _prepare(text: str) -> str:
         if not settings.OPENAI_API_KEY:
             raise ValueError("OPENAI_API_KEY not set")
         if not text or not text.strip():
@@ -26,25 +42,71 @@ class TTSService:
         text = text.strip()
         if len(text) > 1200:
             text = text[:1200]
+        return text
+
+    def _cache_key(self, text: str, voice: Optional[str], speed: float) -> str:
+        return tts_cache.make_key(self.default_model, voice or self.default_voice, speed, text)
+
+    async def cached_path(self, text: str, *, voice: Optional[str] = None, speed: float = 1.0) -> Optional[str]:
+        """Path of the cached MP3 for this text/voice/speed, or None."""
+        return await tts_cache.get_path(self._cache_key(self._prepare(text), voice, speed))
 
-        # OpenAI python client (already in requirements)
-        from openai import OpenAI
+    async def stream_mp3(self, text: str, *, voice: Optional[str] = None, speed: float = 1.0) -> AsyncIterator[bytes]:
+        """
+        Synthesize and yield MP3 chunks as OpenAI sends them, so playback can start on the
+        first chunk. The audio is written to the TTS cache as it streams (kept only if complete).
+        """
+        text = self._prepare(text)
+        key = self._cache_key(text, voice, speed)
 
-        client = OpenAI(api_key=settings.OPENAI_API_KEY)
-        resp = client.audio.speech.create(
-            model=self.default_model,
-            voice=voice or self.default_voice,
-            input=text,
-            response_format="mp3",
-            speed=speed,
-        )
+        from api.services.openai_limiter import openai_limiter
 
-        # `resp` can be a binary response wrapper; `.read()` is supported in openai-python 1.x
+        manager = None
+
+        async def _open():
+            nonlocal manager
+            manager = self.client.audio.speech.with_streaming_response.create(
+                model=self.default_model,
+                voice=voice or self.default_voice,
+                input=text,
+                response_format="mp3",
+                speed=speed,
+            )
+            return await manager.__aenter__()
+
+        # 429s are retried by the limiter while opening, before anything is yielded
+        response = await openai_limiter.run("audio", _open)
+        part = None
         try:
-            return resp.read()
-        except Exception:
-            # fallback: some versions expose `content`
-            return getattr(resp, "content", b"")
+            if tts_cache.enabled:
+                try:
+                    part = await asyncio.to_thread(tts_cache.open_part, key)
+                except Exception as e:
+                    print(f"[TTSService] Not caching audio: {e}")
+            async for chunk in response.iter_bytes(CHUNK_SIZE):
+                if part is not None:
+                    await asyncio.to_thread(part.write, chunk)
+                yield chunk
+            if part is not None:
+                await asyncio.to_thread(tts_cache.commit, key, part)
+                part = None
+        finally:
+            if part is not None:
+                # Aborted stream (client went away, provider error): don't cache a partial MP3
+                tts_cache.discard(part)
+            await manager.__aexit__(None, None, None)
+
+    async def synthesize_mp3(self, text: str, *, voice: Optional[str] = None, speed: float = 1.0) -> bytes:
+        """The whole MP3 at once (from the cache when available)."""
+        path = await self.cached_path(text, voice=voice, speed=speed)
+        if path:
+            return await asyncio.to_thread(_read_file, path)
+        return b"".join([chunk async for chunk in self.stream_mp3(text, voice=voice, speed=speed)])
+
+
+def _read_file(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
 
 
 tts_service = TTSService()
@@ -0,0 +1,173 @@
+"""
+Video Finalizer
+
+Copies a finished HeyGen/Gemini render to S3 exactly once per TalkId.
+
+`GET /video/{talk_id}` is polled every few seconds by the frontend; previously every
+"done" poll re-downloaded the whole video into memory and re-uploaded it to S3.
+Now the first "done" poll claims the WebinarVideo record (atomic FinalizeStatus /
+FinalizeLockExpiresAt lock) and streams the provider URL straight into an S3
+multipart upload in the background. Later polls read VideoS3Url from the DB and
+never touch the provider again.
+"""
+
+import asyncio
+import os
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Dict, Optional
+
+from api.models import ConceptStatus, WebinarAsset, WebinarVideo
+from core.http_client import media_http_client
+from core.s3 import s3_service
+from core.settings import settings
+
+FINALIZED = "finalized"
+FINALIZING = "finalizing"
+FAILED = "failed"
+
+CHUNK_SIZE = 1024 * 1024
+
+
+class VideoFinalizer:
+    def __init__(self) -> None:
+        self.lease_seconds = settings.VIDEO_FINALIZE_LEASE_SECONDS
+        self.max_attempts = settings.VIDEO_FINALIZE_MAX_ATTEMPTS
+        # talk_id -> finalization task running in this process
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    @staticmethod
+    def _collection():
+        return WebinarVideo.get_motor_collection()
+
+    async def get_finalized(self, talk_id: str) -> Optional[WebinarVideo]:
+        """The WebinarVideo record if its render has already been copied to S3."""
+        video = await WebinarVideo.find_one(WebinarVideo.TalkId == talk_id)
+        if video and video.FinalizeStatus == FINALIZED and video.VideoS3Url:
+            return video
+        return None
+
+    async def claim(self, talk_id: str) -> bool:
+        """
+        Atomically take the finalization lock for talk_id.
+        Claimable = never finalized, failed with attempts left, or a stale lock.
+        """
+        doc = await self._try_claim(talk_id)
+        if doc is None and not await self._collection().count_documents({"TalkId": talk_id}, limit=1):
+            # Renders started outside /video/generate have no record yet
+            await self._collection().update_one(
+                {"TalkId": talk_id},
+                {"$setOnInsert": {
+                    "MentorId": "",
+                    "TalkId": talk_id,
+                    "Script": "",
+                    "ScriptS3Url": "",
+                    "VideoS3Url": "",
+                    "VideoSourceUrl": "",
+                    "Status": int(ConceptStatus.Pending),
+                    "UploadedAt": datetime.utcnow(),
+                }},
+                upsert=True,
+            )
+            doc = await self._try_claim(talk_id)
+        return doc is not None
+
+    async def _try_claim(self, talk_id: str) -> Optional[dict]:
+        now = datetime.utcnow()
+        return await self._collection().find_one_and_update(
+            {
+                "TalkId": talk_id,
+                "$or": [
+                    {"FinalizeStatus": {"$in": [None, ""]}},
+                    {"FinalizeStatus": FAILED, "FinalizeAttempts": {"$lt": self.max_attempts}},
+                    {"FinalizeStatus": FINALIZING, "FinalizeLockExpiresAt": {"$lt": now}},
+                ],
+            },
+            {
+                "$set": {
+                    "FinalizeStatus": FINALIZING,
+                    "FinalizeLockExpiresAt": now + timedelta(seconds=self.lease_seconds),
+                },
+                "$inc": {"FinalizeAttempts": 1},
+            },
+        )
+
+    def schedule(self, talk_id: str, source_url: str) -> None:
+        """
+        Finalize in the background so the status poll returns immediately. Polls that
+        arrive while this process is already finalizing talk_id don't start another task.
+        """
+        if talk_id in self._tasks:
+            return
+        task = asyncio.create_task(self.finalize(talk_id, source_url))
+        self._tasks[talk_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(talk_id, None))
+
+    async def finalize(self, talk_id: str, source_url: str) -> Optional[str]:
+        """Copy the render to S3 if this call wins the lock. Returns the S3 URL, or None."""
+        try:
+            if not await self.claim(talk_id):
+                return None
+        except Exception as e:
+            print(f"[VideoFinalizer] Could not claim {talk_id}: {e}")
+            return None
+
+        print(f"[VideoFinalizer] Finalizing {talk_id} from {source_url}")
+        try:
+            video_s3_url = await s3_service.upload_stream(
+                self._iter_source(source_url),
+                file_name=f"webinar_video_{talk_id}.mp4",
+                content_type="video/mp4",
+            )
+        except Exception as e:
+            print(f"[VideoFinalizer] WARNING: S3 video upload failed for {talk_id}: {e}")
+            await self._collection().update_one(
+                {"TalkId": talk_id},
+                {"$set": {"FinalizeStatus": FAILED, "FinalizeLockExpiresAt": None, "FinalizeError": str(e)[:500]}},
+            )
+            return None
+
+        # Status stays 0=Pending until admin approves
+        await self._collection().update_one(
+            {"TalkId": talk_id},
+            {"$set": {
+                "VideoS3Url": video_s3_url,
+                "VideoSourceUrl": source_url,
+                "FinalizeStatus": FINALIZED,
+                "FinalizeLockExpiresAt": None,
+                "FinalizeError": None,
+            }},
+        )
+        try:
+            asset = await WebinarAsset.find_one(WebinarAsset.video_talk_id == talk_id)
+            if asset:
+                await asset.set({WebinarAsset.video_url: video_s3_url, WebinarAsset.video_status: "completed"})
+        except Exception as e:
+            print(f"[VideoFinalizer] Error persisting S3 video URL on asset: {e}")
+
+        print(f"[VideoFinalizer] Video saved to S3: {video_s3_url}")
+        return video_s3_url
+
+    async def _iter_source(self, source_url: str) -> AsyncIterator[bytes]:
+        """Stream the render in chunks: provider URL over HTTP, or a local /static/ file (Gemini)."""
+        if source_url.startswith("/static/"):
+            base_dir = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+            path = os.path.join(base_dir, source_url.lstrip("/"))
+            f = await asyncio.to_thread(open, path, "rb")
+            try:
+                while True:
+                    chunk = await asyncio.to_thread(f.read, CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    yield chunk
+            finally:
+                await asyncio.to_thread(f.close)
+            return
+
+        async with media_http_client.stream("GET", source_url, follow_redirects=True) as response:
+            response.raise_for_status()
+            async for chunk in response.aiter_bytes(CHUNK_SIZE):
+                yield chunk
+
+
+# Singleton instance
+video_finalizer = VideoFinalizer()
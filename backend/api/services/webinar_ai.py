@@ -1,13 +1,15 @@
 import os
 import json
-import httpx
 import asyncio
+import hashlib
 from datetime import datetime
-from api.models import WebinarAsset, Concept, Slide, EmailPlan
+from api.models import WebinarAsset, Concept, Slide, EmailDraft, EmailPlan
 from api.prompts.concepts_v2 import (
     CONCEPT_GENERATION_PROMPT, 
     CONCEPT_EVALUATION_PROMPT, 
-    CONCEPT_IMPROVEMENT_PROMPT
+    CONCEPT_IMPROVEMENT_PROMPT,
+    CONCEPT_SINGLE_EVALUATION_PROMPT,
+    CONCEPT_SINGLE_IMPROVEMENT_PROMPT
 )
 from api.prompts.structure_v2 import (
     STRUCTURE_GENERATION_PROMPT, 
@@ -19,18 +21,37 @@ from api.prompts.emails_v2 import (
     EMAIL_STRATEGY_PROMPT, 
     EMAIL_GENERATION_PROMPT, 
     EMAIL_EVALUATION_PROMPT, 
-    EMAIL_IMPROVEMENT_PROMPT
+    EMAIL_IMPROVEMENT_PROMPT,
+    EMAIL_SINGLE_GENERATION_PROMPT,
+    EMAIL_SINGLE_EVALUATION_PROMPT,
+    EMAIL_SINGLE_IMPROVEMENT_PROMPT
 )
 from api.prompts.system_prompts import (
     WEBINAR_MASTER_OS_PROMPT_NORWEGIAN,
     WEBINAR_MASTER_OS_PROMPT_ENGLISH
 )
 from beanie import PydanticObjectId
-from typing import List, Optional
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
 import base64
 import io
-from PyPDF2 import PdfReader
 from core.settings import settings
+from core.http_client import openai_http_client
+from api.services.llm_cache import llm_cache
+from api.services.token_budget import token_budget
+from api.services.openai_limiter import openai_limiter, with_priority, Priority
+from api.services.structured_output import (
+    CONCEPT_FORMAT,
+    CONCEPT_LIST_FORMAT,
+    EMAIL_FORMAT,
+    EMAIL_LIST_FORMAT,
+    EMAIL_STRATEGY_FORMAT,
+    SLIDE_LIST_FORMAT,
+    load_object,
+    parse_list,
+    parse_object,
+)
+from api.services.pdf_extractor import pdf_extractor, TIMEOUT_NOTE
+from api.services.extraction_cache import extraction_cache
 
 # Configuration
 OPENAI_API_KEY = settings.OPENAI_API_KEY
@@ -39,6 +60,9 @@ OPENAI_ENDPOINT = "https://api.openai.com/v1/chat/completions"
 # USE_MOCK_OPENAI = os.getenv("MOCK_OPENAI_MODE", "false").lower() == "true"
 USE_MOCK_OPENAI = bool(settings.MOCK_OPENAI_MODE)
 
+# Chain progress callback used by the streaming (SSE) endpoints
+EmitFn = Callable[[Dict[str, Any]], Awaitable[None]]
+
 class WebinarAIService:
     
     def __init__(self):
@@ -46,14 +70,12 @@ class WebinarAIService:
         pass
 
     async def _get_language_context(self, asset: WebinarAsset) -> dict:
-        """Helper to determine language and tone based on Mentor profile."""
-        from api.models import Mentor
+        """Helper to determine language and tone based on Mentor profile (cached per process)."""
+        from api.services.mentor_profile_cache import mentor_profile_cache
         
         language = "Norwegian"
         if asset.mentor_id:
-            mentor = await Mentor.find_one(Mentor.user_id == asset.mentor_id)
-            if mentor and hasattr(mentor, "language_tone") and mentor.language_tone:
-                language = mentor.language_tone
+            language = await mentor_profile_cache.language_tone(asset.mentor_id, default=language)
         
         if language.lower() == "english":
             return {
@@ -68,31 +90,37 @@ class WebinarAIService:
                 "system_prompt": WEBINAR_MASTER_OS_PROMPT_NORWEGIAN + "\n\nCRITICAL: Du MÅ svare på NORSK (Bokmål) bare. Ingen andre språk er tillatt."
             }
 
-    async def extract_text_from_file(self, file_bytes: bytes, filename: str) -> str:
+    async def extract_text_from_file(
+        self,
+        file_bytes: bytes,
+        filename: str,
+        progress: Optional[Callable[[int, int], Awaitable[None]]] = None
+    ) -> str:
+        """
+        Extract text from an uploaded file. PDFs are parsed across a process pool
+        (see api/services/pdf_extractor.py); `progress(pages_done, total_pages)`
+        is awaited as pages complete.
+        Results are cached by content hash, so re-uploads of a known file return instantly.
+        """
+        return await extraction_cache.get_or_extract(
+            file_bytes,
+            filename,
+            lambda: self._extract_text_uncached(file_bytes, filename, progress),
+            cacheable=lambda text: bool(text) and TIMEOUT_NOTE not in text,
+        )
+
+    async def _extract_text_uncached(
+        self,
+        file_bytes: bytes,
+        filename: str,
+        progress: Optional[Callable[[int, int], Awaitable[None]]] = None
+    ) -> str:
         try:
             print(f"[WebinarAI] Starting extraction for {filename} ({len(file_bytes)} bytes)")
             text = ""
             
             if filename.lower().endswith(".pdf"):
-                def _extract():
-                    reader = PdfReader(io.BytesIO(file_bytes))
-                    total_pages = len(reader.pages)
-                    print(f"[WebinarAI] PDF has {total_pages} pages")
-                    extracted_parts = []
-                    for i, page in enumerate(reader.pages):
-                        try:
-                            page_text = page.extract_text() or ""
-                            # Basic noise reduction: strip repetitive headers/footers (regex would be better but simple strip helps)
-                            cleaned_page = self._clean_extracted_text(page_text)
-                            extracted_parts.append(cleaned_page)
-                            
-                            if (i + 1) % 20 == 0 or i == total_pages - 1:
-                                print(f"[WebinarAI] Extracted through page {i+1}/{total_pages}")
-                        except Exception as page_err:
-                            print(f"[WebinarAI] Warning: Failed to extract page {i} of {filename}: {page_err}")
-                    return "\n\n".join(extracted_parts)
-
-                text = await asyncio.to_thread(_extract)
+                text = await pdf_extractor.extract(file_bytes, filename, progress=progress)
                 
                 # Validation: if text is too tiny compared to file size, it might be an image/scanned PDF
                 if len(text) < 100 and len(file_bytes) > 50000:
@@ -108,8 +136,13 @@ class WebinarAIService:
             
             elif filename.lower().endswith(".docx"):
                 import docx
-                doc = docx.Document(io.BytesIO(file_bytes))
-                return "\n".join([para.text for para in doc.paragraphs])
+
+                def _extract_docx():
+                    doc = docx.Document(io.BytesIO(file_bytes))
+                    return "\n".join([para.text for para in doc.paragraphs])
+
+                # Off the event loop so concurrent extractions of other files keep running
+                return await asyncio.to_thread(_extract_docx)
             
             return ""
         except Exception as e:
@@ -118,17 +151,6 @@ class WebinarAIService:
             traceback.print_exc()
             return ""
 
-    def _clean_extracted_text(self, text: str) -> str:
-        """Strip common PDF garbage, page numbers, and excessive whitespace."""
-        import re
-        # Remove common "Page X of Y" or "Page X" patterns
-        text = re.sub(r'(?i)page\s+\d+(\s+of\s+\d+)?', '', text)
-        # Remove strings of 3+ dots (common in TOCs)
-        text = re.sub(r'\.{3,}', ' ', text)
-        # Collapse multiple newlines
-        text = re.sub(r'\n{3,}', '\n\n', text)
-        return text.strip()
-
     async def create_asset(self, mentor_id: str, onboarding_doc: str, hook_analysis: str, file_bytes: Optional[bytes] = None, filename: Optional[str] = None) -> WebinarAsset:
         if file_bytes and filename:
             extracted = await self.extract_text_from_file(file_bytes, filename)
@@ -224,27 +246,53 @@ class WebinarAIService:
         ]
 
 
-    async def generate_content(self, prompt: str, system_prompt: str = WEBINAR_MASTER_OS_PROMPT_NORWEGIAN, max_tokens: int = 4096) -> str:
-        """Call OpenAI API using httpx (non-blocking). Raises ValueError on 429/quota/API errors."""
+    async def generate_content(self, prompt: str, system_prompt: str = WEBINAR_MASTER_OS_PROMPT_NORWEGIAN, max_tokens: Optional[int] = None, use_cache: bool = True, response_format: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Call OpenAI API via the shared pooled httpx client. Raises ValueError on 429/quota/API errors.
+        Identical requests are served from the LLM response cache unless use_cache=False.
+        Requests queue on the shared OpenAI rate limiter; 429s are retried there with backoff.
+        max_tokens (default LLM_DEFAULT_OUTPUT_TOKENS) is lowered to what the model window has
+        left after the prompt (token_budget).
+        response_format (see structured_output) makes the reply JSON matching a schema.
+        """
         if not OPENAI_API_KEY:
             raise ValueError("OPENAI API Error (no key): OPENAI_API_KEY not set")
+
+        model = "gpt-4o-mini"
+        temperature = 0.7
+        max_tokens = token_budget.max_output_tokens(system_prompt.strip(), prompt, max_tokens, model=model)
+        cache_key = None
+        if use_cache:
+            extra = {"response_format": response_format} if response_format else {}
+            cache_key = llm_cache.make_key(model, system_prompt.strip(), prompt, temperature, max_tokens, **extra)
+            cached = await llm_cache.get(cache_key)
+            if cached is not None:
+                print(f"[WebinarAI] LLM cache hit ({cache_key[:12]})")
+                return cached
+
         try:
             headers = {
                 "Authorization": f"Bearer {OPENAI_API_KEY}",
                 "Content-Type": "application/json"
             }
             payload = {
-                "model": "gpt-4o-mini",
+                "model": model,
                 "messages": [
                     {"role": "system", "content": system_prompt.strip()},
                     {"role": "user", "content": prompt}
                 ],
-                "temperature": 0.7,
+                "temperature": temperature,
                 "max_tokens": max_tokens
             }
+            if response_format:
+                payload["response_format"] = response_format
             
-            async with httpx.AsyncClient(timeout=180.0) as client:
-                response = await client.post(OPENAI_ENDPOINT, headers=headers, json=payload)
+            response = await openai_limiter.run(
+                "chat",
+                lambda: openai_http_client.post(OPENAI_ENDPOINT, headers=headers, json=payload),
+                tokens=token_budget.count_messages(system_prompt.strip(), prompt, model) + max_tokens,
+                usage=lambda r: r.json()["usage"]["total_tokens"],
+            )
             
             if response.status_code == 200:
                 data = response.json()
@@ -253,6 +301,9 @@ class WebinarAIService:
                     finish_reason = data["choices"][0].get("finish_reason", "")
                     if finish_reason == "length":
                         print(f"[WebinarAI] WARNING: Response was truncated.")
+                    elif cache_key:
+                        # Only complete responses are worth replaying
+                        await llm_cache.set(cache_key, content, model=model)
                     return content
                 raise ValueError("Unexpected response format from OpenAI")
             elif response.status_code == 429:
@@ -264,6 +315,123 @@ class WebinarAIService:
             print(f"AI Gen Error: {e}")
             raise ValueError(f"OpenAI operation failed: {e}") from e
 
+    async def stream_content(self, prompt: str, system_prompt: str = WEBINAR_MASTER_OS_PROMPT_NORWEGIAN, max_tokens: Optional[int] = None, use_cache: bool = True, response_format: Optional[Dict[str, Any]] = None) -> AsyncIterator[str]:
+        """
+        Same as generate_content, but yields token deltas as OpenAI produces them (stream=true).
+        A cache hit is yielded as a single chunk.
+        """
+        if not OPENAI_API_KEY:
+            raise ValueError("OPENAI API Error (no key): OPENAI_API_KEY not set")
+
+        model = "gpt-4o-mini"
+        temperature = 0.7
+        max_tokens = token_budget.max_output_tokens(system_prompt.strip(), prompt, max_tokens, model=model)
+        cache_key = None
+        if use_cache:
+            extra = {"response_format": response_format} if response_format else {}
+            cache_key = llm_cache.make_key(model, system_prompt.strip(), prompt, temperature, max_tokens, **extra)
+            cached = await llm_cache.get(cache_key)
+            if cached is not None:
+                print(f"[WebinarAI] LLM cache hit ({cache_key[:12]})")
+                yield cached
+                return
+
+        headers = {
+            "Authorization": f"Bearer {OPENAI_API_KEY}",
+            "Content-Type": "application/json"
+        }
+        payload = {
+            "model": model,
+            "messages": [
+                {"role": "system", "content": system_prompt.strip()},
+                {"role": "user", "content": prompt}
+            ],
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "stream": True,
+            # Final chunk carries the token usage, settled against the limiter reservation
+            "stream_options": {"include_usage": True}
+        }
+        if response_format:
+            payload["response_format"] = response_format
+
+        parts: List[str] = []
+        finish_reason = ""
+        used_tokens = None
+        reserve_tokens = token_budget.count_messages(system_prompt.strip(), prompt, model) + max_tokens
+        manager = None
+
+        async def _open():
+            nonlocal manager
+            manager = openai_http_client.stream("POST", OPENAI_ENDPOINT, headers=headers, json=payload)
+            response = await manager.__aenter__()
+            if response.status_code != 200:
+                # Read the error body now, so it can be inspected once the stream is closed
+                try:
+                    await response.aread()
+                finally:
+                    current, manager = manager, None
+                    await current.__aexit__(None, None, None)
+            return response
+
+        reservation = None
+        try:
+            # 429s are retried by the limiter while opening, before anything is yielded
+            response, reservation = await openai_limiter.run_reserved("chat", _open, reserve_tokens)
+            if response.status_code != 200:
+                body = response.text
+                if response.status_code == 429:
+                    raise ValueError(f"OpenAI 429: {body[:500] or 'Rate limit / quota exceeded'}")
+                raise ValueError(f"OpenAI API Error ({response.status_code}): {body[:500]}")
+
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[len("data:"):].strip()
+                if data == "[DONE]":
+                    break
+                chunk = json.loads(data)
+                if chunk.get("usage"):
+                    used_tokens = chunk["usage"].get("total_tokens")
+                choice = (chunk.get("choices") or [{}])[0]
+                delta = (choice.get("delta") or {}).get("content")
+                if choice.get("finish_reason"):
+                    finish_reason = choice["finish_reason"]
+                if delta:
+                    parts.append(delta)
+                    yield delta
+        except Exception as e:
+            print(f"AI Stream Error: {e}")
+            raise ValueError(f"OpenAI operation failed: {e}") from e
+        finally:
+            if manager is not None:
+                await manager.__aexit__(None, None, None)
+            if reservation is not None:
+                # No usage chunk (stream cut off): keep the whole reservation
+                reservation.settle(used_tokens)
+
+        if finish_reason == "length":
+            print(f"[WebinarAI] WARNING: Response was truncated.")
+        elif cache_key and parts:
+            await llm_cache.set(cache_key, "".join(parts), model=model)
+
+    async def _run_step(self, step: str, prompt: str, system_prompt: str, max_tokens: Optional[int] = None, use_cache: bool = True, emit: Optional[EmitFn] = None, response_format: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Run one chain step. Without `emit` this is a plain generate_content call;
+        with `emit` the tokens are streamed out as step_start / token / step_complete events.
+        """
+        if emit is None:
+            return await self.generate_content(prompt, system_prompt=system_prompt, max_tokens=max_tokens, use_cache=use_cache, response_format=response_format)
+
+        await emit({"event": "step_start", "step": step})
+        parts: List[str] = []
+        async for delta in self.stream_content(prompt, system_prompt=system_prompt, max_tokens=max_tokens, use_cache=use_cache, response_format=response_format):
+            parts.append(delta)
+            await emit({"event": "token", "step": step, "delta": delta})
+        text = "".join(parts)
+        await emit({"event": "step_complete", "step": step, "chars": len(text)})
+        return text
+
     def _get_mock_response(self, reason: str = "API error") -> dict:
         """Return mock concepts response dict (no DB)."""
         mock_concepts = self._get_mock_concepts()
@@ -296,17 +464,30 @@ class WebinarAIService:
             raise ValueError("Asset not found")
         return await self._apply_mock_concepts_and_return(asset, reason)
 
-    async def summarize_context(self, text: str, system_prompt: str) -> str:
-        """Summarize large text into a focused knowledge base for webinar generation."""
-        if not text or len(text) < 4000:
-            return text
-            
-        print(f"[WebinarAI] Summarizing large context ({len(text)} chars)...")
+    async def _map_reduce_summary(self, text: str, system_prompt: str, emit: Optional[EmitFn] = None) -> str:
+        """
+        Summarize large text into a focused knowledge base for webinar generation.
+        Text that doesn't fit one chunk (SUMMARY_CHUNK_TOKENS) is map-reduced: every
+        chunk is summarized in parallel, then the partial summaries are merged, so
+        nothing past the old 100k-char cut-off is dropped. Raises on failure.
+        """
+        print(f"[WebinarAI] Summarizing large context ({len(text)} chars, {token_budget.count(text)} tokens)...")
         
         # Detect language hint (rough check for Norwegian keywords)
         is_norwegian = any(w in text.lower() for w in [" og ", " er ", " som ", " på ", " det "])
         lang_instruction = "IMPORTANT: Respond in NORWEGIAN (Bokmål)." if is_norwegian else "IMPORTANT: Respond in ENGLISH."
         
+        chunks = self._split_into_chunks(text, settings.SUMMARY_CHUNK_TOKENS)
+        level = 0
+        # Map: condense chunks in parallel until everything fits one reduce call
+        while len(chunks) > 1 and level < 3:
+            level += 1
+            print(f"[WebinarAI] Map step {level}: summarizing {len(chunks)} chunks in parallel")
+            partials = await self._summarize_chunks(chunks, lang_instruction, system_prompt, level, emit=emit)
+            chunks = self._split_into_chunks("\n\n".join(partials), settings.SUMMARY_CHUNK_TOKENS)
+
+        # Reduce: one knowledge base from the (condensed) document
+        doc_content = "\n\n".join(chunks)
         summary_prompt = f"""
         # TASK: CONTEXT SUMMARIZATION FOR WEBINAR GENERATION
         The following text is from a mentor's onboarding documents/training materials.
@@ -323,22 +504,91 @@ class WebinarAIService:
         5. **IGNORE:** Ignore table of contents, legal footers, page numbers, and repetitive headers.
         
         **DOC CONTENT:**
-        \"\"\"{text[:100000]}\"\"\"
+        \"\"\"{doc_content}\"\"\"
         
         **OUTPUT FORMAT:**
         A structured, detailed summary (approx 2000-4000 words) that provides everything an AI would need to write three high-converting webinar concepts.
         """
+        # Use a slightly more creative temperature for summarization to keep tone, but keep it grounded
+        summary = await self._run_step("summarize", summary_prompt, system_prompt, max_tokens=4000, emit=emit)
+        print(f"[WebinarAI] Summary generated: {len(summary)} chars")
+        return summary
+
+    async def _summarize_chunks(
+        self,
+        chunks: List[str],
+        lang_instruction: str,
+        system_prompt: str,
+        level: int,
+        emit: Optional[EmitFn] = None
+    ) -> List[str]:
+        """Map step: summarize chunks concurrently (SUMMARY_MAP_CONCURRENCY), results in document order."""
+        semaphore = asyncio.Semaphore(max(1, settings.SUMMARY_MAP_CONCURRENCY))
+
+        async def _one(index: int, chunk: str) -> str:
+            chunk_prompt = f"""
+        # TASK: CONDENSE PART {index + 1} OF {len(chunks)} OF A MENTOR'S ONBOARDING MATERIAL
+        {lang_instruction}
+        
+        Keep everything a webinar writer could use: methods and frameworks (with their steps),
+        promised transformations, stories and client examples with their concrete details,
+        numbers, and the author's distinctive terms and phrasing.
+        Drop tables of contents, legal text, page furniture and repetition.
         
+        **PART CONTENT:**
+        \"\"\"{chunk}\"\"\"
+        
+        **OUTPUT FORMAT:**
+        Dense bullet notes (approx 400-800 words). No introduction or conclusion.
+        """
+            async with semaphore:
+                return await self._run_step(
+                    f"summarize:{level}.{index + 1}", chunk_prompt, system_prompt, max_tokens=1500, emit=emit
+                )
+
+        return list(await asyncio.gather(*[_one(i, c) for i, c in enumerate(chunks)]))
+
+    @staticmethod
+    def _split_into_chunks(text: str, max_tokens: int) -> List[str]:
+        """Split on paragraph boundaries into chunks of at most max_tokens tokens."""
+        return token_budget.split(text, max_tokens)
+
+    async def get_knowledge_base(self, asset: WebinarAsset, system_prompt: str, emit: Optional[EmitFn] = None) -> str:
+        """
+        Onboarding context for generation prompts: the raw document when small, otherwise
+        its summarized knowledge base. The summary is stored on the asset keyed by a hash
+        of the document (and system prompt), so regenerations reuse it.
+        """
+        raw_onboarding = asset.onboarding_doc_content or ""
+        if token_budget.count(raw_onboarding) <= settings.KNOWLEDGE_BASE_RAW_MAX_TOKENS:
+            return raw_onboarding
+
+        content_hash = hashlib.sha256(f"{system_prompt}\x00{raw_onboarding}".encode("utf-8")).hexdigest()
+        if asset.knowledge_base and asset.knowledge_base_hash == content_hash:
+            print(f"[WebinarAI] Reusing stored knowledge base for asset {asset.id}")
+            if emit is not None:
+                await emit({"event": "step_complete", "step": "summarize", "chars": len(asset.knowledge_base), "cached": True})
+            return asset.knowledge_base
+
         try:
-            # Use a slightly more creative temperature for summarization to keep tone, but keep it grounded
-            summary = await self.generate_content(summary_prompt, system_prompt=system_prompt, max_tokens=4000)
-            print(f"[WebinarAI] Summary generated: {len(summary)} chars")
-            return summary
+            knowledge_base = await self._map_reduce_summary(raw_onboarding, system_prompt, emit=emit)
         except Exception as e:
+            # Not stored: the next run retries the summary
             print(f"[WebinarAI] Warning: Summarization failed, fallback to truncation: {e}")
-            return text[:15000]
+            return token_budget.truncate(raw_onboarding, settings.KNOWLEDGE_BASE_FALLBACK_TOKENS)
+
+        await asset.set({
+            WebinarAsset.knowledge_base: knowledge_base,
+            WebinarAsset.knowledge_base_hash: content_hash,
+        })
+        return knowledge_base
 
-    async def generate_concepts_chain(self, asset_id: str) -> dict:
+    @with_priority(Priority.BATCH)
+    async def generate_concepts_chain(self, asset_id: str, emit: Optional[EmitFn] = None, mock_fallback: bool = True) -> dict:
+        """
+        Draft -> evaluate -> improve concepts for the asset. OpenAI errors give mock
+        concepts, unless mock_fallback=False (then they are raised, e.g. for a queue retry).
+        """
         print(f"DEBUG: generate_concepts_chain called for {asset_id}")
         print(f"DEBUG: USE_MOCK_OPENAI = {USE_MOCK_OPENAI}")
         
@@ -366,59 +616,58 @@ class WebinarAIService:
             sys_prompt = ctx["system_prompt"]
             
             # --- SMART CONTEXT MANAGEMENT ---
-            raw_onboarding = asset.onboarding_doc_content or ""
-            onboarding_context = raw_onboarding
-            
-            # If doc is huge, summarize it first
-            if len(raw_onboarding) > 12000:
-                onboarding_context = await self.summarize_context(raw_onboarding, sys_prompt)
+            # If doc is huge, summarize it first (stored on the asset and reused on regeneration)
+            onboarding_context = await self.get_knowledge_base(asset, sys_prompt, emit=emit)
             
             # 1. Generate (use higher max_tokens for 3 detailed concepts)
-            prompt_1 = CONCEPT_GENERATION_PROMPT.format(
-                onboarding_doc=onboarding_context, 
+            prompt_1 = token_budget.fit_template(
+                CONCEPT_GENERATION_PROMPT,
+                "onboarding_doc",
+                onboarding_context,
+                system_prompt=sys_prompt,
+                reserve_output=8000,
                 hook_analysis=asset.hook_analysis_content or "",
                 language=lang,
                 market_tone=tone
             )
-            concepts_text = await self.generate_content(prompt_1, system_prompt=sys_prompt, max_tokens=8000)
+            concepts_text = await self._run_step("draft", prompt_1, sys_prompt, max_tokens=8000, emit=emit, response_format=CONCEPT_LIST_FORMAT)
             print(f"[WebinarAI] Got concepts_text: {concepts_text[:200]}...")
             
-            parsed_concepts = self._parse_concepts_from_text(concepts_text)
+            parsed_concepts = parse_list(concepts_text, "concepts", Concept)
             print(f"[WebinarAI] Parsed {len(parsed_concepts)} original concepts")
-            
-            # VALIDATION: If generation returned < 3 concepts, retry once
             if len(parsed_concepts) < 3:
-                print(f"[WebinarAI] WARNING: Only {len(parsed_concepts)} concepts parsed from generation. Retrying...")
-                concepts_text_retry = await self.generate_content(prompt_1, system_prompt=sys_prompt, max_tokens=8000)
-                parsed_retry = self._parse_concepts_from_text(concepts_text_retry)
-                if len(parsed_retry) >= len(parsed_concepts):
-                    parsed_concepts = parsed_retry
-                    concepts_text = concepts_text_retry
-                    print(f"[WebinarAI] Retry yielded {len(parsed_concepts)} concepts")
+                print(f"[WebinarAI] WARNING: Only {len(parsed_concepts)} concepts returned by generation")
             
-            # 2. Evaluate
-            prompt_2 = CONCEPT_EVALUATION_PROMPT.format(concepts=concepts_text)
-            evaluation_text = await self.generate_content(prompt_2, system_prompt=sys_prompt)
-            asset.concepts_evaluated = evaluation_text
-            print(f"[WebinarAI] Got evaluation")
-            
-            # 3. Improve (use higher max_tokens for 3 detailed improved concepts)
-            prompt_3 = CONCEPT_IMPROVEMENT_PROMPT.format(
-                concepts=concepts_text,
-                evaluation=evaluation_text,
-                language=lang,
-                market_tone=tone
-            )
-            improved_text = await self.generate_content(prompt_3, system_prompt=sys_prompt, max_tokens=8000)
-            
-            improved_concepts = self._parse_concepts_from_text(improved_text)
-            print(f"[WebinarAI] Parsed {len(improved_concepts)} improved concepts")
-            
-            # VALIDATION: If improvement step returned fewer concepts than generation,
-            # use the original parsed concepts instead
-            if len(improved_concepts) < len(parsed_concepts):
-                print(f"[WebinarAI] WARNING: Improved concepts ({len(improved_concepts)}) < original ({len(parsed_concepts)}). Using originals as improved.")
-                improved_concepts = parsed_concepts
+            if settings.CONCEPT_PARALLEL_EVAL and parsed_concepts:
+                # 2+3. Evaluate and improve each concept concurrently
+                evaluation_text, improved_text, improved_concepts = await self._evaluate_and_improve_parallel(
+                    parsed_concepts, sys_prompt, lang, tone, emit=emit
+                )
+                asset.concepts_evaluated = evaluation_text
+            else:
+                # 2. Evaluate
+                prompt_2 = CONCEPT_EVALUATION_PROMPT.format(concepts=concepts_text)
+                evaluation_text = await self._run_step("evaluate", prompt_2, sys_prompt, emit=emit)
+                asset.concepts_evaluated = evaluation_text
+                print(f"[WebinarAI] Got evaluation")
+                
+                # 3. Improve (use higher max_tokens for 3 detailed improved concepts)
+                prompt_3 = CONCEPT_IMPROVEMENT_PROMPT.format(
+                    concepts=concepts_text,
+                    evaluation=evaluation_text,
+                    language=lang,
+                    market_tone=tone
+                )
+                improved_text = await self._run_step("improve", prompt_3, sys_prompt, max_tokens=8000, emit=emit, response_format=CONCEPT_LIST_FORMAT)
+                
+                improved_concepts = parse_list(improved_text, "concepts", Concept)
+                print(f"[WebinarAI] Parsed {len(improved_concepts)} improved concepts")
+                
+                # VALIDATION: If improvement step returned fewer concepts than generation,
+                # use the original parsed concepts instead
+                if len(improved_concepts) < len(parsed_concepts):
+                    print(f"[WebinarAI] WARNING: Improved concepts ({len(improved_concepts)}) < original ({len(parsed_concepts)}). Using originals as improved.")
+                    improved_concepts = parsed_concepts
             
             asset.concepts_improved = improved_concepts
             
@@ -426,6 +675,8 @@ class WebinarAIService:
             err_str = str(e).lower()
             reason = "429 quota" if "429" in err_str or "quota" in err_str else str(e)[:200]
             print(f"[WebinarAI] OpenAI API Error: {e}")
+            if not mock_fallback:
+                raise
             print(f"[WebinarAI] FALLING BACK TO MOCK CONCEPTS (reason: {reason})")
             return await self._apply_mock_concepts_and_return(asset, reason)
         
@@ -449,100 +700,71 @@ class WebinarAIService:
             "concepts_count": final_count
         }
 
-    def _parse_concepts_from_text(self, text: str) -> List[Concept]:
-        """Parse JSON concepts from AI response text. Tries multiple strategies."""
-        import re
-        
-        def _build_concepts(data: list) -> List[Concept]:
-            """Convert a list of dicts to Concept objects."""
-            concepts = []
-            for item in data:
-                if not isinstance(item, dict):
-                    continue
-                concept = Concept(
-                    title=item.get("title", "Untitled Concept"),
-                    big_idea=item.get("big_idea", ""),
-                    hook=item.get("hook", ""),
-                    structure_points=item.get("structure_points", []),
-                    secrets=item.get("secrets", []),
-                    mechanism=item.get("mechanism", ""),
-                    narrative_angle=item.get("narrative_angle", ""),
-                    offer_transition_logic=item.get("offer_transition_logic", ""),
-                    value_anchor=item.get("value_anchor", {}),
-                    bonus_ideas=item.get("bonus_ideas", []),
-                    cta_sentence=item.get("cta_sentence", ""),
-                    promises=item.get("promises", [])
+    async def _evaluate_and_improve_parallel(self, concepts: List[Concept], sys_prompt: str, lang: str, tone: str, emit: Optional[EmitFn] = None):
+        """
+        Fan out evaluate -> improve per concept with asyncio.gather under a concurrency limit.
+        A failed concept keeps its original version instead of failing the whole chain.
+        Returns (evaluation_text, improved_text, improved_concepts) in the original order.
+        """
+        semaphore = asyncio.Semaphore(max(1, settings.CONCEPT_PARALLEL_CONCURRENCY))
+
+        async def _one(index: int, concept: Concept) -> dict:
+            async with semaphore:
+                concept_json = json.dumps(concept.dict(), ensure_ascii=False, indent=2)
+                evaluation = await self._run_step(
+                    f"evaluate:{index + 1}",
+                    CONCEPT_SINGLE_EVALUATION_PROMPT.format(concept=concept_json),
+                    sys_prompt,
+                    max_tokens=2000,
+                    emit=emit
                 )
-                concepts.append(concept)
-            return concepts
-        
-        # Strategy 1: Find JSON array in text (standard case)
-        try:
-            json_match = re.search(r'\[\s*\{.*\}\s*\]', text, re.DOTALL)
-            if json_match:
-                json_str = json_match.group()
-                data = json.loads(json_str)
-                if isinstance(data, list) and len(data) > 0:
-                    concepts = _build_concepts(data)
-                    print(f"[WebinarAI] Strategy 1 (JSON array): Parsed {len(concepts)} concepts")
-                    return concepts
-        except json.JSONDecodeError as e:
-            print(f"[WebinarAI] Strategy 1 failed (JSON decode): {e}")
-        
-        # Strategy 2: Strip markdown code fences and try again
-        try:
-            cleaned = re.sub(r'```(?:json)?\s*', '', text)
-            cleaned = cleaned.strip()
-            if cleaned.startswith('['):
-                data = json.loads(cleaned)
-                if isinstance(data, list) and len(data) > 0:
-                    concepts = _build_concepts(data)
-                    print(f"[WebinarAI] Strategy 2 (stripped fences): Parsed {len(concepts)} concepts")
-                    return concepts
-        except json.JSONDecodeError as e:
-            print(f"[WebinarAI] Strategy 2 failed: {e}")
-        
-        # Strategy 3: Try to fix truncated JSON by finding all top-level objects
-        try:
-            # Find all complete JSON objects in the text
-            objects = []
-            depth = 0
-            start = None
-            for i, ch in enumerate(text):
-                if ch == '{' and depth == 0:
-                    start = i
-                if ch == '{':
-                    depth += 1
-                elif ch == '}':
-                    depth -= 1
-                    if depth == 0 and start is not None:
-                        obj_str = text[start:i+1]
-                        try:
-                            obj = json.loads(obj_str)
-                            if isinstance(obj, dict) and 'title' in obj:
-                                objects.append(obj)
-                        except json.JSONDecodeError:
-                            pass
-                        start = None
-            
-            if objects:
-                concepts = _build_concepts(objects)
-                print(f"[WebinarAI] Strategy 3 (individual objects): Parsed {len(concepts)} concepts")
-                return concepts
-        except Exception as e:
-            print(f"[WebinarAI] Strategy 3 failed: {e}")
-        
-        # No strategy worked
-        print(f"[WebinarAI] ALL parsing strategies failed. Text preview: {text[:300]}...")
-        return []
+                improved = await self._run_step(
+                    f"improve:{index + 1}",
+                    CONCEPT_SINGLE_IMPROVEMENT_PROMPT.format(
+                        concept=concept_json,
+                        evaluation=evaluation,
+                        language=lang,
+                        market_tone=tone
+                    ),
+                    sys_prompt,
+                    max_tokens=4000,
+                    emit=emit,
+                    response_format=CONCEPT_FORMAT
+                )
+            parsed = parse_object(improved, Concept)
+            if parsed is None:
+                raise ValueError("Improved concept could not be parsed")
+            print(f"[WebinarAI] Concept {index + 1} evaluated and improved")
+            return {"evaluation": evaluation, "improved": improved, "concept": parsed}
+
+        results = await asyncio.gather(
+            *[_one(idx, c) for idx, c in enumerate(concepts)],
+            return_exceptions=True
+        )
+
+        evaluations, improved_texts, improved_concepts = [], [], []
+        for idx, (original, result) in enumerate(zip(concepts, results)):
+            if isinstance(result, Exception):
+                print(f"[WebinarAI] WARNING: Concept {idx + 1} evaluate/improve failed, keeping original: {result}")
+                evaluations.append(f"## Concept {idx + 1}\n(Evaluation unavailable: {str(result)[:200]})")
+                improved_concepts.append(original)
+                continue
+            evaluations.append(f"## Concept {idx + 1}\n{result['evaluation']}")
+            improved_texts.append(result["improved"])
+            improved_concepts.append(result["concept"])
+
+        return "\n\n".join(evaluations), "\n\n".join(improved_texts), improved_concepts
 
     async def update_concept_with_transcript(self, asset_id: str, transcript: str) -> str:
         asset = await WebinarAsset.get(asset_id)
         # Use English Prompt
         ctx = await self._get_language_context(asset)
-        prompt = CONCEPT_TRANSCRIPT_UPDATE_PROMPT.format(
+        prompt = token_budget.fit_template(
+            CONCEPT_TRANSCRIPT_UPDATE_PROMPT,
+            "transcript",
+            transcript,
+            system_prompt=ctx["system_prompt"],
             current_concept=asset.concepts_evaluated,
-            transcript=transcript,
             language=ctx["language"]
         )
         return await self.generate_content(prompt, system_prompt=ctx["system_prompt"])
@@ -606,11 +828,10 @@ class WebinarAIService:
         
         ctx = await self._get_language_context(asset)
         
-        response_text = await self.generate_content(prompt, system_prompt=ctx["system_prompt"])
-        refined_data = self._parse_concepts_from_text(response_text)
+        response_text = await self.generate_content(prompt, system_prompt=ctx["system_prompt"], response_format=CONCEPT_FORMAT)
+        new_concept = parse_object(response_text, Concept)
         
-        if refined_data:
-            new_concept = refined_data[0]
+        if new_concept:
             # Replace in list
             source_list[index] = new_concept
             asset.updated_at = datetime.utcnow()
@@ -619,7 +840,8 @@ class WebinarAIService:
         
         raise ValueError("Failed to parse refined concept")
         
-    async def generate_structure(self, asset_id: str, concept_text: str) -> str:
+    @with_priority(Priority.BATCH)
+    async def generate_structure(self, asset_id: str, concept_text: str, emit: Optional[EmitFn] = None) -> str:
         asset = await WebinarAsset.get(asset_id)
         if not asset:
             raise ValueError("Asset not found")
@@ -641,11 +863,11 @@ class WebinarAIService:
             language=lang,
             market_tone=tone
         )
-        structure_text = await self.generate_content(prompt_1, system_prompt=sys_prompt)
+        structure_text = await self._run_step("draft", prompt_1, sys_prompt, emit=emit, response_format=SLIDE_LIST_FORMAT)
         
         # 2. Evaluate
         prompt_2 = STRUCTURE_EVALUATION_PROMPT.format(structure=structure_text)
-        evaluation_text = await self.generate_content(prompt_2, system_prompt=sys_prompt)
+        evaluation_text = await self._run_step("evaluate", prompt_2, sys_prompt, emit=emit)
         
         # 3. Improve
         prompt_3 = STRUCTURE_IMPROVEMENT_PROMPT.format(
@@ -654,14 +876,34 @@ class WebinarAIService:
             language=lang,
             market_tone=tone
         )
-        improved_structure = await self.generate_content(prompt_3, system_prompt=sys_prompt)
+        improved_text = await self._run_step("improve", prompt_3, sys_prompt, emit=emit, response_format=SLIDE_LIST_FORMAT)
         
+        slides = parse_list(improved_text, "slides", Slide) or parse_list(structure_text, "slides", Slide)
+        print(f"[WebinarAI] Structure has {len(slides)} slides")
+        improved_structure = self._render_structure(slides) if slides else improved_text
+        asset.structure = slides
         asset.structure_content = improved_structure
         await asset.save()
         
         return improved_structure
 
-    async def generate_email_plan(self, asset_id: str, structure_text: str, product_details: str) -> str:
+    @staticmethod
+    def _render_structure(slides: List[Slide]) -> str:
+        """Readable outline grouped by section (structure_content feeds video scripts and email prompts)."""
+        lines: List[str] = []
+        section = None
+        for slide in slides:
+            if slide.section != section:
+                section = slide.section
+                lines.append(f"\n# {section}")
+            line = f"Slide {slide.slide_number}: {slide.title} - {slide.description}"
+            if slide.visual_visual:
+                line += f" (Visual: {slide.visual_visual})"
+            lines.append(line)
+        return "\n".join(lines).strip()
+
+    @with_priority(Priority.BATCH)
+    async def generate_email_plan(self, asset_id: str, structure_text: str, product_details: str, emit: Optional[EmitFn] = None) -> str:
         from api.models import EmailPlan, EmailDraft
         asset = await WebinarAsset.get(asset_id)
         if not asset:
@@ -711,17 +953,41 @@ class WebinarAIService:
             product_details=product_details or "",
             language=lang
         )
-        strategy_text = await self.generate_content(prompt_1, system_prompt=sys_prompt)
+        strategy_text = await self._run_step("strategy", prompt_1, sys_prompt, emit=emit, response_format=EMAIL_STRATEGY_FORMAT)
+        strategy = load_object(strategy_text)
+        timeline = strategy.get("timeline") or []
+        strategy_notes = strategy.get("strategy_notes") or ""
+        print(f"[WebinarAI] Strategy generated ({len(timeline)} emails planned)")
+
+        # Save the strategy right away; emails are added as they finish
         asset.email_plan_content = strategy_text
-        print(f"[WebinarAI] Strategy generated")
+        asset.email_plan = EmailPlan(timeline=timeline, emails=[], strategy_notes=strategy_notes)
+        await asset.save()
+
+        if settings.EMAIL_PARALLEL_CHAIN and timeline:
+            # 2-4. Draft -> evaluate -> improve every email concurrently
+            concept = asset.selected_concept.big_idea if asset.selected_concept else ""
+            email_drafts = await self._email_chains_parallel(
+                asset, timeline, strategy_notes, concept, sys_prompt, lang, tone, emit=emit
+            )
+        else:
+            email_drafts = await self._email_sequence_chain(strategy_text, sys_prompt, lang, tone, emit=emit)
+        print(f"[WebinarAI] {len(email_drafts)} emails in plan")
 
+        asset.email_plan = EmailPlan(timeline=timeline, emails=email_drafts, strategy_notes=strategy_notes)
+        asset.updated_at = datetime.utcnow()
+        await asset.save()
+        return strategy_text
+
+    async def _email_sequence_chain(self, strategy_text: str, sys_prompt: str, lang: str, tone: str, emit: Optional[EmitFn] = None) -> List[EmailDraft]:
+        """Draft, evaluate and improve the whole sequence in one call per step."""
         # 2. Generate Drafts
         prompt_2 = EMAIL_GENERATION_PROMPT.format(
             strategy=strategy_text,
             language=lang,
             market_tone=tone
         )
-        drafts_text = await self.generate_content(prompt_2, system_prompt=sys_prompt)
+        drafts_text = await self._run_step("draft", prompt_2, sys_prompt, emit=emit, response_format=EMAIL_LIST_FORMAT)
         print(f"[WebinarAI] Drafts generated")
 
         # 3. Evaluate
@@ -729,7 +995,7 @@ class WebinarAIService:
             emails=drafts_text,
             market_tone=tone
         )
-        evaluation_text = await self.generate_content(prompt_3, system_prompt=sys_prompt)
+        evaluation_text = await self._run_step("evaluate", prompt_3, sys_prompt, emit=emit)
         print(f"[WebinarAI] Evaluation complete")
 
         # 4. Improve
@@ -739,77 +1005,153 @@ class WebinarAIService:
             language=lang,
             market_tone=tone
         )
-        improved_text = await self.generate_content(prompt_4, system_prompt=sys_prompt)
+        improved_text = await self._run_step("improve", prompt_4, sys_prompt, emit=emit, response_format=EMAIL_LIST_FORMAT)
         print(f"[WebinarAI] Improvement complete")
 
-        # Parse Final Emails
-        try:
-            import re
-            json_match = re.search(r'\[\s*\{.*\}\s*\]', improved_text, re.DOTALL)
-            if json_match:
-                improved_data = json.loads(json_match.group())
-                
-                email_drafts = []
-                for idx, item in enumerate(improved_data):
-                    email_drafts.append(EmailDraft(
-                        order=idx + 1,
-                        subject=item.get("subject", "No Subject"),
-                        preview_text=item.get("preview_text", ""), # or fallback
-                        body=item.get("body", ""),
-                        send_timing=item.get("timing", "TBD"),
-                        purpose=item.get("goal", ""), # or 'type'
-                        segment=item.get("type", "General")
-                    ))
-                
-                asset.email_plan = EmailPlan(
-                    timeline=[], # Optional
-                    emails=email_drafts,
-                    strategy_notes=strategy_text[:1000]
+        # The drafts if the improved reply came back unusable
+        return parse_list(improved_text, "emails", EmailDraft) or parse_list(drafts_text, "emails", EmailDraft)
+
+    async def _email_chains_parallel(
+        self,
+        asset: WebinarAsset,
+        timeline: List[Dict[str, Any]],
+        strategy_notes: str,
+        concept: str,
+        sys_prompt: str,
+        lang: str,
+        tone: str,
+        emit: Optional[EmitFn] = None
+    ) -> List[EmailDraft]:
+        """
+        Run draft -> evaluate -> improve per planned email with asyncio.gather under
+        EMAIL_PARALLEL_CONCURRENCY. Each finished email is written to the asset right away
+        (email_plan.emails, in sequence order), so a failure late in the run keeps the rest.
+        An email whose draft fails is left out.
+        """
+        semaphore = asyncio.Semaphore(max(1, settings.EMAIL_PARALLEL_CONCURRENCY))
+        persist_lock = asyncio.Lock()
+        finished: Dict[int, EmailDraft] = {}
+
+        async def _persist() -> None:
+            async with persist_lock:
+                emails = [finished[i].dict() for i in sorted(finished)]
+                await WebinarAsset.get_motor_collection().update_one(
+                    {"_id": asset.id},
+                    {"$set": {"email_plan.emails": emails, "updated_at": datetime.utcnow()}}
                 )
-                print(f"[WebinarAI] Parsed {len(email_drafts)} emails into plan")
-        except Exception as parse_err:
-            print(f"[WebinarAI] Error parsing improved emails: {parse_err}")
 
-        await asset.save()
-        return strategy_text
+        async def _one(index: int, outline: Dict[str, Any]) -> EmailDraft:
+            async with semaphore:
+                result = await self._run_email_chain(
+                    json.dumps(outline, ensure_ascii=False, indent=2),
+                    strategy_notes,
+                    concept,
+                    sys_prompt,
+                    lang,
+                    tone,
+                    step_suffix=f":{index + 1}",
+                    emit=emit
+                )
+            if result["email"] is None:
+                raise ValueError("Email could not be parsed")
+            finished[index] = result["email"]
+            try:
+                await _persist()
+            except Exception as e:
+                print(f"[WebinarAI] WARNING: Could not save email {index + 1} yet: {e}")
+            print(f"[WebinarAI] Email {index + 1}/{len(timeline)} done")
+            if emit is not None:
+                await emit({"event": "email_complete", "index": index + 1, "total": len(timeline)})
+            return result["email"]
+
+        results = await asyncio.gather(
+            *[_one(idx, outline) for idx, outline in enumerate(timeline)],
+            return_exceptions=True
+        )
+
+        emails: List[EmailDraft] = []
+        for idx, result in enumerate(results):
+            if isinstance(result, Exception):
+                print(f"[WebinarAI] WARNING: Email {idx + 1} failed, left out of the plan: {result}")
+                continue
+            emails.append(result)
+        return emails
+
+    async def _run_email_chain(
+        self,
+        outline: str,
+        strategy: str,
+        concept: str,
+        sys_prompt: str,
+        lang: str,
+        tone: str,
+        step_suffix: str = "",
+        emit: Optional[EmitFn] = None
+    ) -> dict:
+        """
+        Draft -> evaluate -> improve for one email. If evaluate/improve fails the draft is kept.
+        Returns the raw texts plus the parsed EmailDraft ("email", None if unparseable).
+        """
+        draft_text = await self._run_step(
+            f"draft{step_suffix}",
+            EMAIL_SINGLE_GENERATION_PROMPT.format(
+                concept=concept,
+                strategy=strategy,
+                outline=outline,
+                language=lang,
+                market_tone=tone
+            ),
+            sys_prompt,
+            emit=emit,
+            response_format=EMAIL_FORMAT
+        )
+        try:
+            evaluation_text = await self._run_step(
+                f"evaluate{step_suffix}",
+                EMAIL_SINGLE_EVALUATION_PROMPT.format(email=draft_text, market_tone=tone),
+                sys_prompt,
+                emit=emit
+            )
+            final_text = await self._run_step(
+                f"improve{step_suffix}",
+                EMAIL_SINGLE_IMPROVEMENT_PROMPT.format(
+                    email=draft_text,
+                    evaluation=evaluation_text,
+                    language=lang,
+                    market_tone=tone
+                ),
+                sys_prompt,
+                emit=emit,
+                response_format=EMAIL_FORMAT
+            )
+        except Exception as e:
+            print(f"[WebinarAI] WARNING: Email evaluate/improve{step_suffix} failed, keeping draft: {e}")
+            evaluation_text, final_text = "", draft_text
+
+        return {
+            "draft": draft_text,
+            "evaluation": evaluation_text,
+            "final_email": final_text,
+            "email": parse_object(final_text, EmailDraft) or parse_object(draft_text, EmailDraft)
+        }
 
     async def generate_single_email_chain(self, email_outline: str, concept_context: str) -> dict:
         """
         Generates a single email with the 3-step loop (Draft -> Eval -> Improve).
         This is the core "Machine Learning" loop for Email Production.
         """
-        # 1. Draft
-        prompt_1 = EMAIL_GENERATION_PROMPT.format(
-            strategy=email_outline,
-            language="Norwegian (Bokmål)", # Default or pass context if available
-            market_tone="Professionl" # Typo but ok for now, or fetch context
+        result = await self._run_email_chain(
+            email_outline,
+            "",
+            concept_context,
+            WEBINAR_MASTER_OS_PROMPT_NORWEGIAN,
+            "Norwegian (Bokmål)",
+            "Professional"
         )
-        # TODO: pass context here properly later
-        print("   -> Drafting Email...")
-        draft_text = await self.generate_content(prompt_1)
-        
-        # 2. Evaluate
-        prompt_2 = EMAIL_EVALUATION_PROMPT.format(
-            emails=draft_text,
-            market_tone="Professional"
-        )
-        print("   -> Self-Evaluating Email...")
-        evaluation_text = await self.generate_content(prompt_2)
-        
-        # 3. Improve
-        prompt_3 = EMAIL_IMPROVEMENT_PROMPT.format(
-            emails=draft_text,
-            evaluation=evaluation_text,
-            language="Norwegian (Bokmål)",
-            market_tone="Professional"
-        )
-        print("   -> Improving Email...")
-        final_email_text = await self.generate_content(prompt_3)
-        
         return {
-            "draft": draft_text,
-            "evaluation": evaluation_text,
-            "final_email": final_email_text
+            "draft": result["draft"],
+            "evaluation": result["evaluation"],
+            "final_email": result["final_email"]
         }
 
 webinar_ai_service = WebinarAIService()
@@ -0,0 +1,235 @@
+"""
+Shared pooled HTTP client.
+
+One httpx.AsyncClient per process (per upstream) so repeated calls reuse
+keep-alive connections instead of paying a new TLS handshake every time.
+Lifecycle is tied to FastAPI startup/shutdown in main.py.
+"""
+import asyncio
+import random
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+import httpx
+
+from core.settings import settings
+
+
+# Upstream responses worth retrying (rate limited / transient server errors)
+RETRY_STATUSES: Tuple[int, ...] = (429, 500, 502, 503, 504)
+
+# Methods that can be sent twice without creating anything twice
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+# Transport errors raised before the request reached the server
+UNSENT_ERRORS: Tuple[type, ...] = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+def _http2_available() -> bool:
+    """HTTP/2 needs the optional `h2` package (httpx[http2])."""
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+class PooledHttpClient:
+    """
+    Lazily-created, process-wide httpx.AsyncClient with latency metrics.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        timeout: float,
+        max_connections: int,
+        max_keepalive_connections: int,
+        http2: bool = True,
+    ) -> None:
+        self.name = name
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.http2 = http2
+        self._client: Optional[httpx.AsyncClient] = None
+        self._http2_active = False
+
+        # Metrics
+        self._calls = 0
+        self._errors = 0
+        self._retries = 0
+        self._total_latency = 0.0
+        self._max_latency = 0.0
+        self._recent = deque(maxlen=200)
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._http2_active = self.http2 and _http2_available()
+            if self.http2 and not self._http2_active:
+                print(f"[HttpClient:{self.name}] WARNING: h2 not installed, falling back to HTTP/1.1")
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                http2=self._http2_active,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_keepalive_connections,
+                ),
+            )
+        return self._client
+
+    async def start(self) -> None:
+        """Create the client eagerly (called on app startup)."""
+        _ = self.client
+        print(f"[HttpClient:{self.name}] Started (max_connections={self.max_connections}, http2={self._http2_active})")
+
+    async def close(self) -> None:
+        """Close the client and release pooled connections (called on app shutdown)."""
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+            print(f"[HttpClient:{self.name}] Closed")
+        self._client = None
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """Send a request through the pooled client and record its latency."""
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        except Exception:
+            self._errors += 1
+            self._record(time.perf_counter() - started)
+            raise
+        self._record(time.perf_counter() - started)
+        return response
+
+    async def request_with_retry(
+        self,
+        method: str,
+        url: str,
+        retries: int = 3,
+        backoff_base: float = 1.0,
+        retry_statuses: Tuple[int, ...] = RETRY_STATUSES,
+        idempotent: Optional[bool] = None,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """
+        request() with exponential backoff + jitter on 429/5xx and transport errors.
+        Honours a numeric Retry-After header. The last response is returned as-is
+        (callers still call raise_for_status()).
+
+        Non-idempotent requests (POST/PATCH unless idempotent=True) may already have
+        been acted on after a 5xx or a read timeout, so they are only retried on 429
+        and on connection errors raised before the request was sent.
+        """
+        if idempotent is None:
+            idempotent = method.upper() in IDEMPOTENT_METHODS
+        if not idempotent:
+            retry_statuses = tuple(s for s in retry_statuses if s == 429)
+        retry_errors = (httpx.TimeoutException, httpx.TransportError) if idempotent else UNSENT_ERRORS
+
+        for attempt in range(retries + 1):
+            try:
+                response = await self.request(method, url, **kwargs)
+            except retry_errors as e:
+                if attempt >= retries:
+                    raise
+                delay = backoff_base * (2 ** attempt) + random.uniform(0, backoff_base)
+                print(f"[HttpClient:{self.name}] {method} {url} failed ({e.__class__.__name__}), retry {attempt + 1}/{retries} in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                continue
+
+            if response.status_code not in retry_statuses or attempt >= retries:
+                return response
+
+            delay = backoff_base * (2 ** attempt) + random.uniform(0, backoff_base)
+            retry_after = response.headers.get("retry-after")
+            if retry_after and retry_after.isdigit():
+                delay = max(delay, float(retry_after))
+            self._retries += 1
+            print(f"[HttpClient:{self.name}] {method} {url} -> HTTP {response.status_code}, retry {attempt + 1}/{retries} in {delay:.1f}s")
+            await asyncio.sleep(delay)
+        return response
+
+    @asynccontextmanager
+    async def stream(self, method: str, url: str, **kwargs: Any) -> AsyncIterator[httpx.Response]:
+        """Streaming request through the pooled client. Latency is recorded up to the response headers."""
+        started = time.perf_counter()
+        try:
+            async with self.client.stream(method, url, **kwargs) as response:
+                self._record(time.perf_counter() - started)
+                yield response
+        except Exception:
+            self._errors += 1
+            raise
+
+    async def post(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    def _record(self, elapsed: float) -> None:
+        self._calls += 1
+        self._total_latency += elapsed
+        self._max_latency = max(self._max_latency, elapsed)
+        self._recent.append(elapsed)
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-call latency metrics (seconds)."""
+        recent = sorted(self._recent)
+
+        def _pct(p: float) -> Optional[float]:
+            if not recent:
+                return None
+            return round(recent[min(len(recent) - 1, int(p * len(recent)))], 3)
+
+        return {
+            "http2": self._http2_active,
+            "calls": self._calls,
+            "errors": self._errors,
+            "retries": self._retries,
+            "avg_latency": round(self._total_latency / self._calls, 3) if self._calls else None,
+            "max_latency": round(self._max_latency, 3) if self._calls else None,
+            "p50_latency": _pct(0.50),
+            "p95_latency": _pct(0.95),
+        }
+
+
+# Shared client for OpenAI chat completions
+openai_http_client = PooledHttpClient(
+    name="openai",
+    timeout=settings.OPENAI_HTTP_TIMEOUT,
+    max_connections=settings.OPENAI_HTTP_MAX_CONNECTIONS,
+    max_keepalive_connections=settings.OPENAI_HTTP_MAX_KEEPALIVE,
+    http2=settings.OPENAI_HTTP2,
+)
+
+# Shared client for the HeyGen video API
+heygen_http_client = PooledHttpClient(
+    name="heygen",
+    timeout=settings.HEYGEN_HTTP_TIMEOUT,
+    max_connections=settings.HEYGEN_HTTP_MAX_CONNECTIONS,
+    max_keepalive_connections=settings.HEYGEN_HTTP_MAX_KEEPALIVE,
+    http2=False,
+)
+
+# Shared client for the Gemini (Veo) API and video downloads
+gemini_http_client = PooledHttpClient(
+    name="gemini",
+    timeout=settings.GEMINI_HTTP_TIMEOUT,
+    max_connections=settings.GEMINI_HTTP_MAX_CONNECTIONS,
+    max_keepalive_connections=settings.GEMINI_HTTP_MAX_KEEPALIVE,
+    http2=False,
+)
+
+# Shared client for downloading rendered media (provider CDN URLs)
+media_http_client = PooledHttpClient(
+    name="media",
+    timeout=settings.MEDIA_HTTP_TIMEOUT,
+    max_connections=settings.MEDIA_HTTP_MAX_CONNECTIONS,
+    max_keepalive_connections=settings.MEDIA_HTTP_MAX_CONNECTIONS,
+    http2=False,
+)
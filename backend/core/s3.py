@@ -1,19 +1,85 @@
 
+import asyncio
+import bisect
 import boto3
+import inspect
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, AsyncIterator, Dict, List, Tuple
+from botocore.config import Config
 from botocore.exceptions import ClientError
 from core.settings import settings
-from starlette.concurrency import run_in_threadpool
+
+# Upper bounds (seconds) of the per-operation latency histogram buckets
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
 
 class S3Service:
+    """
+    boto3 is blocking, so every call runs on a dedicated bounded executor
+    (S3_MAX_WORKERS) instead of Starlette's shared threadpool, over a
+    connection pool sized by S3_MAX_POOL_CONNECTIONS.
+    """
+
     def __init__(self):
         self.s3_client = boto3.client(
             's3',
             aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
             aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-            region_name=settings.AWS_S3_REGION
+            region_name=settings.AWS_S3_REGION,
+            config=Config(
+                max_pool_connections=settings.S3_MAX_POOL_CONNECTIONS,
+                retries={"max_attempts": 5, "mode": "adaptive"},
+            ),
         )
         self.bucket_name = settings.AWS_S3_BUCKET_NAME
+        self._executor = ThreadPoolExecutor(max_workers=settings.S3_MAX_WORKERS, thread_name_prefix="s3")
+        # op -> [bucket counts..., +Inf count], total seconds, errors
+        self._histograms: Dict[str, List[int]] = {}
+        self._latency_sum: Dict[str, float] = {}
+        self._errors: Dict[str, int] = {}
+
+    async def _call(self, op, **kwargs):
+        """Run a boto3 client operation on the S3 executor and record its latency."""
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        try:
+            return await loop.run_in_executor(self._executor, partial(getattr(self.s3_client, op), **kwargs))
+        except Exception:
+            self._errors[op] = self._errors.get(op, 0) + 1
+            raise
+        finally:
+            self._record(op, time.perf_counter() - started)
+
+    def _record(self, op, elapsed):
+        buckets = self._histograms.setdefault(op, [0] * (len(LATENCY_BUCKETS) + 1))
+        buckets[bisect.bisect_left(LATENCY_BUCKETS, elapsed)] += 1
+        self._latency_sum[op] = self._latency_sum.get(op, 0.0) + elapsed
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-operation latency histograms (cumulative counts per upper bound, seconds)."""
+        ops = {}
+        for op, buckets in self._histograms.items():
+            count = sum(buckets)
+            cumulative, running = {}, 0
+            for bound, n in zip(list(LATENCY_BUCKETS) + ["+Inf"], buckets):
+                running += n
+                cumulative[str(bound)] = running
+            ops[op] = {
+                "count": count,
+                "errors": self._errors.get(op, 0),
+                "avg_latency": round(self._latency_sum[op] / count, 3) if count else None,
+                "buckets": cumulative,
+            }
+        return {
+            "max_workers": settings.S3_MAX_WORKERS,
+            "max_pool_connections": settings.S3_MAX_POOL_CONNECTIONS,
+            "operations": ops,
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
 
     async def upload_file(self, file_content, file_name, content_type):
         """
@@ -23,8 +89,8 @@ class S3Service:
             # Generate a unique path in S3: onboarding-docs/{filename}
             s3_path = f"onboarding-docs/{file_name}"
             
-            await run_in_threadpool(
-                self.s3_client.put_object,
+            await self._call(
+                "put_object",
                 Bucket=self.bucket_name,
                 Key=s3_path,
                 Body=file_content,
@@ -32,15 +98,199 @@ class S3Service:
                 # ACL='public-read' # Commented out if bucket doesn't allow public ACLs
             )
             
-            # Construct the S3 URL
-            # Note: This assumes the bucket/object is publicly accessible. 
-            # If not, a presigned URL would be better, but for this task a persistent link is requested.
-            region_str = f".{settings.AWS_S3_REGION}" if settings.AWS_S3_REGION != "us-east-1" else ""
-            url = f"https://{self.bucket_name}.s3{region_str}.amazonaws.com/{s3_path}"
-            return url
+            return self._object_url(s3_path)
             
         except ClientError as e:
             print(f"Error uploading to S3: {e}")
             raise e
 
+    async def upload_stream(self, source, file_name, content_type):
+        """
+        Streams an upload to S3 and returns the public URL.
+        `source` is an async iterator of bytes or a file-like object with a
+        (sync or async) read(), e.g. FastAPI's UploadFile.
+        Bodies larger than one part go through a multipart upload with up to
+        S3_MULTIPART_CONCURRENCY parts in flight, so memory stays bounded at
+        roughly (S3_MULTIPART_CONCURRENCY + 1) * S3_MULTIPART_PART_SIZE.
+        """
+        s3_path = f"onboarding-docs/{file_name}"
+        part_size = max(settings.S3_MULTIPART_PART_SIZE, 5 * 1024 * 1024)  # S3 minimum part size
+        parts_iter = self._iter_parts(source, part_size).__aiter__()
+
+        try:
+            first = await parts_iter.__anext__()
+        except StopAsyncIteration:
+            first = b""
+        try:
+            second = await parts_iter.__anext__()
+        except StopAsyncIteration:
+            # Fits in a single part: a plain put_object is cheaper than a multipart upload
+            return await self.upload_file(first, file_name, content_type)
+
+        upload = await self._call(
+            "create_multipart_upload",
+            Bucket=self.bucket_name,
+            Key=s3_path,
+            ContentType=content_type,
+        )
+        upload_id = upload["UploadId"]
+        slots = asyncio.Semaphore(max(1, settings.S3_MULTIPART_CONCURRENCY))
+        tasks = []
+
+        async def _upload_part(part_number: int, body: bytes):
+            try:
+                result = await self._call(
+                    "upload_part",
+                    Bucket=self.bucket_name,
+                    Key=s3_path,
+                    UploadId=upload_id,
+                    PartNumber=part_number,
+                    Body=body,
+                )
+                return {"PartNumber": part_number, "ETag": result["ETag"]}
+            finally:
+                slots.release()
+
+        async def _submit(part_number: int, body: bytes):
+            await slots.acquire()
+            tasks.append(asyncio.create_task(_upload_part(part_number, body)))
+
+        try:
+            await _submit(1, first)
+            await _submit(2, second)
+            part_number = 2
+            async for body in parts_iter:
+                part_number += 1
+                await _submit(part_number, body)
+                # Fail fast instead of reading the rest of the source after a part failed
+                for task in tasks:
+                    if task.done() and task.exception():
+                        raise task.exception()
+
+            parts = await asyncio.gather(*tasks)
+            await self._call(
+                "complete_multipart_upload",
+                Bucket=self.bucket_name,
+                Key=s3_path,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": sorted(parts, key=lambda p: p["PartNumber"])},
+            )
+            return self._object_url(s3_path)
+
+        except BaseException as e:
+            print(f"Error streaming upload to S3, aborting multipart upload: {e}")
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            try:
+                await self._call(
+                    "abort_multipart_upload",
+                    Bucket=self.bucket_name,
+                    Key=s3_path,
+                    UploadId=upload_id,
+                )
+            except ClientError as abort_error:
+                print(f"Error aborting S3 multipart upload {upload_id}: {abort_error}")
+            raise
+
+    async def _iter_parts(self, source, part_size) -> AsyncIterator[bytes]:
+        """Re-chunk an async iterator or file-like source into part_size blocks (last may be shorter)."""
+        if hasattr(source, "read"):
+            while True:
+                if inspect.iscoroutinefunction(source.read):
+                    data = await source.read(part_size)
+                else:
+                    # Blocking file objects are read on the S3 executor
+                    data = await asyncio.get_running_loop().run_in_executor(self._executor, source.read, part_size)
+                if not data:
+                    return
+                yield data
+        else:
+            buffer = bytearray()
+            async for chunk in source:
+                buffer.extend(chunk)
+                while len(buffer) >= part_size:
+                    yield bytes(buffer[:part_size])
+                    del buffer[:part_size]
+            if buffer:
+                yield bytes(buffer)
+
+    async def upload_many(self, items: List[Tuple[Any, str, str]], concurrency=None) -> List[str]:
+        """
+        Upload several (file_content, file_name, content_type) items concurrently.
+        Returns URLs in input order; raises the first error.
+        """
+        slots = asyncio.Semaphore(concurrency or settings.S3_BATCH_CONCURRENCY)
+
+        async def _one(file_content, file_name, content_type):
+            async with slots:
+                return await self.upload_file(file_content, file_name, content_type)
+
+        return list(await asyncio.gather(*(_one(*item) for item in items)))
+
+    async def delete_many(self, file_names: List[str]) -> List[str]:
+        """
+        Delete objects uploaded under `file_names` with DeleteObjects (1000 keys per request).
+        Returns the names that failed to delete.
+        """
+        failed = []
+        for start in range(0, len(file_names), 1000):
+            batch = file_names[start:start + 1000]
+            result = await self._call(
+                "delete_objects",
+                Bucket=self.bucket_name,
+                Delete={"Objects": [{"Key": f"onboarding-docs/{name}"} for name in batch], "Quiet": True},
+            )
+            for error in result.get("Errors", []):
+                print(f"Error deleting from S3: {error.get('Key')}: {error.get('Message')}")
+                failed.append(error.get("Key", "").replace("onboarding-docs/", "", 1))
+        return failed
+
+    def create_presigned_upload(self, file_name, content_type, expires_in=None):
+        """
+        Presigned POST for direct browser-to-S3 uploads (the API never sees the bytes).
+        The browser sends a multipart/form-data POST to `url` with `fields` plus the file.
+        """
+        s3_path = f"onboarding-docs/{file_name}"
+        presigned = self.s3_client.generate_presigned_post(
+            Bucket=self.bucket_name,
+            Key=s3_path,
+            Fields={"Content-Type": content_type},
+            Conditions=[
+                {"Content-Type": content_type},
+                ["content-length-range", 1, settings.S3_PRESIGNED_MAX_BYTES],
+            ],
+            ExpiresIn=expires_in or settings.S3_PRESIGNED_EXPIRES_SECONDS,
+        )
+        return {
+            "url": presigned["url"],
+            "fields": presigned["fields"],
+            "key": s3_path,
+            "s3_url": self._object_url(s3_path),
+        }
+
+    async def head_object(self, file_name):
+        """Metadata of an uploaded object, or None if it doesn't exist."""
+        try:
+            return await self._call(
+                "head_object",
+                Bucket=self.bucket_name,
+                Key=f"onboarding-docs/{file_name}",
+            )
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise
+
+    def public_url(self, file_name):
+        """URL of an object uploaded under `file_name` (same layout as upload_file)."""
+        return self._object_url(f"onboarding-docs/{file_name}")
+
+    def _object_url(self, s3_path):
+        # Construct the S3 URL
+        # Note: This assumes the bucket/object is publicly accessible. 
+        # If not, a presigned URL would be better, but for this task a persistent link is requested.
+        region_str = f".{settings.AWS_S3_REGION}" if settings.AWS_S3_REGION != "us-east-1" else ""
+        return f"https://{self.bucket_name}.s3{region_str}.amazonaws.com/{s3_path}"
+
 s3_service = S3Service()
@@ -1,6 +1,6 @@
 import os
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import Dict, List
 
 class Settings(BaseSettings):
     PROJECT_NAME: str = "Change 2.0 Webinar Agent"
@@ -13,14 +13,91 @@ class Settings(BaseSettings):
     OPENAI_API_KEY: str = ""
     MOCK_OPENAI_MODE: bool = False
     MOCK_IMAGE_MODE: bool = False
+    # Shared pooled HTTP client for OpenAI (see core/http_client.py)
+    OPENAI_HTTP_TIMEOUT: float = 180.0
+    OPENAI_HTTP_MAX_CONNECTIONS: int = 50
+    OPENAI_HTTP_MAX_KEEPALIVE: int = 20
+    OPENAI_HTTP2: bool = True
+    # Concept chain: evaluate/improve each concept in parallel instead of one big call
+    CONCEPT_PARALLEL_EVAL: bool = True
+    CONCEPT_PARALLEL_CONCURRENCY: int = 3
+    # Email chain: draft/evaluate/improve each email of the sequence in parallel after the strategy step
+    EMAIL_PARALLEL_CHAIN: bool = True
+    EMAIL_PARALLEL_CONCURRENCY: int = 5
+    # Batch promotional images: DALL-E calls in flight per request (paced by the OpenAI limiter)
+    IMAGE_BATCH_CONCURRENCY: int = 6
+    # Map-reduce summarization of large onboarding documents
+    SUMMARY_CHUNK_TOKENS: int = 6000
+    SUMMARY_MAP_CONCURRENCY: int = 4
+    # Token budgeting with tiktoken (api/services/token_budget.py)
+    LLM_CONTEXT_WINDOW_TOKENS: int = 128000  # For models missing from token_budget.MODEL_LIMITS
+    LLM_MAX_OUTPUT_TOKENS: int = 16384
+    LLM_DEFAULT_OUTPUT_TOKENS: int = 4096  # max_tokens when a call doesn't ask for more
+    LLM_RESERVED_OUTPUT_TOKENS: int = 8000  # Kept free for the answer when fitting context into a prompt
+    LLM_MIN_OUTPUT_TOKENS: int = 512  # Fail fast when less than this would be left for the answer
+    LLM_PROMPT_SAFETY_MARGIN_TOKENS: int = 256
+    KNOWLEDGE_BASE_RAW_MAX_TOKENS: int = 3000  # Larger onboarding docs are summarized first
+    KNOWLEDGE_BASE_FALLBACK_TOKENS: int = 4000  # Truncation when summarization fails
+    TOKEN_COUNT_CACHE_SIZE: int = 1024
+    TOKEN_COUNT_CACHE_MAX_CHARS: int = 50000  # Longer texts are counted without memoizing
+    # OpenAI rate limiter shared by every OpenAI call (api/services/openai_limiter.py)
+    OPENAI_RATE_LIMIT_ENABLED: bool = True
+    OPENAI_RATE_LIMIT_SHARED: bool = False  # Also count per-minute usage in Mongo across processes
+    OPENAI_RPM: int = 500
+    OPENAI_TPM: int = 200000
+    OPENAI_IMAGES_PER_MINUTE: int = 50
+    OPENAI_TTS_RPM: int = 50
+    OPENAI_MAX_RETRIES: int = 4  # Retries on 429 (jittered exponential backoff)
+    OPENAI_RETRY_BASE_SECONDS: float = 2.0
+    # Per-process cache of mentor prompt fields (api/services/mentor_profile_cache.py)
+    MENTOR_CACHE_ENABLED: bool = True
+    MENTOR_CACHE_TTL_SECONDS: int = 120  # Bounds staleness in processes that don't see the PATCH
+    MENTOR_CACHE_MAX_ENTRIES: int = 1024
+    # LLM response cache (Mongo + in-process hot tier)
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_TTL_SECONDS: int = 7 * 24 * 3600
+    LLM_CACHE_HOT_ENTRIES: int = 256
+    LLM_CACHE_MAX_ENTRIES: int = 5000
+    # Durable job queue (WebinarProcessingJob). Run workers with `python worker.py`.
+    JOB_QUEUE_ENABLED: bool = True
+    RUN_EMBEDDED_JOB_WORKER: bool = True  # Also run a worker inside the API process (single-process dev)
+    JOB_CONCURRENCY: Dict[str, int] = {"multi_upload": 2}
+    JOB_LEASE_SECONDS: int = 120
+    JOB_RETRY_BASE_SECONDS: int = 15
+    JOB_POLL_INTERVAL_SECONDS: float = 2.0
+    # Push job progress over SSE (GET /jobs/{job_id}/events)
+    JOB_EVENTS_CHANGE_STREAM: bool = True  # Relay progress from out-of-process workers via Mongo change streams
+    JOB_EVENTS_POLL_SECONDS: float = 5.0  # DB re-read fallback when no event arrives in this window
+    JOB_PROGRESS_MIN_INTERVAL_SECONDS: float = 0.5  # Coalesce progress writes to at most one per job per interval
+    # PDF text extraction across a process pool (api/services/pdf_extractor.py)
+    PDF_EXTRACT_WORKERS: int = 0  # 0 = one per CPU core
+    PDF_PAGES_PER_TASK: int = 16
+    PDF_MAX_PAGES: int = 1000
+    PDF_EXTRACT_TIMEOUT_SECONDS: float = 120.0
+    FILE_EXTRACT_CONCURRENCY: int = 4  # Files of one upload extracted in parallel
+    # Extracted text cache keyed by sha256 of the uploaded bytes (api/services/extraction_cache.py)
+    EXTRACTION_CACHE_ENABLED: bool = True
+    EXTRACTION_CACHE_MAX_BYTES: int = 512 * 1024 * 1024  # Total cached text; least recently used evicted first
+    EXTRACTION_CACHE_INLINE_MAX_BYTES: int = 1024 * 1024  # Larger texts go to GridFS
     USE_MOCK_DB: bool = False
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24  # 24 hours
 
     # Gemini (Video Generation via Veo 3.1)
     GEMINI_API_KEY: str = ""
+    GEMINI_HTTP_TIMEOUT: float = 60.0
+    GEMINI_HTTP_MAX_CONNECTIONS: int = 10
+    GEMINI_HTTP_MAX_KEEPALIVE: int = 5
+    GEMINI_MAX_RETRIES: int = 3  # Retries on 429/5xx/transport errors (exponential backoff)
+    GEMINI_RETRY_BASE_SECONDS: float = 2.0
+    GEMINI_DOWNLOAD_TIMEOUT: float = 300.0
     
     # HeyGen (Video Generation)
     HEYGEN_API_KEY: str = ""
+    HEYGEN_HTTP_TIMEOUT: float = 60.0
+    HEYGEN_HTTP_MAX_CONNECTIONS: int = 20
+    HEYGEN_HTTP_MAX_KEEPALIVE: int = 10
+    HEYGEN_MAX_RETRIES: int = 3  # Retries on 429/5xx/transport errors (exponential backoff)
+    HEYGEN_RETRY_BASE_SECONDS: float = 1.0
     DEFAULT_VIDEO_PROVIDER: str = "heygen"  # "heygen" or "gemini"
 
     # AWS S3 Configuration
@@ -28,6 +105,29 @@ class Settings(BaseSettings):
     AWS_SECRET_ACCESS_KEY: str = ""
     AWS_S3_REGION: str = "eu-north-1"
     AWS_S3_BUCKET_NAME: str = ""
+    S3_MAX_WORKERS: int = 16  # Dedicated executor for blocking boto3 calls (not Starlette's threadpool)
+    S3_MAX_POOL_CONNECTIONS: int = 32
+    S3_BATCH_CONCURRENCY: int = 8  # upload_many parallelism
+    S3_MULTIPART_PART_SIZE: int = 8 * 1024 * 1024
+    S3_MULTIPART_CONCURRENCY: int = 4  # Parts in flight; memory ~ (concurrency + 1) * part size
+    S3_PRESIGNED_EXPIRES_SECONDS: int = 900
+    S3_PRESIGNED_MAX_BYTES: int = 2 * 1024 * 1024 * 1024  # 2 GB cap for direct browser uploads
+
+    # Finished video renders are copied to S3 once per TalkId (api/services/video_finalizer.py)
+    MEDIA_HTTP_TIMEOUT: float = 300.0
+    MEDIA_HTTP_MAX_CONNECTIONS: int = 10
+    VIDEO_FINALIZE_LEASE_SECONDS: int = 900  # Another poll may take over a finalization stuck this long
+    VIDEO_FINALIZE_MAX_ATTEMPTS: int = 3
+    # Background copy of generated promotional images to S3 with resized variants (api/services/image_mirror.py)
+    IMAGE_MIRROR_ENABLED: bool = True
+    IMAGE_MIRROR_WORKERS: int = 0  # Variant rendering processes; 0 = one per CPU core
+    IMAGE_MIRROR_CONCURRENCY: int = 3  # Images downloaded/uploaded at once
+    IMAGE_MIRROR_MAX_BYTES: int = 25 * 1024 * 1024
+    IMAGE_VARIANT_QUALITY: int = 82
+    # Instant-audio TTS cache on disk (api/services/tts_cache.py)
+    TTS_CACHE_ENABLED: bool = True
+    TTS_CACHE_DIR: str = ""  # Empty = <system temp dir>/webinar_tts_cache
+    TTS_CACHE_MAX_BYTES: int = 500 * 1024 * 1024
 
     class Config:
         env_file = ".env"
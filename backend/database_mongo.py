@@ -1,6 +1,6 @@
 from motor.motor_asyncio import AsyncIOMotorClient
 from beanie import init_beanie
-from api.models import WebinarAsset, User, Mentor, Project, Stage, InputArtifact, WebinarProcessingJob, ApprovalHistory, OnboardingDocument, WebinarConcept, WebinarVideo
+from api.models import WebinarAsset, User, Mentor, Project, Stage, InputArtifact, WebinarProcessingJob, ApprovalHistory, OnboardingDocument, WebinarConcept, WebinarVideo, LLMCacheEntry, ExtractionCacheEntry, RateLimitWindow
 from core.settings import settings
 
 async def init_db(client=None):
@@ -15,6 +15,6 @@ async def init_db(client=None):
     print(f"DEBUG: Using database: {db_name}")
     
     await init_beanie(database=client[db_name], document_models=[
-        WebinarAsset, User, Mentor, Project, Stage, InputArtifact, WebinarProcessingJob, ApprovalHistory, OnboardingDocument, WebinarConcept, WebinarVideo
+        WebinarAsset, User, Mentor, Project, Stage, InputArtifact, WebinarProcessingJob, ApprovalHistory, OnboardingDocument, WebinarConcept, WebinarVideo, LLMCacheEntry, ExtractionCacheEntry, RateLimitWindow
     ])
     print(f"DEBUG: Beanie initialized with models. Mentor collection: {Mentor.get_settings().name}")
@@ -1,3 +1,4 @@
+import asyncio
 import os
 import sys
 from fastapi import HTTPException
@@ -17,11 +18,11 @@ def test_webinar_logic():
     try:
         # Force an error by passing garbage arguments
         print("Calling safe_generate_video with INVALID arguments...")
-        result = heygen_service.safe_generate_video(
+        result = asyncio.run(heygen_service.safe_generate_video(
             script_text="", # Invalid empty text
             image_path=None,
             gender="unknown_gender"
-        )
+        ))
         print(f"Result from service: {result}")
         
         # Simulate router check
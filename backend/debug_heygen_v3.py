@@ -1,3 +1,4 @@
+import asyncio
 import os
 import sys
 from dotenv import load_dotenv
@@ -19,12 +20,12 @@ def test_generate():
     
     try:
         # Use male gender, no image
-        result = heygen_service.generate_video(
+        result = asyncio.run(heygen_service.generate_video(
             script_text=script_text,
             image_path=None,
             gender="male",
             use_avatar_iv_model=False 
-        )
+        ))
         print("SUCCESS:", result)
     except Exception as e:
         print("FAILED:", e)
@@ -51,11 +51,116 @@ app.add_middleware(
 async def start_db():
     await init_db()
 
+@app.on_event("startup")
+async def start_embedded_job_worker():
+    # Single-process setups: run a queue worker inside the API. Production runs `python worker.py` instead.
+    from core.settings import settings
+    if settings.JOB_QUEUE_ENABLED and settings.RUN_EMBEDDED_JOB_WORKER:
+        import asyncio
+        from api.services.background_processor import background_processor
+        from api.services.job_queue import JobWorker
+        app.state.job_worker = JobWorker(handlers=background_processor.job_handlers())
+        app.state.job_worker_task = asyncio.create_task(app.state.job_worker.run())
+
+@app.on_event("startup")
+async def start_job_events_watcher():
+    # Push progress written by out-of-process workers to SSE subscribers
+    from core.settings import settings
+    if settings.JOB_EVENTS_CHANGE_STREAM:
+        import asyncio
+        from api.services.job_events import job_events
+        app.state.job_events_task = asyncio.create_task(job_events.watch_change_stream())
+
+@app.on_event("shutdown")
+async def stop_job_events_watcher():
+    task = getattr(app.state, "job_events_task", None)
+    if task and not task.done():
+        task.cancel()
+
+# Registered before the client/executor shutdown hooks below: in-flight jobs still use them
+@app.on_event("shutdown")
+async def stop_embedded_job_worker():
+    worker = getattr(app.state, "job_worker", None)
+    if worker:
+        worker.stop()
+        await app.state.job_worker_task
+
+@app.on_event("startup")
+async def warm_token_encoder():
+    # Loading tiktoken's encoding (a download on first use) would otherwise block the first request
+    import asyncio
+    from api.services.token_budget import get_encoder, DEFAULT_MODEL
+    await asyncio.to_thread(get_encoder, DEFAULT_MODEL)
+
+@app.on_event("startup")
+async def start_http_clients():
+    from core.http_client import openai_http_client, heygen_http_client, gemini_http_client, media_http_client
+    await openai_http_client.start()
+    await heygen_http_client.start()
+    await gemini_http_client.start()
+    await media_http_client.start()
+
+@app.on_event("shutdown")
+async def close_http_clients():
+    from core.http_client import openai_http_client, heygen_http_client, gemini_http_client, media_http_client
+    await openai_http_client.close()
+    await heygen_http_client.close()
+    await gemini_http_client.close()
+    await media_http_client.close()
+
+@app.on_event("shutdown")
+async def close_s3_executor():
+    from core.s3 import s3_service
+    s3_service.shutdown()
+
+@app.on_event("shutdown")
+async def close_pdf_extractor():
+    from api.services.pdf_extractor import pdf_extractor
+    pdf_extractor.shutdown()
+
+@app.on_event("shutdown")
+async def close_image_mirror():
+    from api.services.image_mirror import image_mirror
+    image_mirror.shutdown()
+
 @app.get("/health")
 def health_check():
     print("Health check called (Reloaded 3)")
     return {"status": "ok", "service": "WebinarAgent.ai"}
 
+@app.get("/metrics")
+def metrics():
+    """Process-local performance counters."""
+    from core.http_client import openai_http_client, heygen_http_client, gemini_http_client, media_http_client
+    from api.services.llm_cache import llm_cache
+    from api.services.token_budget import token_budget
+    from api.services.openai_limiter import openai_limiter
+    from api.services.image_generation import image_generation_service
+    from api.services.image_mirror import image_mirror
+    from api.services.tts_cache import tts_cache
+    from api.services.mentor_profile_cache import mentor_profile_cache
+    from api.services.job_events import job_events
+    from api.services.job_progress import job_progress
+    from api.services.extraction_cache import extraction_cache
+    from core.s3 import s3_service
+    return {
+        "openai_http": openai_http_client.stats(),
+        "heygen_http": heygen_http_client.stats(),
+        "gemini_http": gemini_http_client.stats(),
+        "media_http": media_http_client.stats(),
+        "llm_cache": llm_cache.stats(),
+        "token_budget": token_budget.stats(),
+        "openai_limiter": openai_limiter.stats(),
+        "image_generation": image_generation_service.stats(),
+        "image_mirror": image_mirror.stats(),
+        "tts_cache": tts_cache.stats(),
+        "mentor_profile_cache": mentor_profile_cache.stats(),
+        "job_events": job_events.stats(),
+        "job_progress": job_progress.stats(),
+        "extraction_cache": extraction_cache.stats(),
+        "s3": s3_service.stats(),
+    }
+
 # Register routers
 from api.routers import auth, mentors, webinar, approvals, documents
 app.include_router(auth.router, prefix="/api/auth", tags=["Auth"])
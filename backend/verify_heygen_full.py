@@ -1,3 +1,4 @@
+import asyncio
 import os
 import sys
 import requests
@@ -45,7 +46,7 @@ def verify_system():
     try:
         print("\n⏳ Testing HeyGen API Connection (Listing Voices)...")
         # Set a shorter timeout for verification
-        voices = heygen_service.list_voices()
+        voices = asyncio.run(heygen_service.list_voices())
         if "error" in voices:
              print_result("API Connection", False, f"Error: {voices['error']}")
         else:
@@ -0,0 +1,49 @@
+"""
+Standalone job worker for the durable WebinarProcessingJob queue.
+
+Usage (from backend/):
+    python worker.py
+
+Scale by running more worker processes; each claims jobs atomically and
+honours JOB_CONCURRENCY per job type.
+"""
+import asyncio
+import os
+import signal
+
+from dotenv import load_dotenv
+
+load_dotenv(os.path.join(os.getcwd(), ".env"), override=True)
+
+from database_mongo import init_db
+from core.http_client import openai_http_client
+from api.services.background_processor import background_processor
+from api.services.job_queue import JobWorker
+from api.services.pdf_extractor import pdf_extractor
+from api.services.token_budget import get_encoder, DEFAULT_MODEL
+
+
+async def main():
+    await init_db()
+    await openai_http_client.start()
+    await asyncio.to_thread(get_encoder, DEFAULT_MODEL)
+
+    worker = JobWorker(handlers=background_processor.job_handlers())
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, worker.stop)
+        except NotImplementedError:
+            # Windows: fall back to KeyboardInterrupt
+            pass
+
+    try:
+        await worker.run()
+    finally:
+        await openai_http_client.close()
+        pdf_extractor.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
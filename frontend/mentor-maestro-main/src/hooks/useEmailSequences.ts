@@ -31,7 +31,7 @@ export function useEmailSequences() {
       if (!assetId) return [];
 
       try {
-        const asset = await api.getAsset(assetId);
+        const asset = await api.getAsset(assetId, "emails");
 
         if (!asset.email_plan || !asset.email_plan.emails) return [];
 
@@ -28,10 +28,17 @@ export interface JobStatus {
   message: string;
   asset_id?: string;
   error?: string;
+  attempts?: number;
+  max_attempts?: number;
   created_at?: string;
   updated_at?: string;
 }
 
+// "failed" is final only once the job queue has no retries left
+export const isJobFinished = (status: JobStatus): boolean =>
+  status.status === 'completed' ||
+  (status.status === 'failed' && (status.attempts ?? 0) >= (status.max_attempts ?? 0));
+
 export const api = {
   // 1. Upload Context (Setup Step 2) - Returns immediately with job_id
   uploadContext: async (
@@ -73,38 +80,74 @@ export const api = {
     return response.data;
   },
 
-  // 2. Generate Concepts
-  generateConcepts: async (assetId: string) => {
+  // 1.6 Watch Job Status (server push over SSE; onError means the caller should fall back to polling)
+  watchJobStatus: (
+    jobId: string,
+    onUpdate: (status: JobStatus) => void,
+    onError: () => void
+  ): (() => void) => {
+    const source = new EventSource(`${API_Base}/jobs/${jobId}/events`);
+    let finished = false;
+
+    source.addEventListener('progress', (event) => {
+      const status: JobStatus = JSON.parse((event as MessageEvent).data);
+      if (isJobFinished(status)) {
+        finished = true;
+        source.close();
+      }
+      onUpdate(status);
+    });
+
+    source.onerror = () => {
+      source.close();
+      if (!finished) {
+        finished = true;
+        onError();
+      }
+    };
+
+    return () => {
+      finished = true;
+      source.close();
+    };
+  },
+
+  // 2. Generate Concepts (regenerate: skip the server's cached answer)
+  generateConcepts: async (assetId: string, regenerate = false) => {
     const response = await axios.post(`${API_Base}/concepts/generate`, {
-      asset_id: assetId
+      asset_id: assetId,
+      regenerate
     }, { timeout: 120000 });
     return response.data; // { status: "success", data: { ... } }
   },
 
   // 3. Generate Structure (Slide Outline)
-  generateStructure: async (assetId: string, conceptText: string) => {
+  generateStructure: async (assetId: string, conceptText: string, regenerate = false) => {
     const response = await axios.post(`${API_Base}/structure/generate`, {
       asset_id: assetId,
-      concept_text: conceptText
+      concept_text: conceptText,
+      regenerate
     }, { timeout: 120000 });
     return response.data; // { status: "success", structure: "..." }
   },
 
   // 4. Generate Emails
-  generateEmails: async (assetId: string, structureText: string, productDetails: string) => {
+  generateEmails: async (assetId: string, structureText: string, productDetails: string, regenerate = false) => {
     const response = await axios.post(`${API_Base}/emails/generate`, {
       asset_id: assetId,
       structure_text: structureText,
-      product_details: productDetails
+      product_details: productDetails,
+      regenerate
     }, { timeout: 120000 });
     return response.data;
   },
 
   // 5. Generate Individual Email (Deep Loop)
-  generateSingleEmail: async (emailOutline: string, conceptContext: string) => {
+  generateSingleEmail: async (emailOutline: string, conceptContext: string, regenerate = false) => {
     const response = await axios.post(`${API_Base}/emails/generate-single`, {
       email_outline: emailOutline,
-      concept_context: conceptContext
+      concept_context: conceptContext,
+      regenerate
     }, { timeout: 120000 });
     return response.data;
   },
@@ -132,8 +175,9 @@ export const api = {
   },
 
   // 7. Get Asset Status
-  getAsset: async (assetId: string) => {
-    const response = await axios.get(`${API_Base}/assets/${assetId}`);
+  // view: summary | concepts | structure | emails | media (only those fields are returned)
+  getAsset: async (assetId: string, view?: string) => {
+    const response = await axios.get(`${API_Base}/assets/${assetId}`, { params: view ? { view } : undefined });
     return response.data;
   },
 
@@ -162,6 +206,17 @@ export const api = {
     return response.data;
   },
 
+  // 10b. Generate several promotional images at once (saved to the asset in one update)
+  generatePromotionalImages: async (assetId: string, mediaTypes: string[], conceptText?: string, fastMode = true) => {
+    const response = await axios.post(`${API_Base}/images/generate-batch`, {
+      asset_id: assetId,
+      media_types: mediaTypes,
+      concept_text: conceptText,
+      fast_mode: fastMode
+    }, { timeout: 180000 });
+    return response.data;
+  },
+
   // 11. Generate Marketing Copy
   generateMarketingCopy: async (conceptId: string, mediaType: string) => {
     const response = await axios.post(`${API_Base}/marketing/generate`, {
@@ -115,7 +115,7 @@ export default function Concepts() {
     }
   }, [canGenerate, concepts.length, isLoading]);
 
-  const handleGenerate = async () => {
+  const handleGenerate = async (regenerate = false) => {
     const assetId = localStorage.getItem("current_asset_id");
     console.log("[Concepts] handleGenerate called, assetId:", assetId);
 
@@ -130,7 +130,7 @@ export default function Concepts() {
       const { api } = await import("@/lib/api");
 
       console.log("[Concepts] Calling api.generateConcepts with assetId:", assetId);
-      const result = await api.generateConcepts(assetId);
+      const result = await api.generateConcepts(assetId, regenerate);
       console.log("[Concepts] API response:", result);
 
       if (result.status === "success") {
@@ -288,7 +288,7 @@ export default function Concepts() {
             </p>
           </div>
           <Button
-            onClick={handleGenerate}
+            onClick={() => handleGenerate(concepts.length > 0)}
             disabled={!canGenerate || isGenerating}
             className="gap-2 bg-primary hover:bg-primary/90 text-primary-foreground"
           >
@@ -77,7 +77,7 @@ export default function Emails() {
 
   const canGenerate = finalConcept !== undefined;
 
-  const handleGenerate = async (sequenceType: string) => {
+  const handleGenerate = async (sequenceType: string, regenerate = false) => {
     const assetId = localStorage.getItem("current_asset_id");
 
     if (!assetId || !finalConcept?.big_idea) {
@@ -91,7 +91,7 @@ export default function Emails() {
       const structureText = finalConcept.secret_structure || "Structure not generated yet.";
       const productDetails = `Mechanism: ${finalConcept.mechanism}. Offer: ${finalConcept.offer_transition}`;
 
-      const result = await api.generateEmails(assetId, structureText, productDetails);
+      const result = await api.generateEmails(assetId, structureText, productDetails, regenerate);
 
       if (result.status === "success" || result.data) {
         queryClient.invalidateQueries({ queryKey: ["email-sequences"] });
@@ -143,7 +143,7 @@ export default function Emails() {
   };
 
   const handleRegenerate = async (sequenceType: string) => {
-    await handleGenerate(sequenceType);
+    await handleGenerate(sequenceType, true);
   };
 
   const getSequencesByType = (type: string) => sequences.filter(s => s.sequence_type === type);
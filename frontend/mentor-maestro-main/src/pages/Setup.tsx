@@ -3,6 +3,7 @@ import { MainLayout } from "@/components/layout/MainLayout";
 import { useProfile } from "@/hooks/useProfile";
 import { useDocuments } from "@/hooks/useDocuments";
 import { useAuth } from "@/contexts/AuthContext";
+import type { JobStatus } from "@/lib/api";
 import { Button } from "@/components/ui/button";
 import { Input } from "@/components/ui/input";
 import { Textarea } from "@/components/ui/textarea";
@@ -474,7 +475,7 @@ ${conceptConsiderations.trim()}
         duration: Infinity,
       });
 
-      const { api } = await import("@/lib/api");
+      const { api, isJobFinished } = await import("@/lib/api");
 
       console.log(`[Setup] Starting upload for mentor ${mentorId} in ${selectedLanguage}`);
       const result = await api.uploadContext(
@@ -498,35 +499,52 @@ ${conceptConsiderations.trim()}
 
         let pollCount = 0;
         const maxPolls = 120; // 10 minutes (120 * 5s)
+        let updateCount = 0;
+
+        // Returns true once the job has reached a terminal state
+        const handleJobStatus = async (jobStatus: JobStatus) => {
+          setUploadProgress(jobStatus.progress);
+
+          if (jobStatus.status === "completed") {
+            if (jobStatus.asset_id) {
+              localStorage.setItem("current_asset_id", jobStatus.asset_id);
+            }
+            await updateStage.mutateAsync("concept_generation");
+            toast.success("✨ AI Concepts Ready! Redirecting...");
+            setIsSaving(false);
+            navigate("/concepts");
+            return true;
+          }
+
+          if (jobStatus.status === "failed" && isJobFinished(jobStatus)) {
+            const errorMsg = jobStatus.error || jobStatus.message || "Processing failed";
+            throw new Error(errorMsg);
+          }
+
+          if (updateCount % 3 === 0) {
+            toast.info(`🔄 ${jobStatus.message}`, {
+              duration: 4000,
+              id: `poll-${result.job_id}`
+            });
+          }
+          updateCount++;
+          return false;
+        };
+
+        const reportJobError = (jobError: any) => {
+          console.error("Poll error:", jobError);
+          toast.error(`Processing issue: ${jobError.message}`);
+          setIsSaving(false);
+        };
 
+        // Fallback when the event stream is unavailable (proxy buffering, old backend, ...)
         const pollJobStatus = async () => {
           try {
             const jobStatus = await api.getJobStatus(result.job_id);
-            setUploadProgress(jobStatus.progress);
-
-            if (jobStatus.status === "completed") {
-              if (jobStatus.asset_id) {
-                localStorage.setItem("current_asset_id", jobStatus.asset_id);
-              }
-              await updateStage.mutateAsync("concept_generation");
-              toast.success("✨ AI Concepts Ready! Redirecting...");
-              setIsSaving(false);
-              navigate("/concepts");
+            if (await handleJobStatus(jobStatus)) {
               return;
             }
 
-            if (jobStatus.status === "failed") {
-              const errorMsg = jobStatus.error || jobStatus.message || "Processing failed";
-              throw new Error(errorMsg);
-            }
-
-            if (pollCount % 3 === 0) {
-              toast.info(`🔄 ${jobStatus.message}`, {
-                duration: 4000,
-                id: `poll-${result.job_id}`
-              });
-            }
-
             pollCount++;
             if (pollCount < maxPolls) {
               setTimeout(pollJobStatus, 5000);
@@ -535,13 +553,20 @@ ${conceptConsiderations.trim()}
             }
 
           } catch (pollError: any) {
-            console.error("Poll error:", pollError);
-            toast.error(`Processing issue: ${pollError.message}`);
-            setIsSaving(false);
+            reportJobError(pollError);
           }
         };
 
-        setTimeout(pollJobStatus, 2000);
+        const stopWatching = api.watchJobStatus(
+          result.job_id,
+          (jobStatus) => {
+            handleJobStatus(jobStatus).catch((jobError) => {
+              stopWatching();
+              reportJobError(jobError);
+            });
+          },
+          () => setTimeout(pollJobStatus, 2000)
+        );
 
       } else if (result.status === "success" && result.asset_id) {
         localStorage.setItem("current_asset_id", result.asset_id);
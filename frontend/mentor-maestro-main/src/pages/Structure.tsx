@@ -72,7 +72,7 @@ export default function Structure() {
   const hasStructure = !!finalConcept?.secret_structure;
 
   // --- Structure Generation ---
-  const handleGenerateStructure = async () => {
+  const handleGenerateStructure = async (regenerate = false) => {
     if (!finalConcept?.id) return;
 
     setIsGeneratingStructure(true);
@@ -82,7 +82,7 @@ export default function Structure() {
 
       const conceptText = `Big Idea: ${finalConcept.big_idea}\nHook: ${finalConcept.hooks}\nMechanism: ${finalConcept.mechanism}`;
 
-      await api.generateStructure(assetId, conceptText);
+      await api.generateStructure(assetId, conceptText, regenerate);
 
       toast.success("Structure generated successfully!");
       await refetchConcepts();
@@ -298,7 +298,7 @@ export default function Structure() {
                     Use our AI to generate a comprehensive slide-by-slide outline based on your concept.
                   </p>
                   <Button
-                    onClick={handleGenerateStructure}
+                    onClick={() => handleGenerateStructure()}
                     disabled={isGeneratingStructure}
                     className="bg-[#72bf44] hover:bg-[#61a33a] text-white font-bold h-12 px-8"
                   >
@@ -378,7 +378,7 @@ export default function Structure() {
                     </Button>
                     <Button
                       variant="outline"
-                      onClick={handleGenerateStructure}
+                      onClick={() => handleGenerateStructure(true)}
                       disabled={isGeneratingStructure}
                     >
                       <RefreshCw className="h-4 w-4 mr-2" /> Regenerate